@@ -4,15 +4,25 @@ from flask_cors import CORS
 import numpy as np
 import cv2
 import base64
-from keras.models import load_model
 import dlib
 import socket
 import jwt
 import os
 import logging
+import threading
 import time
 from datetime import datetime
 
+# 공용 얼굴 / 음성 / 텍스트 분석 모듈 (capstonedesign-services 패키지, requirements.txt 참고)
+from services.audio_decode import to_mono_16k
+from services.audio_stream import STREAM_END, AudioStreamSession
+from services.emotion_model_backend import load_emotion_backend
+from services.face_inference import FaceBatchExecutor
+from services.face_pipeline import build_face_response, decode_image_gray, preprocess_faces
+from services.face_tracker import FaceTrackerRegistry
+from services.frame_stream import FrameStreamSession
+from services.media_payload import is_truthy, media_bytes, parse_media_request
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,26 +46,56 @@ socketio = SocketIO(app,
 )
 
 # 모델 로드
-emotion_model = load_model("models/emotion_model.h5", compile=False)
+FACE_BATCH_MAX_SIZE = int(os.environ.get('FACE_BATCH_MAX_SIZE', '16'))
+emotion_backend = load_emotion_backend(
+    "models/emotion_model.h5",
+    backend=os.environ.get('FACE_INFERENCE_BACKEND', 'compiled'),
+    max_batch_size=FACE_BATCH_MAX_SIZE,
+    artifact_path=os.environ.get('FACE_MODEL_ARTIFACT')
+)
+emotion_model = emotion_backend.model
 face_detector = dlib.get_frontal_face_detector()
-expression_labels = ['Angry', 'Disgust', 'Fear', 'Happy', 'Sad', 'Surprise', 'Neutral']
+
+# 동시 요청의 얼굴 ROI를 모아 배치 추론
+face_batch_executor = FaceBatchExecutor(
+    emotion_backend.predict,
+    max_batch_size=FACE_BATCH_MAX_SIZE,
+    max_wait_ms=float(os.environ.get('FACE_BATCH_MAX_WAIT_MS', '5'))
+)
 
 # 연결된 클라이언트 관리
 connected_clients = {}
 
-def preprocess_face(image):
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    faces = face_detector(gray)
-    if not faces:
-        return None
-    face = faces[0]
-    x, y, w, h = face.left(), face.top(), face.width(), face.height()
-    roi = gray[y:y+h, x:x+w]
-    roi = cv2.resize(roi, (64, 64))
-    roi = roi.astype("float32") / 255.0
-    roi = np.expand_dims(roi, axis=-1)
-    roi = np.expand_dims(roi, axis=0)
-    return roi
+# 세션별 얼굴 추적기 (N 프레임마다만 dlib 재검출)
+face_tracker = FaceTrackerRegistry(
+    redetect_interval=int(os.environ.get('FACE_REDETECT_INTERVAL', '10')),
+    min_confidence=float(os.environ.get('FACE_TRACK_MIN_CONFIDENCE', '0.6'))
+)
+
+# 다중 해상도 전처리: 축소 피라미드 레벨에서 검출, 원본 해상도에서 크롭
+FACE_DETECT_MAX_SIDE = int(os.environ.get('FACE_DETECT_MAX_SIDE', '640'))
+FACE_DECODE_MAX_SIDE = int(os.environ.get('FACE_DECODE_MAX_SIDE', '1280'))
+
+# Socket.IO 'frame' 스트림: 연결별 최신 프레임 우선 대기열 크기, 통계 전송 주기 (초)
+FRAME_QUEUE_SIZE = int(os.environ.get('FRAME_QUEUE_SIZE', '1'))
+FRAME_STATS_INTERVAL = float(os.environ.get('FRAME_STATS_INTERVAL', '2'))
+frame_streams = {}
+frame_streams_lock = threading.Lock()
+
+# Socket.IO 음성 스트림: 연결별 끝점 검출 세션, 음성 분석 서비스 (첫 스트림에서 로드)
+AUDIO_MAX_SILENCE_MS = float(os.environ.get('AUDIO_MAX_SILENCE_MS', '600'))
+AUDIO_MAX_UTTERANCE_S = float(os.environ.get('AUDIO_MAX_UTTERANCE_S', '20'))
+# 전사 텍스트 감정 분석용 NRC EmoLex (capstonedesign-server/lexicon의 파일)
+TEXT_LEXICON_PATH = os.environ.get('TEXT_LEXICON_PATH', 'lexicon/Korean-NRC-EmoLex.txt')
+audio_streams = {}
+audio_streams_lock = threading.Lock()
+audio_services = {}
+audio_services_lock = threading.Lock()
+
+def infer_face_response(faces, boxes, multi_face=False, decode_scale=1):
+    # 검출된 모든 얼굴을 한 번의 forward pass로 추론
+    batch_preds, inference_info = face_batch_executor.predict(faces)
+    return build_face_response(batch_preds, boxes, inference_info, multi_face, decode_scale)
 
 # JWT 토큰 검증 함수
 def verify_jwt_token(token):
@@ -121,39 +161,42 @@ def health_check():
 
 @app.route('/predict', methods=['POST'])
 def predict():
-    data = request.get_json()
-
     try:
+        # JSON base64, multipart/form-data, application/octet-stream, MessagePack 지원
+        data = parse_media_request(request, raw_field='image')
         img_data = data["image"]
-        img_bytes = base64.b64decode(img_data)
-        img_array = np.frombuffer(img_bytes, np.uint8)
-        img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+        multi_face = is_truthy(data.get('multi_face', False))
+        session_id = data.get('session_id') or data.get('socketId') or request.headers.get('X-Session-Id')
+        img_bytes = media_bytes(img_data)
+        img, decode_scale = decode_image_gray(img_bytes, max_side=FACE_DECODE_MAX_SIDE)
     except Exception as e:
         return jsonify({'error': f'Invalid image data: {str(e)}'}), 400
+    if img is None:
+        return jsonify({'error': 'Invalid image data'}), 400
 
-    face = preprocess_face(img)
-    if face is None:
+    faces, boxes = preprocess_faces(
+        face_detector, img, max_faces=None if multi_face else 1,
+        detect_max_side=FACE_DETECT_MAX_SIDE, tracker=face_tracker, session_id=session_id
+    )
+    if faces is None:
         return jsonify({'error': 'No face detected'}), 400
 
     try:
-        preds = emotion_model.predict(face)[0]
-        emotion_idx = int(np.argmax(preds))
-        emotion_label = expression_labels[emotion_idx]
-        confidence = float(preds[emotion_idx])
-        
-        probabilities = {
-            expression_labels[i]: float(preds[i]) for i in range(len(preds))
-        }
-
-        return jsonify({
-            'emotion': emotion_label,
-            'confidence': confidence,
-            'probabilities': probabilities
-        })
+        return jsonify(infer_face_response(faces, boxes, multi_face, decode_scale))
 
     except Exception as e:
         return jsonify({'error': f'Model inference failed: {str(e)}'}), 500
 
+# 얼굴 추론 배치 통계 (배치 크기, 대기열 대기 시간)
+@app.route('/face_inference_stats', methods=['GET'])
+def face_inference_stats():
+    return jsonify({
+        'backend': emotion_backend.get_info(),
+        'batching': face_batch_executor.get_stats(),
+        'tracking': face_tracker.get_stats(),
+        'streams': [stream.snapshot_stats(reset_window=False) for stream in list(frame_streams.values())]
+    })
+
 # 서버 IP를 알려주는 엔드포인트
 @app.route('/whoami', methods=['GET'])
 def whoami():
@@ -208,9 +251,219 @@ def handle_disconnect():
     
     if request.sid in connected_clients:
         del connected_clients[request.sid]
+    face_tracker.reset(request.sid)
+    with frame_streams_lock:
+        stream = frame_streams.pop(request.sid, None)
+    if stream is not None:
+        stream.close()
+        logger.info(f"[Stream] 종료: {request.sid}, {stream.snapshot_stats()}")
+    with audio_streams_lock:
+        audio_stream = audio_streams.pop(request.sid, None)
+    if audio_stream is not None:
+        audio_stream.close()
     
     logger.info(f"[SocketIO] 현재 연결 수: {len(connected_clients)}")
 
+def analyze_stream_frame(frame, socket_id):
+    img, decode_scale = decode_image_gray(media_bytes(frame['image']), max_side=FACE_DECODE_MAX_SIDE)
+    if img is None:
+        return {'error': 'Invalid image data'}
+    multi_face = is_truthy(frame.get('multi_face', False))
+    # 연결 ID를 세션으로 사용해 프레임 간 얼굴 추적
+    faces, boxes = preprocess_faces(
+        face_detector, img, max_faces=None if multi_face else 1,
+        detect_max_side=FACE_DETECT_MAX_SIDE, tracker=face_tracker, session_id=socket_id
+    )
+    if faces is None:
+        return {'face_detected': False}
+    return {'face_detected': True, **infer_face_response(faces, boxes, multi_face, decode_scale)}
+
+def frame_stream_worker(stream):
+    # 연결별 워커: 대기열의 최신 프레임만 처리하고 'emotion' 이벤트로 결과 전송
+    socket_id = stream.session_id
+    next_stats_at = time.monotonic() + FRAME_STATS_INTERVAL
+    while not stream.closed:
+        item = stream.get(timeout=FRAME_STATS_INTERVAL)
+        if item is not None:
+            received_at, frame = item
+            started_at = time.monotonic()
+            try:
+                result = analyze_stream_frame(frame, socket_id)
+            except Exception as e:
+                logger.error(f"[Stream] 프레임 분석 실패: {socket_id} - {e}")
+                result = {'error': f'Model inference failed: {str(e)}'}
+            stream.record_processed(received_at, (time.monotonic() - started_at) * 1000.0, 'error' not in result)
+            result['frameId'] = frame.get('frameId')
+            result['latency_ms'] = round((time.monotonic() - received_at) * 1000.0, 3)
+            socketio.emit('emotion', result, room=socket_id)
+
+        if time.monotonic() >= next_stats_at and not stream.closed:
+            socketio.emit('stream_stats', stream.snapshot_stats(), room=socket_id)
+            next_stats_at = time.monotonic() + FRAME_STATS_INTERVAL
+
+@socketio.on('frame')
+def handle_frame(data):
+    # 바이너리 JPEG 프레임 또는 {'image': bytes|base64, 'frameId', 'multi_face'}
+    socket_id = request.sid
+    if socket_id not in connected_clients:
+        emit('auth_error', {'message': 'Not authenticated'})
+        return
+    frame = data if isinstance(data, dict) else {'image': data}
+    if not frame.get('image'):
+        emit('emotion', {'error': 'Invalid image data', 'frameId': frame.get('frameId')})
+        return
+
+    with frame_streams_lock:
+        stream = frame_streams.get(socket_id)
+        if stream is None:
+            stream = FrameStreamSession(socket_id, max_pending=FRAME_QUEUE_SIZE)
+            frame_streams[socket_id] = stream
+            socketio.start_background_task(frame_stream_worker, stream)
+            logger.info(f"[Stream] 시작: {socket_id}")
+    stream.put(frame)
+
+def get_audio_services():
+    # Whisper / lexicon 로드는 무거우므로 첫 음성 스트림에서 한 번만
+    with audio_services_lock:
+        if not audio_services:
+            from services.audio_emotion_service import AudioEmotionService
+            from services.text_emotion_service import TextEmotionService
+            from services.vad_fusion_service import VADFusionService
+            logger.info("🎵 음성 스트림 서비스 로드 중...")
+            audio_services['audio'] = AudioEmotionService()
+            audio_services['text'] = TextEmotionService(
+                lexicon_path=TEXT_LEXICON_PATH
+            )
+            audio_services['fusion'] = VADFusionService()
+        return audio_services
+
+def analyze_utterance(stream, utterance):
+    # 발화 하나: prosody → transcript → 텍스트 감정 + 융합 VAD 순서로 이벤트 전송
+    socket_id = stream.session_id
+    services = get_audio_services()
+    samples = to_mono_16k(utterance.samples, stream.sample_rate)
+    segment = {'utteranceId': utterance.index, 'start': utterance.start, 'end': utterance.end}
+
+    def on_stage(stage, stage_result):
+        if stage == 'prosody':
+            socketio.emit('prosody', {**segment, **stage_result}, room=socket_id)
+
+    audio_result = services['audio'].analyze_samples(samples, on_stage=on_stage)
+    transcript = audio_result.get('transcript', '').strip()
+    socketio.emit('transcript', {
+        **segment,
+        'text': transcript,
+        'language': audio_result.get('language', 'unknown'),
+        'timings_ms': audio_result.get('timings_ms', {}),
+        'timed_out': audio_result.get('timed_out', [])
+    }, room=socket_id)
+
+    text_result = services['text'].analyze_text_emotion(transcript) if transcript else None
+    text_ok = bool(text_result and text_result.get('success'))
+    fusion_result = services['fusion'].fuse_vad_scores(
+        audio_vad=audio_result.get('vad_score'),
+        text_vad=text_result.get('vad_score') if text_ok else None,
+        audio_confidence=0.7,
+        text_confidence=text_result.get('emotion_intensity', 0.5) if text_ok else 0.5
+    )
+    socketio.emit('fused_vad', {
+        **segment,
+        'final_vad': fusion_result.get('final_vad'),
+        'emotion_tag': fusion_result.get('emotion_tag'),
+        'audio_vad': audio_result.get('vad_score'),
+        'text_vad': text_result.get('vad_score') if text_ok else None,
+        'text_emotion': text_result.get('dominant_emotion') if text_ok else None,
+        'available_modalities': fusion_result.get('available_modalities', [])
+    }, room=socket_id)
+
+def audio_stream_worker(stream):
+    # 연결별 워커: 닫힌 발화를 순서대로 분석 (발화 사이에도 청크 수신은 계속)
+    socket_id = stream.session_id
+    while True:
+        utterance = stream.next_utterance(timeout=1.0)
+        if utterance is None:
+            continue
+        if utterance is STREAM_END:
+            break
+        try:
+            analyze_utterance(stream, utterance)
+        except Exception as e:
+            logger.error(f"[Audio] 발화 분석 실패: {socket_id} - {e}")
+            socketio.emit('transcript', {
+                'utteranceId': utterance.index,
+                'error': f'Audio analysis failed: {str(e)}'
+            }, room=socket_id)
+
+    with audio_streams_lock:
+        if audio_streams.get(socket_id) is stream:
+            del audio_streams[socket_id]
+    if not stream.closed:
+        socketio.emit('audio_complete', stream.get_stats(), room=socket_id)
+    logger.info(f"[Audio] 스트림 종료: {socket_id}, {stream.get_stats()}")
+
+def start_audio_stream(socket_id, options=None):
+    options = options or {}
+    stream = AudioStreamSession(
+        socket_id,
+        sample_rate=int(options.get('sampleRate', 16000)),
+        sample_format=options.get('format', 's16le'),
+        channels=int(options.get('channels', 1)),
+        max_silence_ms=AUDIO_MAX_SILENCE_MS,
+        max_utterance_s=AUDIO_MAX_UTTERANCE_S
+    )
+    with audio_streams_lock:
+        previous = audio_streams.get(socket_id)
+        audio_streams[socket_id] = stream
+    if previous is not None:
+        previous.finish()
+    socketio.start_background_task(audio_stream_worker, stream)
+    logger.info(f"[Audio] 스트림 시작: {socket_id}, {stream.sample_rate}Hz {stream.sample_format}")
+    return stream
+
+@socketio.on('audio_start')
+def handle_audio_start(data=None):
+    # {'sampleRate': 16000, 'format': 's16le' | 'f32le', 'channels': 1}
+    socket_id = request.sid
+    if socket_id not in connected_clients:
+        emit('auth_error', {'message': 'Not authenticated'})
+        return
+    try:
+        stream = start_audio_stream(socket_id, data if isinstance(data, dict) else None)
+    except ValueError as e:
+        emit('audio_error', {'error': str(e)})
+        return
+    emit('audio_ready', {'sampleRate': stream.sample_rate, 'format': stream.sample_format})
+
+@socketio.on('audio_chunk')
+def handle_audio_chunk(data):
+    # 바이너리 PCM 청크 또는 {'audio': bytes|base64}
+    socket_id = request.sid
+    if socket_id not in connected_clients:
+        emit('auth_error', {'message': 'Not authenticated'})
+        return
+    chunk = data.get('audio') if isinstance(data, dict) else data
+    if not chunk:
+        return
+    with audio_streams_lock:
+        stream = audio_streams.get(socket_id)
+    if stream is None:
+        stream = start_audio_stream(socket_id)
+    try:
+        stream.feed(media_bytes(chunk))
+    except Exception as e:
+        emit('audio_error', {'error': f'Invalid audio chunk: {str(e)}'})
+
+@socketio.on('audio_end')
+def handle_audio_end(data=None):
+    socket_id = request.sid
+    if socket_id not in connected_clients:
+        emit('auth_error', {'message': 'Not authenticated'})
+        return
+    with audio_streams_lock:
+        stream = audio_streams.get(socket_id)
+    if stream is not None:
+        stream.finish()
+
 @socketio.on('message')
 def handle_message(data):
     logger.info(f"[SocketIO] 메시지 수신: {request.sid} - {data}")
@@ -258,7 +511,6 @@ def log_connection_status():
 # 30초마다 연결 상태 체크
 @socketio.on('connect')
 def start_status_monitoring():
-    import threading
     def monitor():
         while True:
             time.sleep(30)
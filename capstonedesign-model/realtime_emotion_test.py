@@ -30,9 +30,12 @@ while True:
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
     faces = face_detector(gray)
 
+    # 모든 얼굴 ROI를 모아 프레임당 한 번만 추론
+    boxes = []
+    rois = []
     for face in faces:
         x, y, w, h = face.left(), face.top(), face.width(), face.height()
-        roi = gray[y:y+h, x:x+w]
+        roi = gray[max(y, 0):y+h, max(x, 0):x+w]
 
         try:
             roi = cv2.resize(roi, (64, 64))
@@ -41,10 +44,15 @@ while True:
 
         roi = roi.astype("float") / 255.0
         roi = img_to_array(roi)
-        roi = np.expand_dims(roi, axis=-1)
-        roi = np.expand_dims(roi, axis=0)
+        boxes.append((x, y, w, h))
+        rois.append(roi)
 
-        preds = emotion_classifier.predict(roi, verbose=0)[0]
+    if rois:
+        batch_preds = emotion_classifier.predict(np.stack(rois, axis=0), verbose=0)
+    else:
+        batch_preds = []
+
+    for (x, y, w, h), preds in zip(boxes, batch_preds):
         emotion_probability = np.max(preds)
         label = emotion_labels[preds.argmax()]
 
@@ -0,0 +1,124 @@
+"""
+결정적 합성 음성 코퍼스
+
+같은 (종류, 길이)는 항상 같은 신호를 만든다 (시드 = crc32(종류:길이)).
+
+- tone: 하모닉 톤, 느린 글라이드 + 비브라토 F0 윤곽
+- speech: 음절 단위 합성 유성음 (benchmark_prosody.synthesize_speech)
+- bursts: 300-3000 Hz 대역 잡음을 음절 속도(3-6 Hz) 포락선으로 자른 말소리 유사 잡음
+- silence: -60 dBFS 수준의 배경 잡음만 (무음 단락 경로)
+- mixed: 발화 2-6초와 무음 1-4초가 번갈아 나오는 녹음 (무음 제거 경로)
+"""
+
+import io
+import os
+import sys
+import zlib
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.benchmark_prosody import synthesize_speech
+from services.audio_decode import SAMPLE_RATE
+
+CLIP_KINDS = ('tone', 'speech', 'bursts', 'silence', 'mixed')
+
+# 기본 코퍼스 길이 (초): 1초 ~ 10분
+DEFAULT_LENGTHS = (1.0, 10.0, 60.0, 600.0)
+
+NOISE_FLOOR = 0.001
+
+
+def clip_seed(kind: str, seconds: float) -> int:
+    return zlib.crc32(f'{kind}:{seconds:g}'.encode('utf-8'))
+
+
+def _tone(seconds: float, sr: int, rng: np.random.Generator) -> np.ndarray:
+    t = np.arange(int(seconds * sr)) / sr
+    base = rng.uniform(110.0, 220.0)
+    glide = 1.0 + 0.25 * np.sin(2 * np.pi * t / max(seconds, 1.0))
+    vibrato = 1.0 + 0.02 * np.sin(2 * np.pi * 5.5 * t)
+    phase = 2 * np.pi * np.cumsum(base * glide * vibrato) / sr
+    y = sum(np.sin(k * phase) / k for k in range(1, 6))
+    return 0.2 * y + rng.normal(0.0, NOISE_FLOOR, len(t))
+
+
+def _bursts(seconds: float, sr: int, rng: np.random.Generator) -> np.ndarray:
+    n = int(seconds * sr)
+    spectrum = np.fft.rfft(rng.normal(0.0, 1.0, n))
+    freqs = np.fft.rfftfreq(n, 1.0 / sr)
+    spectrum[(freqs < 300.0) | (freqs > 3000.0)] = 0.0
+    noise = np.fft.irfft(spectrum, n)
+    noise /= np.abs(noise).max() + 1e-12
+
+    # 음절 속도로 여닫히는 포락선 + 몇 초마다 휴지
+    t = np.arange(n) / sr
+    envelope = np.clip(np.sin(2 * np.pi * rng.uniform(3.0, 6.0) * t), 0.0, None) ** 2
+    pause_mask = np.sin(2 * np.pi * t / rng.uniform(4.0, 7.0)) > -0.6
+    return 0.3 * noise * envelope * pause_mask + rng.normal(0.0, NOISE_FLOOR, n)
+
+
+def _mixed(seconds: float, sr: int, rng: np.random.Generator, seed: int) -> np.ndarray:
+    n = int(seconds * sr)
+    y = rng.normal(0.0, NOISE_FLOOR, n)
+    pos = int(rng.uniform(0.5, 2.0) * sr)
+    segment = 0
+    while pos < n:
+        length = min(int(rng.uniform(2.0, 6.0) * sr), n - pos)
+        if length > sr // 4:
+            speech, _, _ = synthesize_speech(length / sr, sr, seed=seed + segment)
+            y[pos:pos + len(speech)] += speech
+        pos += length + int(rng.uniform(1.0, 4.0) * sr)
+        segment += 1
+    return y
+
+
+def generate_clip(kind: str, seconds: float, sr: int = SAMPLE_RATE) -> np.ndarray:
+    """종류 / 길이로 결정되는 float32 mono 클립 생성"""
+    if kind not in CLIP_KINDS:
+        raise ValueError(f"Unknown clip kind: {kind} (choose from {CLIP_KINDS})")
+    seed = clip_seed(kind, seconds)
+    rng = np.random.default_rng(seed)
+
+    if kind == 'tone':
+        y = _tone(seconds, sr, rng)
+    elif kind == 'speech':
+        y, _, _ = synthesize_speech(seconds, sr, seed=seed)
+    elif kind == 'bursts':
+        y = _bursts(seconds, sr, rng)
+    elif kind == 'silence':
+        y = rng.normal(0.0, NOISE_FLOOR, int(seconds * sr))
+    else:
+        y = _mixed(seconds, sr, rng, seed)
+    return np.clip(y, -1.0, 1.0).astype(np.float32)
+
+
+def to_wav_bytes(samples: np.ndarray, sr: int = SAMPLE_RATE) -> bytes:
+    """16-bit PCM WAV 바이트 (업로드 본문과 같은 형태)"""
+    import soundfile as sf
+
+    buffer = io.BytesIO()
+    sf.write(buffer, samples, sr, format='WAV', subtype='PCM_16')
+    return buffer.getvalue()
+
+
+def iter_corpus(lengths: Sequence[float] = DEFAULT_LENGTHS,
+                kinds: Sequence[str] = CLIP_KINDS,
+                sr: int = SAMPLE_RATE) -> Iterator[Dict]:
+    """클립을 하나씩 생성 (10분 클립 여러 개를 동시에 메모리에 두지 않음)"""
+    for seconds in lengths:
+        for kind in kinds:
+            yield {
+                'name': f'{kind}_{seconds:g}s',
+                'kind': kind,
+                'seconds': float(seconds),
+                'samples': generate_clip(kind, seconds, sr)
+            }
+
+
+def corpus_manifest(lengths: Sequence[float] = DEFAULT_LENGTHS,
+                    kinds: Sequence[str] = CLIP_KINDS) -> List[Dict]:
+    return [{'name': f'{kind}_{seconds:g}s', 'kind': kind, 'seconds': float(seconds),
+             'seed': clip_seed(kind, seconds)} for seconds in lengths for kind in kinds]
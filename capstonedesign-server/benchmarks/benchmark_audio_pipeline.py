@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+음성 분석 파이프라인 벤치마크
+
+결정적 합성 코퍼스(benchmarks/audio_corpus.py: 톤, 합성 음성, 말소리 유사 잡음, 무음, 무음 섞인 발화 /
+1초 ~ 10분)로 AudioEmotionService의 단계별 지연 시간(decode, STT, prosody, prosody_to_vad, 전체)을 측정하고
+p50 / p95를 JSON 리포트로 저장한다.
+최대 RSS(ru_maxrss)는 프로세스 전체의 최고치이므로 클립별이 아니라 실행 전체에 대해 한 번만 기록한다. 반복 측정이 캐시에 맞지 않도록 전사 캐시는 끈다.
+
+STT는 --stt mock(기본, 음성 길이 × --mock-rtf 만큼 대기하는 가짜 모델)이나 실제 백엔드
+(whisper / faster-whisper)를 고를 수 있다.
+
+사용법:
+    python benchmarks/benchmark_audio_pipeline.py
+    python benchmarks/benchmark_audio_pipeline.py --lengths 1,10,60 --kinds speech,mixed --repeat 5
+    python benchmarks/benchmark_audio_pipeline.py --stt faster-whisper --model base --output audio_report.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.audio_corpus import CLIP_KINDS, DEFAULT_LENGTHS, corpus_manifest, iter_corpus, to_wav_bytes
+from services.audio_decode import SAMPLE_RATE
+
+STAGES = ('decode', 'stt', 'prosody', 'prosody_to_vad', 'end_to_end')
+
+
+class MockWhisperBackend:
+    """모델 없이 실시간 배율(rtf)만큼 대기하는 STT 백엔드"""
+
+    name = 'mock'
+    supports_batching = False
+    model = None
+
+    def __init__(self, rtf: float = 0.05):
+        self.rtf = rtf
+
+    def transcribe(self, audio) -> dict:
+        time.sleep(len(audio) / SAMPLE_RATE * self.rtf)
+        return {'text': '', 'language': 'ko', 'segments': []}
+
+    def get_info(self) -> dict:
+        return {'backend': self.name, 'rtf': self.rtf}
+
+
+def peak_rss_mb() -> float:
+    # Linux: KB, macOS: bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def timed(fn, *args):
+    started_at = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - started_at) * 1000.0
+
+
+def summarize(values):
+    values = np.asarray(values, dtype=np.float64)
+    return {
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p95_ms': round(float(np.percentile(values, 95)), 3),
+        'mean_ms': round(float(values.mean()), 3)
+    }
+
+
+def create_service(args):
+    # 반복 측정이 전사 캐시에 맞지 않도록
+    os.environ['TRANSCRIPT_CACHE'] = 'false'
+    from services.audio_emotion_service import AudioEmotionService
+
+    if args.stt == 'mock':
+        service = AudioEmotionService(stt_backend='whisper')
+        # 지연 로드 전에 가짜 백엔드를 넣어 실제 모델을 로드하지 않음
+        service._stt_backend = MockWhisperBackend(args.mock_rtf)
+    else:
+        service = AudioEmotionService(model_name=args.model, stt_backend=args.stt)
+    return service
+
+
+def benchmark_clip(service, clip, repeat: int):
+    wav_bytes = to_wav_bytes(clip['samples'])
+    timings = {stage: [] for stage in STAGES}
+    end_to_end = None
+
+    for _ in range(repeat):
+        samples, ms = timed(service.decode_audio, wav_bytes)
+        timings['decode'].append(ms)
+        _, ms = timed(service.transcribe_audio, samples)
+        timings['stt'].append(ms)
+        features, ms = timed(service.extract_prosody_features, samples)
+        timings['prosody'].append(ms)
+        _, ms = timed(service.prosody_to_vad, features)
+        timings['prosody_to_vad'].append(ms)
+        end_to_end, ms = timed(service.analyze_audio_emotion, wav_bytes)
+        timings['end_to_end'].append(ms)
+
+    return {
+        'clip': clip['name'],
+        'kind': clip['kind'],
+        'seconds': clip['seconds'],
+        'bytes': len(wav_bytes),
+        'stages': {stage: summarize(values) for stage, values in timings.items()},
+        'x_realtime': round(clip['seconds'] * 1000.0 / max(np.median(timings['end_to_end']), 1e-9), 1),
+        'silence_trim': end_to_end.get('silence_trim') if end_to_end else None,
+        'chunks': end_to_end.get('chunks', 1) if end_to_end else None
+    }, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the audio emotion pipeline')
+    parser.add_argument('--lengths', default=','.join(f'{s:g}' for s in DEFAULT_LENGTHS),
+                        help='쉼표로 구분한 클립 길이 (초)')
+    parser.add_argument('--kinds', default=','.join(CLIP_KINDS), help=f'클립 종류 ({", ".join(CLIP_KINDS)})')
+    parser.add_argument('--repeat', type=int, default=3, help='클립별 반복 횟수')
+    parser.add_argument('--stt', default='mock', choices=('mock', 'whisper', 'faster-whisper'),
+                        help='STT 백엔드 (mock: 모델 없이 대기만)')
+    parser.add_argument('--mock-rtf', type=float, default=0.05, help='mock STT 실시간 배율 (처리 시간 / 음성 길이)')
+    parser.add_argument('--model', default='base', help='실제 STT 백엔드의 Whisper 모델 크기')
+    parser.add_argument('--output', default='audio_benchmark_report.json', help='JSON 리포트 저장 경로')
+    args = parser.parse_args()
+
+    lengths = [float(s) for s in args.lengths.split(',') if s.strip()]
+    kinds = [k.strip() for k in args.kinds.split(',') if k.strip()]
+
+    baseline_rss = peak_rss_mb()
+    service = create_service(args)
+
+    # 첫 호출 워밍업 (FFT 플랜, 모델 로드)
+    warm = next(iter_corpus([1.0], ['speech']))
+    benchmark_clip(service, warm, 1)
+
+    print("🚀 음성 분석 파이프라인 벤치마크")
+    print(f"STT: {args.stt}, 반복: {args.repeat}회")
+    print("=" * 109)
+    print(f"{'clip':<16} {'decode p50/p95':>16} {'stt p50/p95':>18} {'prosody p50/p95':>18} "
+          f"{'vad p50':>8} {'total p50/p95':>18} {'x realtime':>11}")
+
+    results = []
+    all_timings = {stage: [] for stage in STAGES}
+    for clip in iter_corpus(lengths, kinds):
+        result, timings = benchmark_clip(service, clip, args.repeat)
+        results.append(result)
+        for stage, values in timings.items():
+            all_timings[stage].extend(values)
+
+        stages = result['stages']
+        pair = lambda stage: f"{stages[stage]['p50_ms']:.1f}/{stages[stage]['p95_ms']:.1f}"
+        print(f"{result['clip']:<16} {pair('decode'):>16} {pair('stt'):>18} {pair('prosody'):>18} "
+              f"{stages['prosody_to_vad']['p50_ms']:>8.3f} {pair('end_to_end'):>18} "
+              f"{result['x_realtime']:>10.1f}x")
+
+    print("=" * 109)
+
+    report = {
+        'config': {
+            'stt': args.stt,
+            'model': args.model if args.stt != 'mock' else None,
+            'mock_rtf': args.mock_rtf if args.stt == 'mock' else None,
+            'repeat': args.repeat,
+            'lengths': lengths,
+            'kinds': kinds,
+            'trim_silence': service.trim_silence,
+            'chunked_min_seconds': service.chunked_min_seconds,
+            'chunk_seconds': service.chunk_seconds
+        },
+        'corpus': corpus_manifest(lengths, kinds),
+        'results': results,
+        'summary': {stage: summarize(values) for stage, values in all_timings.items() if values},
+        'baseline_rss_mb': round(baseline_rss, 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1)
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📄 리포트 저장: {args.output} (최대 RSS {report['peak_rss_mb']:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
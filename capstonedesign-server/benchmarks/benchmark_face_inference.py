@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+얼굴 감정 모델 추론 백엔드 벤치마크
+
+기존 model.predict() 경로와 trace된 tf.function 직접 호출 경로의
+프레임당 지연 시간을 배치 크기별로 비교한다.
+
+사용법:
+    python benchmarks/benchmark_face_inference.py --model-path models/emotion_model.h5
+    python benchmarks/benchmark_face_inference.py --synthetic   # 모델 파일 없이 동일 입력 크기의 CNN으로 측정
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.emotion_model_backend import CompiledFunctionBackend, KerasPredictBackend, load_emotion_backend
+
+
+def build_synthetic_model():
+    """64x64 흑백 입력 / 7클래스 출력의 소형 CNN (모델 파일이 없을 때 사용)"""
+    from keras import layers, models
+
+    return models.Sequential([
+        layers.Input(shape=(64, 64, 1)),
+        layers.Conv2D(16, 3, activation='relu', padding='same'),
+        layers.MaxPooling2D(),
+        layers.Conv2D(32, 3, activation='relu', padding='same'),
+        layers.MaxPooling2D(),
+        layers.Conv2D(64, 3, activation='relu', padding='same'),
+        layers.GlobalAveragePooling2D(),
+        layers.Dense(7, activation='softmax')
+    ])
+
+
+def measure(backend, batch_size: int, iterations: int, warmup: int = 5) -> dict:
+    """배치 크기별 호출 지연 시간 측정 (ms)"""
+    rng = np.random.default_rng(0)
+    faces = rng.random((batch_size, 64, 64, 1), dtype=np.float32)
+
+    for _ in range(warmup):
+        backend.predict(faces)
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        backend.predict(faces)
+        timings.append((time.perf_counter() - start) * 1000.0)
+
+    timings = np.array(timings)
+    return {
+        'p50_ms': float(np.percentile(timings, 50)),
+        'p95_ms': float(np.percentile(timings, 95)),
+        'per_frame_ms': float(np.percentile(timings, 50) / batch_size)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Face emotion inference backend benchmark')
+    parser.add_argument('--model-path', default='models/emotion_model.h5')
+    parser.add_argument('--synthetic', action='store_true', help='모델 파일 대신 합성 CNN 사용')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--batch-sizes', default='1,2,4,8,16')
+    args = parser.parse_args()
+
+    batch_sizes = [int(b) for b in args.batch_sizes.split(',')]
+    max_batch = max(batch_sizes)
+
+    if args.synthetic:
+        model = build_synthetic_model()
+        backends = [KerasPredictBackend(model), CompiledFunctionBackend(model, max_batch_size=max_batch)]
+    else:
+        keras_backend = load_emotion_backend(args.model_path, backend='keras')
+        backends = [keras_backend, CompiledFunctionBackend(keras_backend.model, max_batch_size=max_batch)]
+
+    print("🚀 얼굴 감정 모델 추론 백엔드 벤치마크")
+    print("=" * 64)
+    print(f"{'backend':<10} {'batch':>5} {'p50 (ms)':>10} {'p95 (ms)':>10} {'per-frame (ms)':>15}")
+
+    results = {}
+    for batch_size in batch_sizes:
+        for backend in backends:
+            result = measure(backend, batch_size, args.iterations)
+            results[(backend.name, batch_size)] = result
+            print(f"{backend.name:<10} {batch_size:>5} {result['p50_ms']:>10.3f} "
+                  f"{result['p95_ms']:>10.3f} {result['per_frame_ms']:>15.3f}")
+
+    print("=" * 64)
+    for batch_size in batch_sizes:
+        baseline = results[('keras', batch_size)]['p50_ms']
+        compiled = results[('compiled', batch_size)]['p50_ms']
+        print(f"📈 batch={batch_size}: compiled 경로 {baseline / compiled:.1f}배 빠름")
+
+
+if __name__ == '__main__':
+    main()
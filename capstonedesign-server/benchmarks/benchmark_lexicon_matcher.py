@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Lexicon 매칭 벤치마크
+
+감정 일기 형태의 한국어 문장(조사·어미가 붙은 활용형 포함)으로 세 가지 lexicon 매칭 방식의
+어절 매칭률과 처리 속도(어절/초)를 비교한다.
+
+- exact: 공백 토큰 완전 일치 (기존 방식)
+- prefix: 어절마다 긴 접두어부터 dict 조회 (단순 대안)
+- trie: double-array 트라이 최장 접두 매칭 (services/lexicon_trie.py)
+
+사용법:
+    python benchmarks/benchmark_lexicon_matcher.py
+    python benchmarks/benchmark_lexicon_matcher.py --repeat 500 --show 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.lexicon_trie import DoubleArrayTrie, accepts_remainder, lexicon_keys, match_tokens
+from services.text_emotion_service import TextEmotionService
+
+DEFAULT_LEXICON = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lexicon', 'Korean-NRC-EmoLex.txt')
+
+JOURNAL_SENTENCES = [
+    '오늘은 정말 기분이 좋고 행복했다.',
+    '친구와 싸워서 하루 종일 화가 났어요.',
+    '시험 결과가 걱정되어서 잠을 못 잤다.',
+    '엄마가 보내 준 편지를 읽고 눈물이 났다.',
+    '회사에서 칭찬을 받아서 뿌듯했어요.',
+    '혼자 있는 시간이 외롭고 슬펐다.',
+    '갑자기 큰 소리가 나서 깜짝 놀랐다.',
+    '새로운 일을 시작하게 되어 설레고 기대된다.',
+    '약속을 어긴 동료에게 실망했다.',
+    '비가 와서 그런지 마음이 우울하다.',
+    '오랜만에 가족과 함께 저녁을 먹어서 즐거웠다.',
+    '발표 전에 너무 긴장해서 손이 떨렸다.',
+    '길에서 쓰레기 냄새가 나서 역겨웠다.',
+    '선생님의 조언 덕분에 용기를 얻었다.',
+    '내 실수 때문에 팀이 손해를 봐서 부끄럽고 미안했다.',
+    '강아지가 아파서 병원에 다녀왔는데 무서웠어요.',
+    '드디어 목표를 이루어서 자랑스럽다.',
+    '사소한 일에도 짜증이 나는 하루였다.',
+    '친구의 배신에 분노를 느꼈다.',
+    '따뜻한 햇살 아래에서 산책하니 평화로웠다.',
+]
+
+
+def load_lexicon_words(lexicon_path: str):
+    service = TextEmotionService(lexicon_path=lexicon_path, matcher='exact')
+    return service.lexicon_words
+
+
+def exact_matcher(lexicon: set):
+    def match(text: str):
+        tokens = text.split()
+        return len(tokens), [token for token in tokens if token in lexicon]
+    return match
+
+
+def prefix_matcher(key_values: dict):
+    # 트라이와 같은 키 집합 (용언 어간 포함)에서 어절마다 긴 접두어부터 조회
+    lookup = lambda key: key_values.get(key, -1)
+
+    def match(text: str):
+        tokens = text.split()
+        matched = []
+        for token in tokens:
+            for end in range(len(token), 0, -1):
+                value = lookup(token[:end])
+                if value >= 0 and (end == len(token)
+                                   or accepts_remainder(lookup, token[:end], value, token[end:], end)):
+                    matched.append(token)
+                    break
+        return len(tokens), matched
+    return match
+
+
+def trie_matcher(trie: DoubleArrayTrie):
+    def match(text: str):
+        return match_tokens(trie, text)
+    return match
+
+
+def run(match, texts):
+    started_at = time.perf_counter()
+    total_tokens = 0
+    total_matched = 0
+    for text in texts:
+        tokens, matched = match(text)
+        total_tokens += tokens
+        total_matched += len(matched)
+    elapsed = time.perf_counter() - started_at
+    return {
+        'tokens': total_tokens,
+        'matched': total_matched,
+        'match_rate': total_matched / max(total_tokens, 1),
+        'tokens_per_sec': total_tokens / max(elapsed, 1e-9),
+        'elapsed_ms': elapsed * 1000.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Korean lexicon matchers')
+    parser.add_argument('--lexicon', default=DEFAULT_LEXICON, help='NRC EmoLex TSV 경로')
+    parser.add_argument('--repeat', type=int, default=200, help='문장 목록 반복 횟수')
+    parser.add_argument('--show', type=int, default=3, help='매칭 결과를 출력할 예시 문장 수')
+    args = parser.parse_args()
+
+    words = load_lexicon_words(args.lexicon)
+    started_at = time.perf_counter()
+    keys, values = lexicon_keys(words)
+    trie = DoubleArrayTrie.build(keys, values)
+    build_ms = (time.perf_counter() - started_at) * 1000.0
+
+    matchers = {
+        'exact': exact_matcher(set(words)),
+        'prefix': prefix_matcher(dict(zip(keys, values))),
+        'trie': trie_matcher(trie)
+    }
+    texts = JOURNAL_SENTENCES * args.repeat
+
+    print("🚀 Lexicon 매칭 벤치마크")
+    print(f"Lexicon: {len(words)}개 단어 (트라이 키 {len(trie)}개, 배열 {len(trie.check)}칸, 구성 {build_ms:.0f} ms)")
+    print(f"문장: {len(JOURNAL_SENTENCES)}개 × {args.repeat}회")
+    print("=" * 64)
+    print(f"{'matcher':<10} {'tokens':>10} {'matched':>10} {'match rate':>12} {'tokens/sec':>14}")
+
+    for name, match in matchers.items():
+        result = run(match, texts)
+        print(f"{name:<10} {result['tokens']:>10} {result['matched']:>10} "
+              f"{result['match_rate'] * 100:>11.1f}% {result['tokens_per_sec']:>14,.0f}")
+
+    print("=" * 64)
+    for text in JOURNAL_SENTENCES[:args.show]:
+        _, exact = matchers['exact'](text)
+        _, trie_matches = match_tokens(trie, text)
+        print(f"{text}")
+        print(f"  exact: {exact}")
+        print(f"  trie:  {[f'{surface}→{words[index]}' for index, surface in trie_matches]}")
+
+
+if __name__ == '__main__':
+    main()
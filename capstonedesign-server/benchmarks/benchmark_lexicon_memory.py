@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+워커 프로세스별 lexicon 메모리 벤치마크 (Linux)
+
+여러 워커 프로세스가 동시에 TextEmotionService를 만들 때, lexicon 로드 전후의 프로세스 전용 메모리(USS:
+Private_Clean + Private_Dirty)와 PSS 증가량을 TSV 파싱(Python dict / 문자열)과 메모리 매핑 아티팩트로 비교한다.
+아티팩트 페이지는 모든 워커가 페이지 캐시의 한 벌을 공유하므로 워커가 늘어도 전용 메모리는 거의 늘지 않는다.
+
+사용법:
+    python benchmarks/benchmark_lexicon_memory.py
+    python benchmarks/benchmark_lexicon_memory.py --workers 8 --matcher exact
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+DEFAULT_LEXICON = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lexicon', 'Korean-NRC-EmoLex.txt')
+
+
+def memory_kb():
+    """/proc/self/smaps_rollup의 USS / PSS (KB)"""
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return fields['Private_Clean'] + fields['Private_Dirty'], fields['Pss']
+
+
+def worker(args):
+    mode, lexicon_path, matcher, barrier = args
+    from benchmarks.benchmark_lexicon_matcher import JOURNAL_SENTENCES
+    from services.lexicon_artifact import default_artifact_path
+    from services.text_emotion_service import TextEmotionService
+
+    uss_before, pss_before = memory_kb()
+    artifact_path = default_artifact_path(lexicon_path) if mode == 'artifact' else ''
+    service = TextEmotionService(lexicon_path=lexicon_path, matcher=matcher, artifact_path=artifact_path)
+    for text in JOURNAL_SENTENCES:
+        service.analyze_text_emotion(text)
+    # 모든 워커가 lexicon을 올린 상태에서 측정 (PSS는 공유 페이지를 워커 수로 나눔)
+    barrier.wait()
+    uss_after, pss_after = memory_kb()
+    barrier.wait()
+    return uss_after - uss_before, pss_after - pss_before
+
+
+def run(mode, args):
+    context = multiprocessing.get_context('spawn')
+    manager = context.Manager()
+    barrier = manager.Barrier(args.workers)
+    with context.Pool(args.workers) as pool:
+        results = pool.map(worker, [(mode, args.lexicon, args.matcher, barrier)] * args.workers)
+    manager.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure per-worker lexicon memory')
+    parser.add_argument('--lexicon', default=DEFAULT_LEXICON, help='NRC EmoLex TSV 경로')
+    parser.add_argument('--workers', type=int, default=4, help='동시에 띄울 워커 프로세스 수')
+    parser.add_argument('--matcher', default='trie', choices=('trie', 'exact'), help='TextEmotionService 매칭 방식')
+    args = parser.parse_args()
+
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        print("❌ /proc/self/smaps_rollup이 필요합니다 (Linux 4.14+)")
+        return
+
+    # 아티팩트가 없거나 오래됐으면 워커 실행 전에 한 번 컴파일
+    from services.lexicon_artifact import load_compiled_lexicon
+    load_compiled_lexicon(args.lexicon)
+
+    print("🚀 워커별 lexicon 메모리 벤치마크")
+    print(f"워커: {args.workers}개, 매칭: {args.matcher}")
+    print("=" * 64)
+    print(f"{'mode':<10} {'USS / worker (MB)':>20} {'PSS / worker (MB)':>20} {'USS total':>10}")
+    for mode in ('tsv', 'artifact'):
+        results = run(mode, args)
+        uss = [r[0] / 1024 for r in results]
+        pss = [r[1] / 1024 for r in results]
+        print(f"{mode:<10} {sum(uss) / len(uss):>20.2f} {sum(pss) / len(pss):>20.2f} {sum(uss):>10.2f}")
+    print("=" * 64)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+STT 백엔드 벤치마크
+
+openai-whisper(PyTorch 참조 구현)와 faster-whisper(CTranslate2 int8)의
+모델 로드 시간, 실시간 배율(RTF = 처리 시간 / 음성 길이), 최대 메모리(RSS)를 비교한다.
+메모리가 섞이지 않도록 백엔드마다 별도 프로세스에서 측정한다.
+
+사용법:
+    python benchmarks/benchmark_stt.py --audio samples/interview.wav
+    python benchmarks/benchmark_stt.py --model small --backends whisper,faster-whisper:int8,faster-whisper:float32
+    python benchmarks/benchmark_stt.py --synthetic-seconds 30 --output stt_report.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.audio_decode import SAMPLE_RATE, decode_audio
+
+
+def peak_rss_mb() -> float:
+    # Linux: KB, macOS: bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def load_clips(paths, synthetic_seconds: float):
+    clips = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            clips.append((os.path.basename(path), decode_audio(f.read())))
+    if not clips:
+        from benchmarks.benchmark_prosody import synthesize_speech
+        samples, _, _ = synthesize_speech(synthetic_seconds, SAMPLE_RATE)
+        clips.append((f'synthetic_{synthetic_seconds:.0f}s', samples))
+    return clips
+
+
+def run_backend(spec: str, model_name: str, clips, cpu_threads: int, repeat: int, queue):
+    """하위 프로세스: 백엔드 하나를 로드해 모든 클립을 전사하고 결과를 queue로 전달"""
+    try:
+        from services.stt_backend import load_stt_backend
+
+        backend_name, _, compute_type = spec.partition(':')
+        baseline_rss = peak_rss_mb()
+        started_at = time.perf_counter()
+        backend = load_stt_backend(model_name, backend=backend_name,
+                                   compute_type=compute_type or 'int8', cpu_threads=cpu_threads)
+        load_seconds = time.perf_counter() - started_at
+        loaded_rss = peak_rss_mb()
+
+        # 첫 호출 워밍업 (그래프 / 커널 초기화)
+        backend.transcribe(clips[0][1][:SAMPLE_RATE])
+
+        results = []
+        for clip_name, samples in clips:
+            timings = []
+            for _ in range(repeat):
+                started_at = time.perf_counter()
+                output = backend.transcribe(samples)
+                timings.append(time.perf_counter() - started_at)
+            audio_seconds = len(samples) / SAMPLE_RATE
+            elapsed = float(np.median(timings))
+            results.append({
+                'clip': clip_name,
+                'audio_seconds': round(audio_seconds, 2),
+                'processing_seconds': round(elapsed, 3),
+                'rtf': round(elapsed / audio_seconds, 4),
+                'language': output['language'],
+                'transcript': output['text'].strip()
+            })
+
+        queue.put({
+            'backend': spec,
+            'info': backend.get_info(),
+            'load_seconds': round(load_seconds, 2),
+            'baseline_rss_mb': round(baseline_rss, 1),
+            'model_rss_mb': round(loaded_rss - baseline_rss, 1),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+            'clips': results
+        })
+    except Exception as e:
+        queue.put({'backend': spec, 'error': str(e)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark STT backends')
+    parser.add_argument('--audio', nargs='*', default=[], help='벤치마크할 오디오 파일 (없으면 합성 음성)')
+    parser.add_argument('--synthetic-seconds', type=float, default=30.0, help='합성 음성 길이 (초)')
+    parser.add_argument('--model', default='base', help='Whisper 모델 크기')
+    parser.add_argument('--backends', default='whisper,faster-whisper:int8',
+                        help='쉼표로 구분한 백엔드[:compute_type] 목록')
+    parser.add_argument('--cpu-threads', type=int, default=0, help='faster-whisper CPU 스레드 수 (0: 자동)')
+    parser.add_argument('--repeat', type=int, default=1, help='클립별 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--output', default=None, help='JSON 리포트 저장 경로')
+    args = parser.parse_args()
+
+    clips = load_clips(args.audio, args.synthetic_seconds)
+    specs = [spec.strip() for spec in args.backends.split(',') if spec.strip()]
+
+    print("🚀 STT 백엔드 벤치마크")
+    print(f"모델: {args.model}, 클립: {len(clips)}개, 총 {sum(len(s) for _, s in clips) / SAMPLE_RATE:.1f}초")
+    print("=" * 100)
+
+    ctx = multiprocessing.get_context('spawn')
+    reports = []
+    for spec in specs:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=run_backend,
+                           args=(spec, args.model, clips, args.cpu_threads, args.repeat, queue))
+        proc.start()
+        report = queue.get()
+        proc.join()
+        reports.append(report)
+
+    print(f"{'backend':<24} {'load (s)':>9} {'model MB':>9} {'peak MB':>9} {'clip':<24} "
+          f"{'audio (s)':>9} {'RTF':>7} {'x realtime':>11}")
+    for report in reports:
+        if 'error' in report:
+            print(f"{report['backend']:<24} ERROR: {report['error']}")
+            continue
+        for clip in report['clips']:
+            print(f"{report['backend']:<24} {report['load_seconds']:>9.2f} {report['model_rss_mb']:>9.1f} "
+                  f"{report['peak_rss_mb']:>9.1f} {clip['clip'][:24]:<24} {clip['audio_seconds']:>9.1f} "
+                  f"{clip['rtf']:>7.3f} {1.0 / max(clip['rtf'], 1e-9):>10.1f}x")
+    print("=" * 100)
+
+    for report in reports:
+        for clip in report.get('clips', []):
+            print(f"[{report['backend']}] {clip['clip']}: {clip['transcript'][:80]}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'model': args.model, 'reports': reports}, f, ensure_ascii=False, indent=2)
+        print(f"📄 리포트 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
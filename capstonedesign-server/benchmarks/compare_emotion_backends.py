@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+얼굴 감정 모델 백엔드 정확도 / 지연 시간 비교 리포트
+
+Keras 원본 모델을 기준으로 compiled, TFLite(float16 / int8), ONNX 결과물의
+top-1 일치율, 확률 오차, (라벨이 있으면) 정확도, 배치 크기별 지연 시간을 비교해
+배포 환경별 백엔드 선택에 쓸 JSON 리포트를 만든다.
+
+사용법:
+    python tools/export_emotion_model.py --formats tflite-fp16,tflite-int8,onnx --calibration-dir data/calibration_faces
+    python benchmarks/compare_emotion_backends.py --eval-dir data/fer_test --output backend_report.json
+
+eval-dir은 감정 라벨 이름의 하위 폴더(Angry/, Happy/, ...)에 64x64 얼굴 크롭 이미지가 들어 있는 구조이며,
+없으면 무작위 입력으로 일치율과 지연 시간만 측정한다.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.emotion_model_backend import (
+    CompiledFunctionBackend, KerasPredictBackend, OnnxRuntimeBackend, TFLiteBackend
+)
+from services.face_pipeline import EXPRESSION_LABELS, crop_faces
+
+
+def load_eval_set(eval_dir: str, limit: int):
+    """라벨 폴더 구조의 평가 이미지를 (N, 64, 64, 1), 라벨 인덱스로 로드"""
+    label_index = {label.lower(): i for i, label in enumerate(EXPRESSION_LABELS)}
+    rois, labels = [], []
+    for label_dir in sorted(os.listdir(eval_dir)):
+        idx = label_index.get(label_dir.lower())
+        if idx is None:
+            continue
+        for path in sorted(glob.glob(os.path.join(eval_dir, label_dir, '*')))[:limit]:
+            gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if gray is None:
+                continue
+            rois.append(crop_faces(gray, [(0, 0, gray.shape[1], gray.shape[0])]))
+            labels.append(idx)
+    if not rois:
+        raise ValueError(f"No labeled images found in {eval_dir}")
+    return np.concatenate(rois, axis=0), np.array(labels)
+
+
+def predict_all(backend, faces: np.ndarray, batch_size: int) -> np.ndarray:
+    return np.concatenate([
+        backend.predict(faces[i:i + batch_size]) for i in range(0, len(faces), batch_size)
+    ], axis=0)
+
+
+def measure_latency(backend, batch_size: int, iterations: int) -> dict:
+    faces = np.random.default_rng(0).random((batch_size, 64, 64, 1), dtype=np.float32)
+    for _ in range(5):
+        backend.predict(faces)
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        backend.predict(faces)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return {
+        'p50_ms': float(np.percentile(timings, 50)),
+        'p95_ms': float(np.percentile(timings, 95)),
+        'per_frame_ms': float(np.percentile(timings, 50) / batch_size)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare face emotion inference backends')
+    parser.add_argument('--model-path', default='models/emotion_model.h5')
+    parser.add_argument('--eval-dir', default=None)
+    parser.add_argument('--eval-limit', type=int, default=500, help='라벨별 최대 평가 이미지 수')
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--threads', type=int, default=None, help='TFLite / ONNX 스레드 수')
+    parser.add_argument('--output', default='backend_report.json')
+    args = parser.parse_args()
+
+    from keras.models import load_model
+
+    model = load_model(args.model_path, compile=False)
+    base = os.path.splitext(args.model_path)[0]
+
+    backends = {
+        'keras': KerasPredictBackend(model),
+        'compiled': CompiledFunctionBackend(model, max_batch_size=args.batch_size)
+    }
+    artifacts = {
+        'tflite-fp16': f"{base}_fp16.tflite",
+        'tflite-int8': f"{base}_int8.tflite",
+        'onnx': f"{base}.onnx"
+    }
+    for name, path in artifacts.items():
+        if not os.path.exists(path):
+            print(f"⏭️ {name}: {path} 없음, 건너뜀")
+            continue
+        if name == 'onnx':
+            backends[name] = OnnxRuntimeBackend(path, num_threads=args.threads)
+        else:
+            backends[name] = TFLiteBackend(path, max_batch_size=args.batch_size, num_threads=args.threads)
+
+    if args.eval_dir:
+        faces, labels = load_eval_set(args.eval_dir, args.eval_limit)
+    else:
+        faces = np.random.default_rng(1).random((256, 64, 64, 1), dtype=np.float32)
+        labels = None
+
+    reference = predict_all(backends['keras'], faces, args.batch_size)
+    reference_top1 = reference.argmax(axis=1)
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'model_path': args.model_path,
+        'eval_samples': int(len(faces)),
+        'labeled': labels is not None,
+        'backends': {}
+    }
+
+    print("🚀 얼굴 감정 모델 백엔드 비교")
+    print("=" * 96)
+    print(f"{'backend':<12} {'size (KB)':>10} {'accuracy':>9} {'agree':>7} {'max |dp|':>9} "
+          f"{'b=1 p50':>9} {'b=1 p95':>9} {f'b={args.batch_size} /frame':>14}")
+
+    for name, backend in backends.items():
+        preds = predict_all(backend, faces, args.batch_size)
+        top1 = preds.argmax(axis=1)
+        path = artifacts.get(name, args.model_path)
+        entry = {
+            'artifact': path,
+            'size_kb': os.path.getsize(path) / 1024 if os.path.exists(path) else None,
+            'accuracy': float((top1 == labels).mean()) if labels is not None else None,
+            'top1_agreement': float((top1 == reference_top1).mean()),
+            'max_abs_prob_diff': float(np.abs(preds - reference).max()),
+            'mean_abs_prob_diff': float(np.abs(preds - reference).mean()),
+            'latency_batch_1': measure_latency(backend, 1, args.iterations),
+            f'latency_batch_{args.batch_size}': measure_latency(backend, args.batch_size, args.iterations)
+        }
+        report['backends'][name] = entry
+
+        size = f"{entry['size_kb']:.1f}" if entry['size_kb'] is not None else '-'
+        accuracy = f"{entry['accuracy']:.3f}" if entry['accuracy'] is not None else '-'
+        batched = entry[f'latency_batch_{args.batch_size}']
+        print(f"{name:<12} {size:>10} {accuracy:>9} {entry['top1_agreement']:>7.3f} "
+              f"{entry['max_abs_prob_diff']:>9.4f} {entry['latency_batch_1']['p50_ms']:>9.3f} "
+              f"{entry['latency_batch_1']['p95_ms']:>9.3f} {batched['per_frame_ms']:>14.3f}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print("=" * 96)
+    print(f"📄 리포트 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,7 @@ import json
 import logging
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 
 # 서비스 임포트
@@ -15,6 +15,7 @@ from services.cbt_strategy_service import CBTStrategyService
 from services.gpt_service import GPTService
 from services.pdf_report_service import PDFReportService
 from services.gemini_question_service import GeminiQuestionService
+from services.media_payload import MediaPayloadError, is_truthy, parse_media_request
 
 # 로그 디렉토리 생성
 log_dir = "logs"
@@ -166,15 +167,17 @@ def analyze_multimodal_emotion():
         # 서비스 초기화 확인
         initialize_services()
         
-        # 요청 데이터 파싱
-        data = request.get_json()
+        # 요청 데이터 파싱 (JSON base64, multipart/form-data, MessagePack)
+        data = parse_media_request(request)
         if not data:
-            logger.error("❌ JSON 데이터가 제공되지 않음")
-            return jsonify({'error': 'No JSON data provided'}), 400
+            logger.error("❌ 요청 데이터가 제공되지 않음")
+            return jsonify({'error': 'No request data provided'}), 400
         
         face_image = data.get('face_image', '')
         audio = data.get('audio', '')
         text = data.get('text', '')
+        multi_face = is_truthy(data.get('multi_face', False))
+        session_id = data.get('session_id') or request.headers.get('X-Session-Id')
         
         logger.info(f"📊 요청 데이터 분석 - 얼굴: {bool(face_image)}, 음성: {bool(audio)}, 텍스트: {bool(text)}")
         
@@ -192,14 +195,18 @@ def analyze_multimodal_emotion():
         face_result = None
         if face_image:
             logger.info("📷 얼굴 감정 분석 시작...")
-            face_result = face_service.analyze_emotion(face_image)
+            face_result = face_service.analyze_emotion(face_image, multi_face=multi_face, session_id=session_id)
             if face_result.get('success'):
                 logger.info(f"✅ 얼굴 감정 분석 완료: {face_result.get('emotion', 'N/A')}")
+                inference_info = face_result.get('inference', {})
+                logger.debug(f"   배치 크기: {inference_info.get('batch_size')}, 대기열 대기: {inference_info.get('queue_wait_ms')}ms")
             else:
                 logger.warning(f"⚠️ 얼굴 감정 분석 실패: {face_result.get('error', 'Unknown error')}")
             
             results['face_emotion'] = face_result.get('emotion', 'N/A') if face_result.get('success') else 'N/A'
             results['face_vad'] = face_result.get('vad_score', {}) if face_result.get('success') else {}
+            if multi_face and face_result.get('success'):
+                results['faces'] = face_result.get('faces', [])
         else:
             logger.info("⏭️ 얼굴 이미지 없음, 얼굴 분석 건너뜀")
         
@@ -210,6 +217,10 @@ def analyze_multimodal_emotion():
             audio_result = audio_service.analyze_audio_emotion(audio)
             if audio_result.get('success'):
                 logger.info(f"✅ 음성 감정 분석 완료: {audio_result.get('transcript', '')[:30]}...")
+                timings = audio_result.get('timings_ms', {})
+                logger.debug(f"   디코딩: {timings.get('decode')}ms, STT: {timings.get('stt')}ms, Prosody: {timings.get('prosody')}ms, 전체: {timings.get('total')}ms")
+                if audio_result.get('timed_out'):
+                    logger.warning(f"⚠️ 음성 분석 단계 시간 초과: {', '.join(audio_result['timed_out'])}")
             else:
                 logger.warning(f"⚠️ 음성 감정 분석 실패: {audio_result.get('error', 'Unknown error')}")
             
@@ -319,6 +330,10 @@ def analyze_multimodal_emotion():
         logger.info("🎉 멀티모달 감정 분석 완료!")
         return jsonify(results)
         
+    except MediaPayloadError as e:
+        logger.error(f"❌ 잘못된 요청 본문: {str(e)}")
+        return jsonify({'error': f'Invalid request body: {str(e)}'}), 400
+        
     except Exception as e:
         logger.error(f"❌ 멀티모달 감정 분석 오류: {str(e)}")
         return jsonify({
@@ -331,27 +346,49 @@ def analyze_face_emotion():
     """얼굴 감정 분석 API"""
     logger.info("📷 얼굴 감정 분석 요청")
     try:
-        data = request.get_json()
+        # JSON base64, multipart/form-data, application/octet-stream, MessagePack 지원
+        data = parse_media_request(request, raw_field='face_image') or {}
         face_image = data.get('face_image', '')
+        multi_face = is_truthy(data.get('multi_face', False))
+        session_id = data.get('session_id') or request.headers.get('X-Session-Id')
         
         if not face_image:
             logger.error("❌ 얼굴 이미지가 제공되지 않음")
             return jsonify({'error': 'No face image provided'}), 400
         
-        result = face_service.analyze_emotion(face_image)
+        result = face_service.analyze_emotion(face_image, multi_face=multi_face, session_id=session_id)
         logger.info(f"✅ 얼굴 감정 분석 완료: {result.get('emotion', 'N/A')}")
+        inference_info = result.get('inference', {})
+        logger.debug(f"   배치 크기: {inference_info.get('batch_size')}, 대기열 대기: {inference_info.get('queue_wait_ms')}ms")
         return jsonify(result)
         
+    except MediaPayloadError as e:
+        logger.error(f"❌ 잘못된 요청 본문: {str(e)}")
+        return jsonify({'error': f'Invalid request body: {str(e)}'}), 400
+        
     except Exception as e:
         logger.error(f"❌ 얼굴 감정 분석 오류: {str(e)}")
         return jsonify({'error': f'Face analysis failed: {str(e)}'}), 500
 
+@app.route('/face_inference_stats', methods=['GET'])
+def face_inference_stats():
+    """얼굴 추론 실행기 통계 API (배치 크기, 대기열 대기 시간)"""
+    logger.info("📊 얼굴 추론 통계 요청")
+    try:
+        initialize_services()
+        return jsonify(face_service.get_inference_stats())
+        
+    except Exception as e:
+        logger.error(f"❌ 얼굴 추론 통계 오류: {str(e)}")
+        return jsonify({'error': f'Face inference stats failed: {str(e)}'}), 500
+
 @app.route('/analyze_audio_emotion', methods=['POST'])
 def analyze_audio_emotion():
     """음성 감정 분석 API"""
     logger.info("🎵 음성 감정 분석 요청")
     try:
-        data = request.get_json()
+        # JSON base64, multipart/form-data, application/octet-stream, MessagePack 지원
+        data = parse_media_request(request, raw_field='audio') or {}
         audio = data.get('audio', '')
         
         if not audio:
@@ -365,10 +402,26 @@ def analyze_audio_emotion():
             logger.warning(f"⚠️ 음성 감정 분석 실패: {result.get('error', 'Unknown error')}")
         return jsonify(result)
         
+    except MediaPayloadError as e:
+        logger.error(f"❌ 잘못된 요청 본문: {str(e)}")
+        return jsonify({'error': f'Invalid request body: {str(e)}'}), 400
+        
     except Exception as e:
         logger.error(f"❌ 음성 감정 분석 오류: {str(e)}")
         return jsonify({'error': f'Audio analysis failed: {str(e)}'}), 500
 
+@app.route('/audio_inference_stats', methods=['GET'])
+def audio_inference_stats():
+    """음성 인식 통계 API (STT 엔진, 전사 캐시 히트율)"""
+    logger.info("📊 음성 인식 통계 요청")
+    try:
+        initialize_services()
+        return jsonify(audio_service.get_inference_stats())
+        
+    except Exception as e:
+        logger.error(f"❌ 음성 인식 통계 오류: {str(e)}")
+        return jsonify({'error': f'Audio inference stats failed: {str(e)}'}), 500
+
 @app.route('/analyze_text_emotion', methods=['POST'])
 def analyze_text_emotion():
     """텍스트 감정 분석 API"""
@@ -392,6 +445,50 @@ def analyze_text_emotion():
         logger.error(f"❌ 텍스트 감정 분석 오류: {str(e)}")
         return jsonify({'error': f'Text analysis failed: {str(e)}'}), 500
 
+def _iter_ndjson_texts(stream):
+    """NDJSON 요청 본문에서 텍스트를 한 줄씩 읽음 (줄: JSON 문자열 또는 {"text": ...})"""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        item = json.loads(line)
+        yield item.get('text', '') if isinstance(item, dict) else item
+
+@app.route('/analyze_text_emotion/batch', methods=['POST'])
+def analyze_text_emotion_batch():
+    """텍스트 감정 일괄 분석 API (결과를 입력 순서대로 NDJSON 스트리밍)"""
+    logger.info("📝 텍스트 감정 일괄 분석 요청")
+    try:
+        initialize_services()
+        # {"texts": [...]} JSON 또는 한 줄에 문서 하나인 NDJSON 본문
+        if request.mimetype == 'application/x-ndjson':
+            texts = _iter_ndjson_texts(request.stream)
+        else:
+            data = request.get_json(silent=True) or {}
+            texts = data.get('texts')
+            if not isinstance(texts, list):
+                logger.error("❌ texts 목록이 제공되지 않음")
+                return jsonify({'error': 'No texts provided'}), 400
+
+        def generate():
+            count = 0
+            try:
+                for index, result in enumerate(text_service.analyze_batch(texts)):
+                    count += 1
+                    yield json.dumps(dict(result, index=index), ensure_ascii=False) + '\n'
+            except Exception as e:
+                logger.error(f"❌ 텍스트 감정 일괄 분석 오류: {str(e)}")
+                yield json.dumps({'success': False, 'index': count,
+                                  'error': f'Batch text analysis failed: {str(e)}'}, ensure_ascii=False) + '\n'
+                return
+            logger.info(f"✅ 텍스트 감정 일괄 분석 완료: {count}개")
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    except Exception as e:
+        logger.error(f"❌ 텍스트 감정 일괄 분석 오류: {str(e)}")
+        return jsonify({'error': f'Batch text analysis failed: {str(e)}'}), 500
+
 @app.route('/fuse_vad_scores', methods=['POST'])
 def fuse_vad_scores():
     """VAD Score 융합 API"""
@@ -593,8 +690,11 @@ if __name__ == '__main__':
     logger.info("📝 API 엔드포인트:")
     logger.info("   - POST /analyze_multimodal_emotion: 메인 멀티모달 분석")
     logger.info("   - POST /analyze_face_emotion: 얼굴 감정 분석")
+    logger.info("   - GET /face_inference_stats: 얼굴 추론 배치 통계")
     logger.info("   - POST /analyze_audio_emotion: 음성 감정 분석")
+    logger.info("   - GET /audio_inference_stats: 음성 인식 엔진 / 전사 캐시 통계")
     logger.info("   - POST /analyze_text_emotion: 텍스트 감정 분석")
+    logger.info("   - POST /analyze_text_emotion/batch: 텍스트 감정 일괄 분석 (NDJSON 스트리밍)")
     logger.info("   - GET /health: 서버 상태 확인")
     logger.info("   - GET /test_mock: 모킹 데이터 테스트")
     logger.info("   - POST /chat/gemini: Gemini AI 채팅")
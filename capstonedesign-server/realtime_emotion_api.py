@@ -1,88 +1,97 @@
 import os
-import csv
 from flask import Flask, request, jsonify
 import numpy as np
 import cv2
-from keras.models import load_model
 import dlib
 import base64
 import socket
 
+from services.emotion_model_backend import load_emotion_backend
+from services.face_inference import FaceBatchExecutor
+from services.face_pipeline import build_face_response, decode_image_gray, preprocess_faces
+from services.face_tracker import FaceTrackerRegistry
+from services.lexicon_artifact import load_compiled_lexicon
+from services.media_payload import is_truthy, media_bytes, parse_media_request
+
 app = Flask(__name__)
 
 # 얼굴 감정 분석 모델 및 dlib detector 로드
-emotion_model = load_model("models/emotion_model.h5", compile=False)
+FACE_BATCH_MAX_SIZE = int(os.environ.get('FACE_BATCH_MAX_SIZE', '16'))
+emotion_backend = load_emotion_backend(
+    "models/emotion_model.h5",
+    backend=os.environ.get('FACE_INFERENCE_BACKEND', 'compiled'),
+    max_batch_size=FACE_BATCH_MAX_SIZE,
+    artifact_path=os.environ.get('FACE_MODEL_ARTIFACT')
+)
+emotion_model = emotion_backend.model
 face_detector = dlib.get_frontal_face_detector()
-expression_labels = ['Angry', 'Disgust', 'Fear', 'Happy', 'Sad', 'Surprise', 'Neutral']
-
-def preprocess_face(image):
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    faces = face_detector(gray)
-    if not faces:
-        return None
-    face = faces[0]
-    x, y, w, h = face.left(), face.top(), face.width(), face.height()
-    roi = gray[y:y+h, x:x+w]
-    roi = cv2.resize(roi, (64, 64))
-    roi = roi.astype("float32") / 255.0
-    roi = np.expand_dims(roi, axis=-1)
-    roi = np.expand_dims(roi, axis=0)
-    return roi
+
+# 동시 요청의 얼굴 ROI를 모아 배치 추론
+face_batch_executor = FaceBatchExecutor(
+    emotion_backend.predict,
+    max_batch_size=FACE_BATCH_MAX_SIZE,
+    max_wait_ms=float(os.environ.get('FACE_BATCH_MAX_WAIT_MS', '5'))
+)
+
+# 세션별 얼굴 추적기 (N 프레임마다만 dlib 재검출)
+face_tracker = FaceTrackerRegistry(
+    redetect_interval=int(os.environ.get('FACE_REDETECT_INTERVAL', '10')),
+    min_confidence=float(os.environ.get('FACE_TRACK_MIN_CONFIDENCE', '0.6'))
+)
+
+# 다중 해상도 전처리: 축소 피라미드 레벨에서 검출, 원본 해상도에서 크롭
+FACE_DETECT_MAX_SIDE = int(os.environ.get('FACE_DETECT_MAX_SIDE', '640'))
+FACE_DECODE_MAX_SIDE = int(os.environ.get('FACE_DECODE_MAX_SIDE', '1280'))
 
 @app.route('/predict', methods=['POST'])
 def predict():
-    data = request.get_json()
     try:
+        # JSON base64, multipart/form-data, application/octet-stream, MessagePack 지원
+        data = parse_media_request(request, raw_field='image')
         img_data = data["image"]
-        img_bytes = base64.b64decode(img_data)
-        img_array = np.frombuffer(img_bytes, np.uint8)
-        img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+        multi_face = is_truthy(data.get('multi_face', False))
+        session_id = data.get('session_id') or request.headers.get('X-Session-Id')
+        img_bytes = media_bytes(img_data)
+        img, decode_scale = decode_image_gray(img_bytes, max_side=FACE_DECODE_MAX_SIDE)
     except Exception as e:
         return jsonify({'error': f'Invalid image data: {str(e)}'}), 400
+    if img is None:
+        return jsonify({'error': 'Invalid image data'}), 400
 
-    face = preprocess_face(img)
-    if face is None:
+    faces, boxes = preprocess_faces(
+        face_detector, img, max_faces=None if multi_face else 1,
+        detect_max_side=FACE_DETECT_MAX_SIDE, tracker=face_tracker, session_id=session_id
+    )
+    if faces is None:
         return jsonify({'error': 'No face detected'}), 400
 
     try:
-        preds = emotion_model.predict(face)[0]
-        emotion_idx = int(np.argmax(preds))
-        emotion_label = expression_labels[emotion_idx]
-        confidence = float(preds[emotion_idx])
-        probabilities = {
-            expression_labels[i]: float(preds[i]) for i in range(len(preds))
-        }
-        return jsonify({
-            'emotion': emotion_label,
-            'confidence': confidence,
-            'probabilities': probabilities
-        })
+        # 검출된 모든 얼굴을 한 번의 forward pass로 추론
+        batch_preds, inference_info = face_batch_executor.predict(faces)
+        return jsonify(build_face_response(batch_preds, boxes, inference_info, multi_face, decode_scale))
     except Exception as e:
         return jsonify({'error': f'Model inference failed: {str(e)}'}), 500
 
+@app.route('/face_inference_stats', methods=['GET'])
+def face_inference_stats():
+    return jsonify({
+        'backend': emotion_backend.get_info(),
+        'batching': face_batch_executor.get_stats(),
+        'tracking': face_tracker.get_stats()
+    })
+
 # NRC Lexicon 기반 한글 감정 분석
 LEXICON_PATH = os.path.join(os.path.dirname(__file__), 'lexicon', 'Korean-NRC-EmoLex.txt')
-korean_lexicon = {}
-lexicon_emotions = []
-with open(LEXICON_PATH, encoding='utf-8') as f:
-    reader = csv.DictReader(f, delimiter='\t')
-    lexicon_emotions = [col for col in reader.fieldnames if col not in ('English Word', 'Korean Word')]
-    for row in reader:
-        word = row['Korean Word'].strip()
-        if word:
-            korean_lexicon[word] = {emotion: int(row[emotion]) for emotion in lexicon_emotions}
+korean_lexicon, _ = load_compiled_lexicon(LEXICON_PATH)
+lexicon_emotions = korean_lexicon.emotions
 
 def analyze_korean_text_emotion(text):
-    words = text.strip().split()
-    scores = {emotion: 0 for emotion in lexicon_emotions}
-    count = {emotion: 0 for emotion in lexicon_emotions}
-    for word in words:
-        if word in korean_lexicon:
-            for emotion in lexicon_emotions:
-                scores[emotion] += korean_lexicon[word][emotion]
-                count[emotion] += 1
-    avg_scores = {emotion: (scores[emotion] / count[emotion]) if count[emotion] > 0 else 0 for emotion in lexicon_emotions}
-    return avg_scores
+    # 매칭된 단어 행의 감정별 평균 (매칭이 없으면 0)
+    rows = korean_lexicon.rows(text.strip().split())
+    if not len(rows):
+        return {emotion: 0 for emotion in lexicon_emotions}
+    avg_scores = korean_lexicon.matrix[rows].mean(axis=0)
+    return dict(zip(lexicon_emotions, avg_scores.tolist()))
 
 @app.route('/analyze_text_emotion', methods=['POST'])
 def analyze_text_emotion():
@@ -102,7 +111,7 @@ def whoami():
 def health_check():
     return jsonify({
         'status': 'healthy',
-        'model_loaded': emotion_model is not None,
+        'model_loaded': emotion_backend is not None,
         'face_detector_loaded': face_detector is not None
     })
 
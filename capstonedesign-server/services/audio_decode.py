@@ -0,0 +1,216 @@
+import io
+import os
+import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+# Whisper 입력과 동일한 분석용 샘플링 레이트
+SAMPLE_RATE = 16000
+
+# 긴 녹음을 나눠 처리하는 창 길이 (초)
+CHUNK_SECONDS = 30.0
+
+# 스트리밍 PCM 청크 형식 (little-endian)
+PCM_FORMATS = {
+    's16le': np.dtype('<i2'),
+    'f32le': np.dtype('<f4')
+}
+
+
+def to_mono_16k(samples: np.ndarray, sr: int) -> np.ndarray:
+    """(샘플 수,) 또는 (샘플 수, 채널) 배열을 16 kHz float32 mono로"""
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+    samples = np.ascontiguousarray(samples, dtype=np.float32)
+    if sr != SAMPLE_RATE:
+        import librosa
+        samples = librosa.resample(samples, orig_sr=sr, target_sr=SAMPLE_RATE)
+    return samples.astype(np.float32, copy=False)
+
+
+def _decode_with_soundfile(audio_bytes) -> Optional[np.ndarray]:
+    """WAV / FLAC / OGG(Vorbis, Opus): libsndfile로 메모리에서 바로 디코딩"""
+    try:
+        import soundfile as sf
+    except ImportError:
+        return None
+    try:
+        samples, sr = sf.read(io.BytesIO(bytes(audio_bytes)), dtype='float32', always_2d=False)
+    except Exception:
+        return None
+    return to_mono_16k(samples, sr)
+
+
+def _ffmpeg_command(source: str):
+    return [
+        'ffmpeg', '-nostdin', '-loglevel', 'error', '-threads', '0',
+        '-i', source,
+        '-f', 'f32le', '-ac', '1', '-ar', str(SAMPLE_RATE), '-'
+    ]
+
+
+def _is_iso_bmff(audio_bytes) -> bool:
+    # m4a / mp4: moov 박스가 파일 끝에 있으면 파이프 입력으로는 탐색이 불가능
+    return bytes(audio_bytes[4:8]) == b'ftyp'
+
+
+def _rechunk(blocks: Iterable[np.ndarray], chunk_samples: int) -> Iterator[np.ndarray]:
+    """가변 길이 블록을 chunk_samples 길이 청크로 다시 묶음 (마지막 청크만 짧을 수 있음)"""
+    buffered, size = [], 0
+    for block in blocks:
+        buffered.append(block)
+        size += len(block)
+        while size >= chunk_samples:
+            data = np.concatenate(buffered)
+            yield data[:chunk_samples]
+            rest = data[chunk_samples:]
+            buffered, size = ([rest], len(rest)) if len(rest) else ([], 0)
+    if size:
+        yield np.concatenate(buffered)
+
+
+def _stream_with_soundfile(source, block_samples: int) -> Optional[Iterator[np.ndarray]]:
+    """libsndfile 블록 읽기 + soxr 스트리밍 리샘플링 (파일 전체를 메모리에 올리지 않음)"""
+    try:
+        import soundfile as sf
+    except ImportError:
+        return None
+    try:
+        sound_file = sf.SoundFile(source if isinstance(source, str) else io.BytesIO(bytes(source)))
+    except Exception:
+        return None
+
+    def blocks():
+        with sound_file:
+            resampler = None
+            if sound_file.samplerate != SAMPLE_RATE:
+                import soxr
+                resampler = soxr.ResampleStream(sound_file.samplerate, SAMPLE_RATE, 1, dtype='float32')
+            for block in sound_file.blocks(blocksize=block_samples, dtype='float32', always_2d=True):
+                block = np.ascontiguousarray(block.mean(axis=1), dtype=np.float32)
+                yield resampler.resample_chunk(block) if resampler is not None else block
+            if resampler is not None:
+                yield resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+
+    return blocks()
+
+
+@contextmanager
+def _ffmpeg_source(source):
+    """ffmpeg 입력 경로, stdin으로 보낼 바이트, 넘길 fd (m4a는 탐색 가능한 메모리 파일 / 임시 파일)"""
+    if isinstance(source, str):
+        yield source, None, ()
+        return
+    data = bytes(source)
+    if not _is_iso_bmff(data):
+        yield 'pipe:0', data, ()
+    elif hasattr(os, 'memfd_create'):
+        fd = os.memfd_create('audio_upload')
+        try:
+            os.write(fd, data)
+            yield f'/dev/fd/{fd}', None, (fd,)
+        finally:
+            os.close(fd)
+    else:
+        with tempfile.NamedTemporaryFile(suffix='.m4a') as temp_file:
+            temp_file.write(data)
+            temp_file.flush()
+            yield temp_file.name, None, ()
+
+
+def _decode_with_ffmpeg(audio_bytes) -> np.ndarray:
+    """
+    webm/opus, m4a/aac 등: ffmpeg로 16 kHz float32 mono PCM 디코딩
+
+    입력은 stdin 파이프로 전달한다. 탐색이 필요한 m4a는 Linux에서는 메모리 파일(memfd)로,
+    그 외 환경에서만 임시 파일로 넘긴다.
+    """
+    with _ffmpeg_source(audio_bytes) as (path, data, fds):
+        proc = subprocess.run(_ffmpeg_command(path), input=data, capture_output=True,
+                              check=True, pass_fds=fds)
+    return np.frombuffer(proc.stdout, np.float32).copy()
+
+
+def _stream_with_ffmpeg(source, block_samples: int) -> Iterator[np.ndarray]:
+    """ffmpeg 디코더 출력을 고정 크기로 읽음 (stdin 입력은 별도 스레드에서 기록)"""
+    with _ffmpeg_source(source) as (path, data, fds):
+        proc = subprocess.Popen(_ffmpeg_command(path),
+                                stdin=subprocess.PIPE if data is not None else subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, pass_fds=fds)
+        writer = None
+        if data is not None:
+            def feed():
+                try:
+                    proc.stdin.write(data)
+                except BrokenPipeError:
+                    pass
+                finally:
+                    proc.stdin.close()
+            writer = threading.Thread(target=feed, daemon=True)
+            writer.start()
+        try:
+            block_bytes = block_samples * 4
+            while True:
+                raw = proc.stdout.read(block_bytes)
+                if not raw:
+                    break
+                usable = len(raw) - len(raw) % 4
+                yield np.frombuffer(raw[:usable], np.float32).copy()
+        finally:
+            proc.stdout.close()
+            stderr = proc.stderr.read()
+            proc.stderr.close()
+            returncode = proc.wait()
+            if writer is not None:
+                writer.join()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, 'ffmpeg', stderr=stderr)
+
+
+def iter_audio_chunks(source: Union[bytes, bytearray, memoryview, str],
+                      chunk_seconds: float = CHUNK_SECONDS) -> Iterator[np.ndarray]:
+    """
+    오디오 바이트 또는 파일 경로를 16 kHz float32 mono 청크(chunk_seconds 길이)로 순차 디코딩
+
+    녹음 길이와 상관없이 한 번에 청크 몇 개 분량만 메모리에 둔다.
+    """
+    chunk_samples = max(1, int(chunk_seconds * SAMPLE_RATE))
+    blocks = _stream_with_soundfile(source, block_samples=65536)
+    if blocks is None:
+        blocks = _stream_with_ffmpeg(source, block_samples=65536)
+    return _rechunk(blocks, chunk_samples)
+
+
+def decode_audio(audio_bytes) -> np.ndarray:
+    """
+    업로드된 오디오 바이트를 16 kHz float32 mono 배열로 한 번만 디코딩
+
+    Whisper STT와 prosody 추출이 같은 배열을 공유한다.
+    """
+    samples = _decode_with_soundfile(audio_bytes)
+    if samples is None:
+        samples = _decode_with_ffmpeg(audio_bytes)
+    if samples.size == 0:
+        raise ValueError('Decoded audio is empty')
+    return samples
+
+
+def decode_pcm(chunk, sample_format: str = 's16le', channels: int = 1) -> np.ndarray:
+    """헤더 없는 PCM 청크를 float32 mono 배열로 (샘플링 레이트 변환 없음)"""
+    if sample_format not in PCM_FORMATS:
+        raise ValueError(f"Unsupported PCM format: {sample_format} (choose from {tuple(PCM_FORMATS)})")
+    dtype = PCM_FORMATS[sample_format]
+    data = bytes(chunk)
+    usable = len(data) - len(data) % (dtype.itemsize * channels)
+    samples = np.frombuffer(data[:usable], dtype=dtype)
+    if dtype.kind == 'i':
+        samples = samples.astype(np.float32) / 32768.0
+    else:
+        samples = samples.astype(np.float32)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples
@@ -1,16 +1,75 @@
 import os
-import base64
-import tempfile
+import threading
+import time
 import numpy as np
-import librosa
-import whisper
-from typing import Dict, Optional
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 import json
 
+from services.audio_decode import SAMPLE_RATE, decode_audio, iter_audio_chunks
+from services.prosody_features import ProsodyAccumulator, compute_prosody
+from services.silence_trim import iter_speech_chunks, to_original_time, trim_silence
+from services.stt_backend import load_stt_backend
+from services.stt_batch_scheduler import WhisperBatchScheduler
+from services.transcript_cache import TranscriptCache
+from services.media_payload import MediaData, media_bytes
+
+EMPTY_PROSODY_FEATURES = {
+    'pitch_mean': 0.0, 'pitch_std': 0.0,
+    'energy_mean': 0.0, 'energy_std': 0.0,
+    'speech_rate': 0.0, 'duration': 0.0,
+    'speech_duration': 0.0, 'voiced_ratio': 0.0
+}
+
 class AudioEmotionService:
-    def __init__(self, model_name: str = "base"):
+    def __init__(self,
+                 model_name: str = "base",
+                 stt_timeout: Optional[float] = None,
+                 prosody_timeout: Optional[float] = None,
+                 stt_backend: Optional[str] = None):
         """음성 감정 분석 서비스 초기화"""
-        self.whisper_model = whisper.load_model(model_name)
+        # STT 엔진: 'whisper' (PyTorch 참조 구현) 또는 'faster-whisper' (CTranslate2 int8)
+        # 모델은 첫 캐시 미스에서 로드 (캐시 히트만으로는 로드하지 않음)
+        self.stt_model_name = model_name
+        self.stt_backend_name = stt_backend or os.getenv('STT_BACKEND', 'whisper')
+        self.stt_compute_type = os.getenv('STT_COMPUTE_TYPE', 'int8')
+        self.stt_cpu_threads = int(os.getenv('STT_CPU_THREADS', '0'))
+        self._stt_backend = None
+        self._stt_load_lock = threading.Lock()
+        
+        # 동시 요청의 30초 창을 모아 한 번에 디코딩하는 배치 스케줄러 (참조 whisper 백엔드만 지원)
+        self.stt_batching = os.getenv('STT_BATCHING', 'false').lower() == 'true'
+        self.stt_batch_max_size = int(os.getenv('STT_BATCH_MAX_SIZE', '8'))
+        self.stt_batch_max_wait_ms = float(os.getenv('STT_BATCH_MAX_WAIT_MS', '50'))
+        self.batch_scheduler = None
+        
+        # 업로드 음성의 앞/뒤·문장 사이 무음 제거 후 STT / prosody 실행 (전부 무음이면 모델 호출 없음)
+        self.trim_silence = os.getenv('AUDIO_TRIM_SILENCE', 'true').lower() == 'true'
+        self.trim_max_silence_ms = float(os.getenv('AUDIO_TRIM_MAX_SILENCE_MS', '600'))
+        
+        # AUDIO_CHUNKED_MIN_SECONDS보다 긴 녹음만 발화 사이 무음에서 자른 청크 단위로 디코딩·분석 (메모리 사용량이 청크 몇 개 분량으로 고정)
+        # 그보다 짧은 녹음은 한 번에 전사해 Whisper 문맥과 segment를 그대로 유지
+        self.chunked_min_seconds = float(os.getenv('AUDIO_CHUNKED_MIN_SECONDS', '600'))
+        self.chunk_seconds = float(os.getenv('AUDIO_CHUNK_SECONDS', '30'))
+        
+        # 같은 녹음 재업로드 / 재시도 대비 전사 캐시 (디코딩된 PCM + 엔진/모델 이름 해시)
+        self.transcript_cache = None
+        if os.getenv('TRANSCRIPT_CACHE', 'true').lower() == 'true':
+            self.transcript_cache = TranscriptCache(
+                max_entries=int(os.getenv('TRANSCRIPT_CACHE_SIZE', '256')),
+                db_path=os.getenv('TRANSCRIPT_CACHE_PATH', 'cache/transcripts.sqlite3') or None,
+                max_disk_mb=float(os.getenv('TRANSCRIPT_CACHE_DISK_MB', '256'))
+            )
+        
+        # STT와 prosody 추출을 동시에 실행하는 공용 실행기 (단계별 제한 시간, 초)
+        self.stage_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('AUDIO_STAGE_WORKERS', '4')),
+            thread_name_prefix='audio-stage'
+        )
+        self.stt_timeout = stt_timeout or float(os.getenv('AUDIO_STT_TIMEOUT', '60'))
+        self.prosody_timeout = prosody_timeout or float(os.getenv('AUDIO_PROSODY_TIMEOUT', '15'))
         
         # Prosody 특성을 VAD Score로 매핑하는 가중치
         self.prosody_weights = {
@@ -21,59 +80,64 @@ class AudioEmotionService:
             'speech_rate': {'valence': 0.2, 'arousal': 0.3, 'dominance': 0.4}
         }
     
-    def decode_audio_base64(self, audio_base64: str) -> Optional[str]:
-        """Base64 오디오를 임시 파일로 디코딩"""
+    @property
+    def stt_backend(self):
+        """STT 백엔드 (처음 접근할 때 한 번만 로드)"""
+        if self._stt_backend is None:
+            with self._stt_load_lock:
+                if self._stt_backend is None:
+                    backend = load_stt_backend(
+                        self.stt_model_name,
+                        backend=self.stt_backend_name,
+                        compute_type=self.stt_compute_type,
+                        cpu_threads=self.stt_cpu_threads
+                    )
+                    if self.stt_batching and getattr(backend, 'supports_batching', False):
+                        self.batch_scheduler = WhisperBatchScheduler(
+                            backend,
+                            max_batch_size=self.stt_batch_max_size,
+                            max_wait_ms=self.stt_batch_max_wait_ms
+                        )
+                    self._stt_backend = backend
+        return self._stt_backend
+    
+    @property
+    def whisper_model(self):
+        return self.stt_backend.model
+    
+    def _transcript_cache_variant(self) -> str:
+        variant = f'{self.stt_backend_name}:{self.stt_model_name}'
+        if self.stt_backend_name == 'faster-whisper':
+            variant += f':{self.stt_compute_type}'
+        elif self.stt_batching:
+            # 창 단위 독립 디코딩 결과는 순차 전사와 다를 수 있음
+            variant += ':batched'
+        return variant
+    
+    def decode_audio(self, audio: MediaData) -> Optional[np.ndarray]:
+        """base64 문자열 또는 원본 바이트를 16 kHz float32 mono 배열로 디코딩 (임시 파일 없음)"""
         try:
-            audio_bytes = base64.b64decode(audio_base64)
-            
-            # 임시 파일 생성
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-            temp_file.write(audio_bytes)
-            temp_file.close()
-            
-            return temp_file.name
+            return decode_audio(media_bytes(audio))
         except Exception as e:
             print(f"Audio decoding error: {e}")
             return None
     
-    def extract_prosody_features(self, audio_path: str) -> Dict:
-        """음성의 prosody 특성 추출"""
+    def extract_prosody_features(self, audio: Union[np.ndarray, str], sr: int = SAMPLE_RATE) -> Dict:
+        """음성의 prosody 특성 추출 (audio: 디코딩된 16 kHz 배열 또는 파일 경로)"""
         try:
-            # 오디오 로드
-            y, sr = librosa.load(audio_path, sr=None)
-            
-            # Pitch (F0) 추출
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-            pitch_values = pitches[magnitudes > 0.1]
-            
-            if len(pitch_values) == 0:
-                pitch_values = np.array([0])
-            
-            # Energy 추출
-            energy = librosa.feature.rms(y=y)[0]
-            
-            # Speech rate (음성 속도) 계산
-            speech_rate = len(y) / sr  # 초 단위
-            
-            # 특성 계산
-            features = {
-                'pitch_mean': float(np.mean(pitch_values)),
-                'pitch_std': float(np.std(pitch_values)),
-                'energy_mean': float(np.mean(energy)),
-                'energy_std': float(np.std(energy)),
-                'speech_rate': float(speech_rate),
-                'duration': float(len(y) / sr)
-            }
+            # 단일 STFT 기반 F0 (YIN), RMS 에너지, 음절 기반 발화 속도
+            if isinstance(audio, np.ndarray):
+                return compute_prosody(audio, sr)
             
-            return features
+            # 파일은 청크 단위로 읽으며 통계만 누적
+            accumulator = ProsodyAccumulator(SAMPLE_RATE)
+            for chunk in iter_audio_chunks(audio, self.chunk_seconds):
+                accumulator.add(chunk)
+            return accumulator.result()
             
         except Exception as e:
             print(f"Prosody extraction error: {e}")
-            return {
-                'pitch_mean': 0.0, 'pitch_std': 0.0,
-                'energy_mean': 0.0, 'energy_std': 0.0,
-                'speech_rate': 0.0, 'duration': 0.0
-            }
+            return dict(EMPTY_PROSODY_FEATURES)
     
     def prosody_to_vad(self, prosody_features: Dict) -> Dict:
         """Prosody 특성을 VAD Score로 변환"""
@@ -102,16 +166,67 @@ class AudioEmotionService:
             print(f"Prosody to VAD conversion error: {e}")
             return {'valence': 0.5, 'arousal': 0.5, 'dominance': 0.5}
     
-    def transcribe_audio(self, audio_path: str) -> Dict:
-        """Whisper를 사용한 음성 인식"""
+    def transcribe_audio(self, audio: Union[np.ndarray, str]) -> Dict:
+        """
+        Whisper를 사용한 음성 인식 (audio: 디코딩된 16 kHz 배열 또는 파일 경로)
+        
+        배열 입력은 전사 캐시를 먼저 조회하며, 히트 시 모델을 로드·실행하지 않고 'cached': True로 반환한다.
+        chunked_min_seconds보다 긴 파일은 발화 사이 무음에서 자른 청크 단위로 전사해 segment 시각을 원본 기준으로 맞춘다.
+        """
+        if isinstance(audio, str):
+            return self._transcribe_file(audio)
         try:
-            result = self.whisper_model.transcribe(audio_path)
-            return {
+            cache_key = None
+            if self.transcript_cache is not None and isinstance(audio, np.ndarray):
+                cache_key = self.transcript_cache.make_key(audio, self._transcript_cache_variant())
+                cached = self.transcript_cache.get(cache_key)
+                if cached is not None:
+                    cached['cached'] = True
+                    return cached
+            
+            backend = self.stt_backend
+            if self.batch_scheduler is not None and isinstance(audio, np.ndarray):
+                result = self.batch_scheduler.transcribe(audio, timeout=self.stt_timeout)
+            else:
+                result = backend.transcribe(audio)
+            response = {
                 'success': True,
                 'transcript': result['text'],
                 'language': result['language'],
                 'segments': result['segments']
             }
+            if cache_key is not None:
+                self.transcript_cache.put(cache_key, response)
+            return response
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Transcription failed: {str(e)}',
+                'transcript': '',
+                'language': 'unknown'
+            }
+    
+    def _transcribe_file(self, path: str) -> Dict:
+        try:
+            head, is_long, blocks = self._read_head(iter_audio_chunks(path, self.chunk_seconds))
+            if not is_long:
+                return self.transcribe_audio(np.concatenate(head) if head else np.zeros(0, dtype=np.float32))
+            
+            # 무음 제거 없이 원본 구간 그대로 자르므로 청크 시작 시각만 더하면 원본 기준 시각
+            results, segments = [], []
+            for chunk, info in iter_speech_chunks(chain(head, blocks), SAMPLE_RATE, self.chunk_seconds, trim=False):
+                result = self.transcribe_audio(chunk)
+                if not result['success']:
+                    return result
+                segments.extend(self._segments_to_original(result['segments'], info['spans'], len(segments)))
+                results.append((len(chunk), result))
+            transcript, language = self._join_transcripts(results)
+            return {
+                'success': True,
+                'transcript': transcript,
+                'language': language,
+                'segments': segments
+            }
         except Exception as e:
             return {
                 'success': False,
@@ -120,39 +235,161 @@ class AudioEmotionService:
                 'language': 'unknown'
             }
     
-    def analyze_audio_emotion(self, audio_base64: str) -> Dict:
-        """음성 감정 분석 수행"""
+    def _read_head(self, blocks: Iterable[np.ndarray]) -> Tuple[List[np.ndarray], bool, Iterable[np.ndarray]]:
+        """chunked_min_seconds를 넘을 때까지만 블록을 읽어 (읽은 블록, 긴 녹음 여부, 나머지 블록) 반환"""
+        blocks = iter(blocks)
+        head, n_samples = [], 0
+        limit = self.chunked_min_seconds * SAMPLE_RATE
+        for block in blocks:
+            head.append(block)
+            n_samples += len(block)
+            if n_samples > limit:
+                return head, True, blocks
+        return head, False, blocks
+    
+    def _segments_to_original(self, segments: List[Dict], spans: List[Tuple[float, float]], first_id: int = 0) -> List[Dict]:
+        """청크(무음 제거 후) 기준 segment 시각을 원본 녹음 기준으로 변환"""
+        return [
+            dict(segment, id=first_id + i,
+                 start=to_original_time(segment['start'], spans), end=to_original_time(segment['end'], spans))
+            for i, segment in enumerate(segments)
+        ]
+    
+    def _join_transcripts(self, results: List[Tuple[int, Dict]]) -> Tuple[str, str]:
+        """청크별 (샘플 수, 전사 결과)를 전체 전사와 (가장 긴 분량의) 언어로 합침"""
+        texts = [result['transcript'].strip() for _, result in results if result['transcript'].strip()]
+        languages = Counter()
+        for n_samples, result in results:
+            if result.get('language', 'unknown') != 'unknown':
+                languages[result['language']] += n_samples
+        return ' '.join(texts), languages.most_common(1)[0][0] if languages else 'unknown'
+    
+    def _run_timed(self, stage_fn: Callable, *args) -> Tuple[object, float]:
+        """단계 실행 후 (결과, 실행 시간 ms) 반환"""
+        started_at = time.perf_counter()
+        result = stage_fn(*args)
+        return result, (time.perf_counter() - started_at) * 1000.0
+    
+    def _join_stage(self, future: Future, deadline: float, fallback: Dict) -> Tuple[Dict, Optional[float], bool]:
+        """제한 시각까지 단계 결과를 기다림 (시간 초과 시 fallback, 실행 중인 작업은 백그라운드에서 마저 끝남)"""
         try:
-            # Base64 디코딩
-            audio_path = self.decode_audio_base64(audio_base64)
-            if not audio_path:
+            result, wall_ms = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+            return result, wall_ms, False
+        except FutureTimeoutError:
+            return fallback, None, True
+    
+    def analyze_samples(self,
+                        samples: np.ndarray,
+                        on_stage: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+        """
+        디코딩된 16 kHz 배열의 음성 감정 분석 (STT와 prosody 추출을 동시에 실행)
+        
+        on_stage가 주어지면 단계가 끝나는 대로 ('prosody', {...}), ('stt', {...})를
+        먼저 전달한다 (스트리밍에서 prosody 결과를 전사보다 먼저 보내는 용도).
+        """
+        started_at = time.perf_counter()
+        stt_future = self.stage_executor.submit(self._run_timed, self.transcribe_audio, samples)
+        prosody_future = self.stage_executor.submit(self._run_timed, self.extract_prosody_features, samples)
+        
+        # 보통 더 빨리 끝나는 prosody부터 기다림 (제한 시각은 단계별로 독립)
+        prosody_features, prosody_ms, prosody_timed_out = self._join_stage(
+            prosody_future, started_at + self.prosody_timeout, dict(EMPTY_PROSODY_FEATURES)
+        )
+        
+        # VAD Score 계산
+        vad_score = self.prosody_to_vad(prosody_features)
+        if on_stage is not None:
+            on_stage('prosody', {'prosody_features': prosody_features, 'vad_score': vad_score})
+        
+        stt_result, stt_ms, stt_timed_out = self._join_stage(
+            stt_future, started_at + self.stt_timeout,
+            {'success': False, 'error': 'Transcription timed out', 'transcript': '', 'language': 'unknown'}
+        )
+        if on_stage is not None:
+            on_stage('stt', stt_result)
+        
+        timings = {
+            'stt': round(stt_ms, 3) if stt_ms is not None else None,
+            'prosody': round(prosody_ms, 3) if prosody_ms is not None else None
+        }
+        timed_out = [name for name, flag in (('stt', stt_timed_out), ('prosody', prosody_timed_out)) if flag]
+        
+        result = {
+            'success': True,
+            'transcript': stt_result.get('transcript', ''),
+            'language': stt_result.get('language', 'unknown'),
+            'segments': stt_result.get('segments', []),
+            'prosody_features': prosody_features,
+            'vad_score': vad_score,
+            'timings_ms': timings
+        }
+        if stt_result.get('cached'):
+            result['transcript_cached'] = True
+        if timed_out:
+            result['timed_out'] = timed_out
+        return result
+    
+    def analyze_audio_emotion(self, audio: MediaData) -> Dict:
+        """
+        음성 감정 분석 수행 (audio: base64 문자열 또는 원본 바이트)
+        
+        STT와 prosody 추출은 무음을 제거한 같은 디코딩 배열로 동시에 실행되며,
+        'timings_ms'에 단계별 실행 시간을 담는다 (시간 초과 단계는 'timed_out').
+        'silence_trim'에는 제거한 무음 길이와 그만큼 아낀 단계 실행 시간 추정치를 담는다.
+        'segments'의 시각은 원본 녹음 기준이다.
+        chunked_min_seconds보다 긴 녹음은 analyze_audio_chunks()로 청크 단위 처리한다 (응답에 'chunks').
+        """
+        try:
+            started_at = time.perf_counter()
+            
+            # 오디오 디코딩 (스트리밍, chunked_min_seconds를 넘는지 알 때까지만 먼저 읽음)
+            try:
+                head, is_long, blocks = self._read_head(iter_audio_chunks(media_bytes(audio), self.chunk_seconds))
+            except Exception as e:
+                print(f"Audio decoding error: {e}")
+                head = []
+            if not head:
                 return {
                     'success': False,
                     'error': 'Invalid audio data'
                 }
+            if is_long:
+                return self.analyze_audio_chunks(chain(head, blocks), started_at=started_at)
             
-            # STT 수행
-            stt_result = self.transcribe_audio(audio_path)
+            samples = np.concatenate(head) if len(head) > 1 else head[0]
+            decoded_at = time.perf_counter()
+            timings = {'decode': round((decoded_at - started_at) * 1000.0, 3)}
             
-            # Prosody 특성 추출
-            prosody_features = self.extract_prosody_features(audio_path)
+            trim_info = None
+            if self.trim_silence:
+                samples, trim_info = trim_silence(samples, SAMPLE_RATE, max_silence_ms=self.trim_max_silence_ms)
+                timings['trim'] = round((time.perf_counter() - decoded_at) * 1000.0, 3)
             
-            # VAD Score 계산
-            vad_score = self.prosody_to_vad(prosody_features)
+            if samples.size == 0:
+                # 전부 무음: STT / prosody 생략
+                prosody_features = dict(EMPTY_PROSODY_FEATURES, duration=trim_info['original_seconds'])
+                result = {
+                    'success': True,
+                    'transcript': '',
+                    'language': 'unknown',
+                    'segments': [],
+                    'prosody_features': prosody_features,
+                    'vad_score': self.prosody_to_vad(prosody_features),
+                    'timings_ms': {}
+                }
+            else:
+                result = self.analyze_samples(samples)
             
-            # 임시 파일 삭제
-            try:
-                os.unlink(audio_path)
-            except:
-                pass
+            if trim_info is not None:
+                result['segments'] = self._segments_to_original(result['segments'], trim_info['spans'])
+                self._attach_trim_info(result, trim_info)
             
-            return {
-                'success': True,
-                'transcript': stt_result.get('transcript', ''),
-                'language': stt_result.get('language', 'unknown'),
-                'prosody_features': prosody_features,
-                'vad_score': vad_score
+            result['timings_ms'] = {
+                **timings,
+                **result['timings_ms'],
+                'total': round((time.perf_counter() - started_at) * 1000.0, 3)
             }
+            return result
             
         except Exception as e:
             return {
@@ -160,6 +397,106 @@ class AudioEmotionService:
                 'error': f'Audio emotion analysis failed: {str(e)}'
             }
     
+    def _attach_trim_info(self, result: Dict, trim_info: Dict):
+        # 제거한 구간도 발화와 같은 속도로 처리했을 때 들었을 단계 실행 시간 추정
+        stage_ms = sum(ms for name, ms in result['timings_ms'].items()
+                       if name in ('stt', 'prosody') and ms is not None)
+        trim_info['compute_saved_ms'] = (
+            round(stage_ms * trim_info['trimmed_seconds'] / trim_info['speech_seconds'], 3)
+            if trim_info['speech_seconds'] > 0 else None
+        )
+        # 응답의 duration은 원본 녹음 길이 유지
+        result['prosody_features']['duration'] = trim_info['original_seconds']
+        result['silence_trim'] = {key: value for key, value in trim_info.items() if key != 'spans'}
+    
+    def analyze_audio_chunks(self, blocks: Iterable[np.ndarray], started_at: Optional[float] = None) -> Dict:
+        """
+        긴 녹음의 청크 단위 음성 감정 분석 (blocks: 16 kHz 배열 블록을 순서대로 내는 iterable)
+        
+        블록을 끝점 검출기에 흘려 발화 사이 무음에서 chunk_seconds 이하로 자르므로 단어가 청크 경계에서 잘리지 않는다.
+        청크마다 STT는 실행기에서, prosody는 누적기에서 동시에 처리하고 다음 청크를 읽는다.
+        prosody 통계는 누적 평균 / 분산으로만 합치므로 메모리 사용량은 녹음 길이와 무관하다.
+        timings_ms의 단계별 값은 모든 청크의 합이며 ('trim'은 분할 포함), segment 시각은 원본 녹음 기준이다.
+        """
+        started_at = started_at or time.perf_counter()
+        accumulator = ProsodyAccumulator(SAMPLE_RATE)
+        stage_ms = {'decode': 0.0, 'trim': 0.0, 'stt': 0.0, 'prosody': 0.0}
+        transcripts = []
+        segments = []
+        timed_out = set()
+        trim_info = {'original_seconds': 0.0, 'speech_seconds': 0.0, 'trimmed_seconds': 0.0, 'segments': 0}
+        n_chunks = 0
+        
+        # 블록 디코딩 시간과 분할 시간을 나눠 잼 (분할기가 블록을 당겨 읽음)
+        def timed_blocks():
+            block_iter = iter(blocks)
+            while True:
+                read_at = time.perf_counter()
+                block = next(block_iter, None)
+                stage_ms['decode'] += (time.perf_counter() - read_at) * 1000.0
+                if block is None:
+                    return
+                yield block
+        
+        chunk_iter = iter_speech_chunks(timed_blocks(), SAMPLE_RATE, self.chunk_seconds, trim=self.trim_silence,
+                                        max_silence_ms=self.trim_max_silence_ms)
+        while True:
+            split_at = time.perf_counter()
+            decode_before = stage_ms['decode']
+            item = next(chunk_iter, None)
+            stage_ms['trim'] += (time.perf_counter() - split_at) * 1000.0 - (stage_ms['decode'] - decode_before)
+            if item is None:
+                break
+            chunk, chunk_trim = item
+            n_chunks += 1
+            for key in trim_info:
+                trim_info[key] += chunk_trim[key]
+            if chunk.size == 0:
+                continue
+            
+            # STT는 실행기에서, prosody 누적은 이 스레드에서 (누적기는 한 스레드에서만 갱신)
+            chunk_started_at = time.perf_counter()
+            stt_future = self.stage_executor.submit(self._run_timed, self.transcribe_audio, chunk)
+            _, prosody_ms = self._run_timed(accumulator.add, chunk)
+            stage_ms['prosody'] += prosody_ms
+            stt_result, stt_ms, stt_timed_out = self._join_stage(
+                stt_future, chunk_started_at + self.stt_timeout,
+                {'success': False, 'error': 'Transcription timed out', 'transcript': '', 'language': 'unknown'}
+            )
+            if stt_timed_out:
+                timed_out.add('stt')
+            else:
+                stage_ms['stt'] += stt_ms
+            transcripts.append((len(chunk), stt_result))
+            segments.extend(self._segments_to_original(stt_result.get('segments', []), chunk_trim['spans'], len(segments)))
+        
+        transcript, language = self._join_transcripts(transcripts)
+        prosody_features = accumulator.result() if accumulator.samples else dict(EMPTY_PROSODY_FEATURES)
+        result = {
+            'success': True,
+            'transcript': transcript,
+            'language': language,
+            'segments': segments,
+            'prosody_features': prosody_features,
+            'vad_score': self.prosody_to_vad(prosody_features),
+            'chunks': n_chunks,
+            'timings_ms': {name: round(ms, 3) for name, ms in stage_ms.items()}
+        }
+        if self.trim_silence:
+            self._attach_trim_info(result, {key: round(value, 3) for key, value in trim_info.items()})
+        if timed_out:
+            result['timed_out'] = sorted(timed_out)
+        result['timings_ms']['total'] = round((time.perf_counter() - started_at) * 1000.0, 3)
+        return result
+    
+    def get_inference_stats(self) -> Dict:
+        """STT 엔진 / 전사 캐시 / 배치 디코딩 통계 (모델이 아직 로드되지 않았으면 'stt_backend'는 None)"""
+        return {
+            'stt_backend': self._stt_backend.get_info() if self._stt_backend is not None else None,
+            'cache': self.transcript_cache.get_stats() if self.transcript_cache else None,
+            'batching': self.batch_scheduler.get_stats() if self.batch_scheduler else None
+        }
+    
     def get_mock_result(self) -> Dict:
         """모킹 결과 반환 (테스트용)"""
         return {
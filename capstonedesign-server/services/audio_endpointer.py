@@ -0,0 +1,152 @@
+from collections import deque
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+
+# 초기 잡음 바닥을 주지 않았을 때의 시작값 (dBFS, 조용한 방의 마이크 입력 수준)
+DEFAULT_NOISE_FLOOR_DB = -60.0
+
+
+class Utterance(NamedTuple):
+    """끝점 검출로 잘라낸 발화 구간"""
+    index: int
+    samples: np.ndarray
+    start: float
+    end: float
+
+
+def frame_levels_db(frames: np.ndarray) -> np.ndarray:
+    """(프레임 수, 프레임 길이) 배열의 프레임별 RMS 레벨 (dB)"""
+    rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+    return 20.0 * np.log10(rms + 1e-10)
+
+
+class EnergyEndpointer:
+    def __init__(self,
+                 sample_rate: int = 16000,
+                 frame_ms: float = 30.0,
+                 threshold_db: float = 10.0,
+                 min_level_db: float = -50.0,
+                 min_speech_ms: float = 200.0,
+                 max_silence_ms: float = 600.0,
+                 pre_roll_ms: float = 300.0,
+                 max_utterance_s: float = 20.0,
+                 initial_noise_floor_db: Optional[float] = None,
+                 noise_window_s: Optional[float] = 5.0):
+        """
+        에너지 기반 발화 끝점 검출기 (스트리밍)
+
+        프레임 에너지가 적응형 잡음 바닥보다 threshold_db 이상 높으면 음성으로 보고,
+        음성 뒤에 max_silence_ms 이상 무음이 이어지면 발화를 닫는다.
+        min_speech_ms보다 짧은 음성은 버리고, max_utterance_s를 넘으면 강제로 자른다.
+        잡음 바닥은 initial_noise_floor_db(없으면 DEFAULT_NOISE_FLOOR_DB)에서 시작해 무음 프레임으로만 갱신하므로,
+        첫 프레임부터 말을 해도 말소리가 잡음 바닥이 되지 않는다. 다만 최근 noise_window_s 동안 무음 프레임이
+        하나도 없으면 (잡음 바닥보다 시끄러운 환경) 그 구간의 가장 조용한 프레임 레벨로 바닥을 올린다 (None이면 끔).
+        """
+        self.sample_rate = int(sample_rate)
+        self.frame_length = max(1, int(self.sample_rate * frame_ms / 1000.0))
+        self.threshold_db = threshold_db
+        self.min_level_db = min_level_db
+        self.min_speech_frames = max(1, int(min_speech_ms / frame_ms))
+        self.max_silence_frames = max(1, int(max_silence_ms / frame_ms))
+        self.pre_roll_frames = int(pre_roll_ms / frame_ms)
+        self.max_utterance_frames = max(1, int(max_utterance_s * 1000.0 / frame_ms))
+        self.noise_window_frames = max(1, int(noise_window_s * 1000.0 / frame_ms)) if noise_window_s else 0
+
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._frames_seen = 0
+        self._noise_floor_db = DEFAULT_NOISE_FLOOR_DB if initial_noise_floor_db is None else initial_noise_floor_db
+        self._recent_levels = deque(maxlen=self.noise_window_frames)
+        self._pre_roll: List[np.ndarray] = []
+        self._utterance: List[np.ndarray] = []
+        self._utterance_start = 0
+        self._speech_frames = 0
+        self._silence_frames = 0
+        self._count = 0
+
+    @property
+    def in_speech(self) -> bool:
+        return bool(self._utterance)
+
+    def _close(self) -> Optional[Utterance]:
+        """진행 중인 발화를 닫고 (충분히 길면) 반환"""
+        frames, speech_frames, silence_frames = self._utterance, self._speech_frames, self._silence_frames
+        start = self._utterance_start
+        self._utterance, self._speech_frames, self._silence_frames = [], 0, 0
+        if speech_frames < self.min_speech_frames:
+            return None
+
+        # 끝의 무음은 사전 롤 길이만큼만 남김
+        keep = len(frames) - max(0, silence_frames - self.pre_roll_frames)
+        samples = np.concatenate(frames[:keep])
+        utterance = Utterance(
+            index=self._count,
+            samples=samples,
+            start=start * self.frame_length / self.sample_rate,
+            end=(start + keep) * self.frame_length / self.sample_rate
+        )
+        self._count += 1
+        return utterance
+
+    def feed(self, samples: np.ndarray) -> List[Utterance]:
+        """오디오 청크 입력, 이번 청크에서 닫힌 발화 목록 반환"""
+        samples = np.concatenate([self._remainder, np.asarray(samples, dtype=np.float32)])
+        n_frames = len(samples) // self.frame_length
+        self._remainder = samples[n_frames * self.frame_length:]
+        if n_frames == 0:
+            return []
+
+        frames = samples[:n_frames * self.frame_length].reshape(n_frames, self.frame_length)
+        levels = frame_levels_db(frames)
+
+        closed = []
+        for frame, level in zip(frames, levels):
+            frame_index = self._frames_seen
+            self._frames_seen += 1
+
+            if self.noise_window_frames:
+                self._recent_levels.append(level)
+                if len(self._recent_levels) == self.noise_window_frames:
+                    quietest = min(self._recent_levels)
+                    if quietest > self._noise_floor_db + self.threshold_db:
+                        self._noise_floor_db = quietest
+            is_speech = level > max(self._noise_floor_db + self.threshold_db, self.min_level_db)
+
+            if not self._utterance:
+                if is_speech:
+                    # 발화 시작: 직전 사전 롤 프레임 포함
+                    self._utterance = self._pre_roll + [frame]
+                    self._utterance_start = frame_index - len(self._pre_roll)
+                    self._pre_roll = []
+                    self._speech_frames = 1
+                else:
+                    # 무음 구간에서만 잡음 바닥 갱신 (하강은 빠르게, 상승은 천천히)
+                    rate = 0.5 if level < self._noise_floor_db else 0.02
+                    self._noise_floor_db += rate * (level - self._noise_floor_db)
+                    if self.pre_roll_frames:
+                        self._pre_roll = (self._pre_roll + [frame])[-self.pre_roll_frames:]
+                continue
+
+            self._utterance.append(frame)
+            if is_speech:
+                self._speech_frames += 1
+                self._silence_frames = 0
+            else:
+                self._silence_frames += 1
+
+            if self._silence_frames >= self.max_silence_frames or len(self._utterance) >= self.max_utterance_frames:
+                utterance = self._close()
+                if utterance is not None:
+                    closed.append(utterance)
+
+        return closed
+
+    def flush(self) -> Optional[Utterance]:
+        """스트림 종료 시 진행 중인 발화를 닫음"""
+        if self._remainder.size and self._utterance:
+            self._utterance.append(self._remainder)
+        self._remainder = np.zeros(0, dtype=np.float32)
+        if not self._utterance:
+            return None
+        return self._close()
@@ -0,0 +1,102 @@
+import queue
+import threading
+import time
+from typing import Dict, Optional, Union
+
+from services.audio_decode import PCM_FORMATS, decode_pcm
+from services.audio_endpointer import EnergyEndpointer, Utterance
+
+# 스트림 종료 표시 (finish() 이후 남은 발화를 모두 꺼낸 다음 반환)
+STREAM_END = object()
+
+
+class AudioStreamSession:
+    def __init__(self,
+                 session_id: str,
+                 sample_rate: int = 16000,
+                 sample_format: str = 's16le',
+                 channels: int = 1,
+                 **endpointer_options):
+        """
+        연결별 스트리밍 음성 세션
+
+        PCM 청크를 받아 끝점 검출기로 발화 단위로 자르고, 닫힌 발화를 순서대로
+        분석 워커에 넘긴다. 청크 경계에서 잘린 샘플 바이트는 다음 청크와 이어 붙인다.
+        """
+        if sample_format not in PCM_FORMATS:
+            raise ValueError(f"Unsupported PCM format: {sample_format} (choose from {tuple(PCM_FORMATS)})")
+        self.session_id = session_id
+        self.sample_rate = int(sample_rate)
+        self.sample_format = sample_format
+        self.channels = max(1, int(channels))
+        self.endpointer = EnergyEndpointer(sample_rate=self.sample_rate, **endpointer_options)
+
+        self._frame_bytes = PCM_FORMATS[sample_format].itemsize * self.channels
+        self._byte_remainder = b''
+        self._utterances: "queue.Queue" = queue.Queue()
+        # Socket.IO 이벤트 핸들러는 스레드별로 실행되므로 청크 처리 직렬화
+        self._lock = threading.Lock()
+        self._finished = False
+        self.closed = False
+
+        self.started_at = time.monotonic()
+        self.chunks_received = 0
+        self.samples_received = 0
+        self.utterances_closed = 0
+
+    def feed(self, chunk) -> int:
+        """PCM 청크 입력, 이번 청크에서 닫힌 발화 수 반환"""
+        with self._lock:
+            if self._finished or self.closed:
+                return 0
+            data = self._byte_remainder + bytes(chunk)
+            usable = len(data) - len(data) % self._frame_bytes
+            self._byte_remainder = data[usable:]
+
+            samples = decode_pcm(data[:usable], self.sample_format, self.channels)
+            self.chunks_received += 1
+            self.samples_received += len(samples)
+
+            utterances = self.endpointer.feed(samples)
+            for utterance in utterances:
+                self._utterances.put(utterance)
+            self.utterances_closed += len(utterances)
+            return len(utterances)
+
+    def finish(self):
+        """녹음 종료: 진행 중인 발화를 닫고 종료 표시를 넣음"""
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+            utterance = self.endpointer.flush()
+            if utterance is not None:
+                self._utterances.put(utterance)
+                self.utterances_closed += 1
+            self._utterances.put(STREAM_END)
+
+    def close(self):
+        """연결 해제: 남은 발화는 버리고 워커를 깨움"""
+        self.closed = True
+        self._finished = True
+        self._utterances.put(STREAM_END)
+
+    def next_utterance(self, timeout: Optional[float] = None) -> Union[Utterance, object, None]:
+        """다음 발화 (없으면 None, 스트림 종료 시 STREAM_END)"""
+        if self.closed:
+            return STREAM_END
+        try:
+            return self._utterances.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def get_stats(self) -> Dict:
+        return {
+            'session_id': self.session_id,
+            'sample_rate': self.sample_rate,
+            'chunks_received': self.chunks_received,
+            'audio_seconds': round(self.samples_received / self.sample_rate, 3),
+            'utterances': self.utterances_closed,
+            'in_speech': self.endpointer.in_speech,
+            'uptime_seconds': round(time.monotonic() - self.started_at, 3)
+        }
@@ -0,0 +1,112 @@
+import csv
+from collections.abc import Sequence as SequenceABC
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# NRC EmoLex TSV에서 감정 열이 아닌 열
+WORD_COLUMNS = ('English Word', 'Korean Word')
+
+
+class StringTable(SequenceABC):
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        """
+        UTF-8 바이트 배열 + 오프셋 배열 위의 읽기 전용 문자열 목록
+
+        i번째 문자열은 data[offsets[i]:offsets[i + 1]]이며 접근할 때만 디코딩한다.
+        두 배열이 메모리 매핑된 파일이면 프로세스마다 Python 문자열 객체를 만들지 않는다.
+        """
+        self._data = memoryview(np.ascontiguousarray(data, dtype=np.uint8))
+        self._offsets = memoryview(np.ascontiguousarray(offsets, dtype=np.int32)).cast('B').cast('i')
+        self._length = len(self._offsets) - 1
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._length))]
+        i = int(i)
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError('string table index out of range')
+        return str(self._data[self._offsets[i]:self._offsets[i + 1]], 'utf-8')
+
+
+class TrieIndex:
+    def __init__(self, trie, words: Sequence[str]):
+        """
+        트라이 기반 단어 → 행 번호 색인 (dict 대신 메모리 매핑된 트라이 배열을 그대로 사용)
+
+        매칭용 트라이에는 용언 어간도 들어 있으므로, 찾은 행의 단어가 조회한 단어와 같을 때만 일치로 본다.
+        """
+        self.trie = trie
+        self.words = words
+
+    def get(self, word: str, default: Optional[int] = None) -> Optional[int]:
+        row = self.trie.get(word)
+        if row < 0 or self.words[row] != word:
+            return default
+        return row
+
+    def __getitem__(self, word: str) -> int:
+        row = self.get(word)
+        if row is None:
+            raise KeyError(word)
+        return row
+
+    def __contains__(self, word: str) -> bool:
+        return self.get(word) is not None
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+class EmotionLexicon:
+    def __init__(self, words: Sequence[str], emotions: Sequence[str], matrix: np.ndarray, index=None):
+        """
+        단어 → 행 번호 색인 + (단어 수, 감정 수) uint8 감정 행렬
+
+        matrix[index[word]]가 단어의 감정 열 값이며, 행 번호는 words 순서와 같다.
+        index는 get / in / [] 를 지원하는 객체로 바꿀 수 있다 (기본: dict).
+        """
+        self.words = words if isinstance(words, StringTable) else list(words)
+        self.emotions = list(emotions)
+        self.matrix = matrix
+        self.index = index if index is not None else {word: row for row, word in enumerate(self.words)}
+
+    @classmethod
+    def from_tsv(cls, path: str) -> 'EmotionLexicon':
+        """NRC EmoLex TSV 로드 (같은 한국어 단어가 여러 행이면 처음 나온 위치, 마지막 행의 값)"""
+        with open(path, encoding='utf-8') as f:
+            reader = csv.DictReader(f, delimiter='\t')
+            emotions = [col for col in reader.fieldnames if col not in WORD_COLUMNS]
+            values: Dict[str, List[int]] = {}
+            for row in reader:
+                word = row['Korean Word'].strip()
+                if word:
+                    values[word] = [int(row[emotion]) for emotion in emotions]
+
+        matrix = np.array(list(values.values()), dtype=np.uint8).reshape(len(values), len(emotions))
+        return cls(list(values), emotions, matrix)
+
+    @classmethod
+    def empty(cls, emotions: Sequence[str]) -> 'EmotionLexicon':
+        return cls([], emotions, np.zeros((0, len(emotions)), dtype=np.uint8))
+
+    def rows(self, words: Iterable[str]) -> np.ndarray:
+        """lexicon에 있는 단어의 행 번호 (없는 단어는 건너뜀)"""
+        get = self.index.get
+        rows = [get(word) for word in words]
+        return np.array([row for row in rows if row is not None], dtype=np.intp)
+
+    def __getitem__(self, word: str) -> Dict[str, int]:
+        """기존 dict 형식 조회: {감정: 0/1}"""
+        return dict(zip(self.emotions, self.matrix[self.index[word]].tolist()))
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.index
+
+    def __len__(self) -> int:
+        return len(self.words)
@@ -0,0 +1,285 @@
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+def _batch_buckets(max_batch_size: int) -> List[int]:
+    """고정 입력 크기 버킷 (1, 2, 4, ... max_batch_size)"""
+    max_batch_size = max(1, int(max_batch_size))
+    buckets = []
+    size = 1
+    while size < max_batch_size:
+        buckets.append(size)
+        size *= 2
+    buckets.append(max_batch_size)
+    return buckets
+
+
+def _predict_in_buckets(faces: np.ndarray,
+                        bucket_sizes: List[int],
+                        buffers: Dict[int, np.ndarray],
+                        run_bucket: Callable[[int, np.ndarray], np.ndarray]) -> np.ndarray:
+    """ROI 배치를 가장 가까운 버킷의 미리 할당된 버퍼에 채워 실행"""
+    faces = np.asarray(faces, dtype=np.float32)
+    max_size = bucket_sizes[-1]
+    results = []
+    for start in range(0, len(faces), max_size):
+        chunk = faces[start:start + max_size]
+        n = len(chunk)
+        size = next(b for b in bucket_sizes if b >= n)
+        buffer = buffers[size]
+        buffer[:n] = chunk
+        if n < size:
+            buffer[n:] = 0.0
+        results.append(run_bucket(size, buffer)[:n])
+    return np.concatenate(results, axis=0)
+
+
+class KerasPredictBackend:
+    """기존 model.predict() 경로 (기준선)"""
+
+    name = 'keras'
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict(self, faces: np.ndarray) -> np.ndarray:
+        return self.model.predict(faces, verbose=0)
+
+    def get_info(self) -> Dict:
+        return {'backend': self.name}
+
+
+class CompiledFunctionBackend:
+    """
+    model.predict() 대신 고정 시그니처로 trace한 tf.function을 직접 호출하는 백엔드
+
+    로드 시점에 배치 크기 1, 2, 4, ... max_batch_size 버킷별 concrete function을
+    한 번씩 trace해 두고, 호출 시에는 가장 가까운 버킷의 미리 할당된 입력 버퍼에
+    ROI를 채워 바로 실행한다 (data adapter / 분산 루프 생성 비용 없음).
+    """
+
+    name = 'compiled'
+
+    def __init__(self, model, max_batch_size: int = 16):
+        import tensorflow as tf
+
+        self.model = model
+        self.input_shape = tuple(int(d) for d in model.input_shape[1:])
+        self.bucket_sizes = _batch_buckets(max_batch_size)
+        self._tf = tf
+        self._local = threading.local()
+
+        forward = tf.function(lambda x: model(x, training=False), autograph=False)
+        self._concrete_fns = {
+            size: forward.get_concrete_function(
+                tf.TensorSpec((size,) + self.input_shape, tf.float32)
+            )
+            for size in self.bucket_sizes
+        }
+
+        # 워밍업: 첫 요청에서 그래프 최적화 비용을 치르지 않도록 미리 실행
+        for size in self.bucket_sizes:
+            self._run_bucket(size, np.zeros((size,) + self.input_shape, dtype=np.float32))
+
+    def _buffers(self) -> Dict[int, np.ndarray]:
+        """스레드별로 미리 할당된 버킷 입력 버퍼"""
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = {
+                size: np.zeros((size,) + self.input_shape, dtype=np.float32)
+                for size in self.bucket_sizes
+            }
+            self._local.buffers = buffers
+        return buffers
+
+    def _run_bucket(self, size: int, batch: np.ndarray) -> np.ndarray:
+        outputs = self._concrete_fns[size](self._tf.constant(batch))
+        return np.asarray(outputs)
+
+    def predict(self, faces: np.ndarray) -> np.ndarray:
+        return _predict_in_buckets(faces, self.bucket_sizes, self._buffers(), self._run_bucket)
+
+    def get_info(self) -> Dict:
+        return {'backend': self.name, 'bucket_sizes': self.bucket_sizes}
+
+
+def _tflite_interpreter_class():
+    """가벼운 tflite_runtime 우선, 없으면 LiteRT / TensorFlow 내장 인터프리터"""
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        try:
+            from ai_edge_litert.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+class TFLiteBackend:
+    """
+    export_emotion_model.py로 변환한 TFLite 모델(float16 / int8)을 인터프리터로 직접 실행
+
+    인터프리터는 스레드 안전하지 않으므로 스레드별 · 버킷별로 따로 만들어 둔다.
+    """
+
+    name = 'tflite'
+
+    def __init__(self, artifact_path: str, max_batch_size: int = 16, num_threads: Optional[int] = None):
+        self.model = None
+        self.artifact_path = artifact_path
+        self.num_threads = num_threads
+        self.bucket_sizes = _batch_buckets(max_batch_size)
+        self._interpreter_cls = _tflite_interpreter_class()
+        self._local = threading.local()
+
+        probe = self._new_interpreter()
+        input_details = probe.get_input_details()[0]
+        output_details = probe.get_output_details()[0]
+        self.input_shape = tuple(int(d) for d in input_details['shape'][1:])
+        self.input_dtype = input_details['dtype']
+        self.input_quantization = input_details['quantization']
+        self.output_quantization = output_details['quantization']
+        self.output_dtype = output_details['dtype']
+
+    def _new_interpreter(self):
+        return self._interpreter_cls(model_path=self.artifact_path, num_threads=self.num_threads)
+
+    def _state(self) -> Dict:
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            state = {
+                'interpreters': {},
+                'buffers': {
+                    size: np.zeros((size,) + self.input_shape, dtype=np.float32)
+                    for size in self.bucket_sizes
+                }
+            }
+            self._local.state = state
+        return state
+
+    def _interpreter(self, size: int):
+        interpreters = self._state()['interpreters']
+        interpreter = interpreters.get(size)
+        if interpreter is None:
+            interpreter = self._new_interpreter()
+            input_index = interpreter.get_input_details()[0]['index']
+            interpreter.resize_tensor_input(input_index, (size,) + self.input_shape)
+            interpreter.allocate_tensors()
+            interpreters[size] = interpreter
+        return interpreter
+
+    def _run_bucket(self, size: int, batch: np.ndarray) -> np.ndarray:
+        interpreter = self._interpreter(size)
+        if self.input_dtype != np.float32:
+            # 입력까지 정수 양자화된 모델
+            scale, zero_point = self.input_quantization
+            batch = np.clip(np.round(batch / scale + zero_point),
+                            np.iinfo(self.input_dtype).min, np.iinfo(self.input_dtype).max).astype(self.input_dtype)
+        interpreter.set_tensor(interpreter.get_input_details()[0]['index'], batch)
+        interpreter.invoke()
+        outputs = interpreter.get_tensor(interpreter.get_output_details()[0]['index'])
+        if self.output_dtype != np.float32:
+            scale, zero_point = self.output_quantization
+            outputs = (outputs.astype(np.float32) - zero_point) * scale
+        return outputs
+
+    def predict(self, faces: np.ndarray) -> np.ndarray:
+        return _predict_in_buckets(faces, self.bucket_sizes, self._state()['buffers'], self._run_bucket)
+
+    def get_info(self) -> Dict:
+        return {
+            'backend': self.name,
+            'artifact': os.path.basename(self.artifact_path),
+            'input_dtype': np.dtype(self.input_dtype).name,
+            'bucket_sizes': self.bucket_sizes
+        }
+
+
+class OnnxRuntimeBackend:
+    """export_emotion_model.py로 변환한 ONNX 모델을 onnxruntime CPU 세션으로 실행"""
+
+    name = 'onnx'
+
+    def __init__(self, artifact_path: str, num_threads: Optional[int] = None):
+        import onnxruntime as ort
+
+        self.model = None
+        self.artifact_path = artifact_path
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(artifact_path, sess_options=options,
+                                            providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict(self, faces: np.ndarray) -> np.ndarray:
+        faces = np.ascontiguousarray(faces, dtype=np.float32)
+        return self.session.run(None, {self.input_name: faces})[0]
+
+    def get_info(self) -> Dict:
+        return {'backend': self.name, 'artifact': os.path.basename(self.artifact_path)}
+
+
+INFERENCE_BACKENDS = ('keras', 'compiled', 'tflite', 'onnx')
+
+# tflite / onnx 백엔드의 기본 변환 결과물 경로 (모델 경로 기준)
+DEFAULT_ARTIFACT_SUFFIXES = {
+    'tflite': '_fp16.tflite',
+    'onnx': '.onnx'
+}
+
+
+def default_artifact_path(model_path: str, backend: str) -> str:
+    return os.path.splitext(model_path)[0] + DEFAULT_ARTIFACT_SUFFIXES[backend]
+
+
+def configure_tf_threads(intra_op_threads: int, inter_op_threads: int):
+    """
+    TensorFlow 연산 스레드 풀 크기 설정 (프로세스 전역, TF 런타임 초기화 전에만 적용)
+
+    keras / compiled 복제본은 하나의 intra-op 풀을 공유하므로 복제본별이 아니라
+    전체 코어 수 기준으로 잡고, inter-op 풀은 동시에 실행될 복제본 수만큼 둔다.
+    """
+    import tensorflow as tf
+
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(int(intra_op_threads))
+        tf.config.threading.set_inter_op_parallelism_threads(int(inter_op_threads))
+    except RuntimeError as e:
+        print(f"TensorFlow thread configuration skipped (runtime already initialized): {e}")
+
+
+def load_emotion_backend(model_path: str,
+                         backend: str = 'compiled',
+                         max_batch_size: int = 16,
+                         artifact_path: Optional[str] = None,
+                         num_threads: Optional[int] = None):
+    """
+    감정 분류 모델을 로드하고 지정한 추론 백엔드로 감싸서 반환
+
+    tflite / onnx 백엔드는 Keras/TensorFlow를 로드하지 않고 변환된 결과물
+    (artifact_path, 기본값: models/emotion_model_fp16.tflite, models/emotion_model.onnx)만 읽는다.
+    """
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown inference backend: {backend} (choose from {INFERENCE_BACKENDS})")
+
+    if backend in DEFAULT_ARTIFACT_SUFFIXES:
+        artifact_path = artifact_path or default_artifact_path(model_path, backend)
+        if backend == 'tflite':
+            return TFLiteBackend(artifact_path, max_batch_size=max_batch_size, num_threads=num_threads)
+        return OnnxRuntimeBackend(artifact_path, num_threads=num_threads)
+
+    from keras.models import load_model
+
+    model = load_model(model_path, compile=False)
+    if backend == 'compiled':
+        try:
+            return CompiledFunctionBackend(model, max_batch_size=max_batch_size)
+        except Exception as e:
+            print(f"Compiled backend initialization error, falling back to keras predict: {e}")
+    return KerasPredictBackend(model)
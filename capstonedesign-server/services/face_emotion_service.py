@@ -2,56 +2,171 @@ import os
 import numpy as np
 import cv2
 import dlib
-import base64
-from keras.models import load_model
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from services.emotion_model_backend import configure_tf_threads, load_emotion_backend
+from services.face_inference import FaceBatchExecutor
+from services.face_replica_pool import FaceReplicaPool, default_threads_per_replica
+from services.face_result_cache import FaceResultCache
+from services.face_tracker import FaceTrackerRegistry
+from services.media_payload import MediaData, media_bytes
+from services.face_pipeline import (
+    EMOTION_TO_VAD, EXPRESSION_LABELS, build_face_results, decode_image_gray, preprocess_faces
+)
 
 class FaceEmotionService:
-    def __init__(self, model_path: str = "models/emotion_model.h5"):
+    def __init__(self,
+                 model_path: str = "models/emotion_model.h5",
+                 use_batching: Optional[bool] = None,
+                 batch_max_size: Optional[int] = None,
+                 batch_max_wait_ms: Optional[float] = None,
+                 inference_backend: Optional[str] = None,
+                 model_artifact_path: Optional[str] = None,
+                 num_replicas: Optional[int] = None):
         """얼굴 감정 분석 서비스 초기화"""
-        self.emotion_model = load_model(model_path, compile=False)
+        batch_max_size = batch_max_size or int(os.getenv('FACE_BATCH_MAX_SIZE', '16'))
+        inference_backend = inference_backend or os.getenv('FACE_INFERENCE_BACKEND', 'compiled')
+        model_artifact_path = model_artifact_path or os.getenv('FACE_MODEL_ARTIFACT')
+        
+        # 추론 백엔드 ('compiled': trace된 tf.function 직접 호출, 'keras': model.predict,
+        # 'tflite' / 'onnx': export_emotion_model.py로 변환한 경량 모델)
+        num_replicas = num_replicas or int(os.getenv('FACE_REPLICAS', '1'))
+        self.replica_pool = None
+        if num_replicas > 1:
+            # 코어별 모델 복제본 풀 (복제본마다 전용 스레드, 가장 한가한 복제본으로 분배)
+            threads = int(os.getenv('FACE_REPLICA_THREADS', '0')) or default_threads_per_replica(num_replicas)
+            if inference_backend in ('keras', 'compiled'):
+                configure_tf_threads(threads * num_replicas, num_replicas)
+            self.replica_pool = FaceReplicaPool(
+                lambda i: load_emotion_backend(
+                    model_path,
+                    backend=inference_backend,
+                    max_batch_size=batch_max_size,
+                    artifact_path=model_artifact_path,
+                    num_threads=threads
+                ),
+                num_replicas=num_replicas,
+                threads_per_replica=threads
+            )
+            self.emotion_backend = self.replica_pool
+        else:
+            self.emotion_backend = load_emotion_backend(
+                model_path,
+                backend=inference_backend,
+                max_batch_size=batch_max_size,
+                artifact_path=model_artifact_path
+            )
+        self.emotion_model = self.emotion_backend.model
         self.face_detector = dlib.get_frontal_face_detector()
-        self.expression_labels = ['Angry', 'Disgust', 'Fear', 'Happy', 'Sad', 'Surprise', 'Neutral']
+        
+        # 다중 해상도 전처리: 축소 피라미드 레벨에서 검출, 원본 해상도에서 크롭
+        self.detect_max_side = int(os.getenv('FACE_DETECT_MAX_SIDE', '640'))
+        self.decode_max_side = int(os.getenv('FACE_DECODE_MAX_SIDE', '1280'))
+        
+        # 마이크로 배칭 추론 실행기 (동시 요청의 ROI를 모아 한 번에 추론)
+        if use_batching is None:
+            use_batching = os.getenv('FACE_BATCHING', 'true').lower() == 'true'
+        self.batch_executor = None
+        if use_batching:
+            self.batch_executor = FaceBatchExecutor(
+                self._predict_batch,
+                max_batch_size=batch_max_size,
+                max_wait_ms=batch_max_wait_ms if batch_max_wait_ms is not None
+                else float(os.getenv('FACE_BATCH_MAX_WAIT_MS', '5')),
+                dispatch_fn=self.replica_pool.submit if self.replica_pool else None
+            )
+        
+        # 세션별 얼굴 추적기 (session_id가 주어진 요청에서만 사용)
+        self.face_tracker = FaceTrackerRegistry(
+            redetect_interval=int(os.getenv('FACE_REDETECT_INTERVAL', '10')),
+            min_confidence=float(os.getenv('FACE_TRACK_MIN_CONFIDENCE', '0.6'))
+        )
+        
+        # 동일/유사 프레임 재전송 대비 결과 캐시 (히트 시 디코딩·검출·추론 생략)
+        self.result_cache = None
+        if os.getenv('FACE_CACHE', 'true').lower() == 'true':
+            self.result_cache = FaceResultCache(
+                max_entries=int(os.getenv('FACE_CACHE_SIZE', '256')),
+                ttl_seconds=float(os.getenv('FACE_CACHE_TTL', '30')),
+                mode=os.getenv('FACE_CACHE_MODE', 'exact')
+            )
+        
+        self.expression_labels = list(EXPRESSION_LABELS)
         
         # 감정을 VAD Score로 매핑 (Valence, Arousal, Dominance)
-        self.emotion_to_vad = {
-            'Angry': {'valence': 0.2, 'arousal': 0.9, 'dominance': 0.8},
-            'Disgust': {'valence': 0.1, 'arousal': 0.7, 'dominance': 0.6},
-            'Fear': {'valence': 0.1, 'arousal': 0.9, 'dominance': 0.2},
-            'Happy': {'valence': 0.9, 'arousal': 0.7, 'dominance': 0.8},
-            'Sad': {'valence': 0.2, 'arousal': 0.3, 'dominance': 0.2},
-            'Surprise': {'valence': 0.6, 'arousal': 0.8, 'dominance': 0.5},
-            'Neutral': {'valence': 0.5, 'arousal': 0.3, 'dominance': 0.5}
-        }
+        self.emotion_to_vad = EMOTION_TO_VAD
     
-    def preprocess_face(self, image: np.ndarray) -> Optional[np.ndarray]:
-        """얼굴 이미지 전처리"""
+    def preprocess_faces(self,
+                         image: np.ndarray,
+                         max_faces: Optional[int] = None,
+                         session_id: Optional[str] = None) -> Tuple[Optional[np.ndarray], List[Tuple[int, int, int, int]]]:
+        """
+        검출된 얼굴들을 (N, 64, 64, 1) 배치로 전처리
+        
+        검출은 긴 변이 detect_max_side 이하인 피라미드 레벨에서 수행하고
+        크롭은 입력 해상도에서 수행한다. session_id가 있으면 세션 추적기로
+        이전 프레임의 박스를 이어가고 주기적으로만 dlib 재검출을 수행한다.
+        """
         try:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            faces = self.face_detector(gray)
-            
-            if not faces:
-                return None
-                
-            face = faces[0]
-            x, y, w, h = face.left(), face.top(), face.width(), face.height()
-            roi = gray[y:y+h, x:x+w]
-            roi = cv2.resize(roi, (64, 64))
-            roi = roi.astype("float32") / 255.0
-            roi = np.expand_dims(roi, axis=-1)
-            roi = np.expand_dims(roi, axis=0)
-            return roi
+            return preprocess_faces(
+                self.face_detector, image, max_faces=max_faces, detect_max_side=self.detect_max_side,
+                tracker=self.face_tracker, session_id=session_id
+            )
         except Exception as e:
             print(f"Face preprocessing error: {e}")
-            return None
+            return None, []
+    
+    def preprocess_face(self, image: np.ndarray) -> Optional[np.ndarray]:
+        """얼굴 이미지 전처리 (첫 번째 얼굴만)"""
+        faces, _ = self.preprocess_faces(image, max_faces=1)
+        return faces
+    
+    def _predict_batch(self, faces: np.ndarray) -> np.ndarray:
+        """ROI 배치에 대한 모델 forward pass"""
+        return self.emotion_backend.predict(faces)
+    
+    def predict_faces(self, faces: np.ndarray) -> Tuple[np.ndarray, Dict]:
+        """ROI 배치 예측 (배칭 실행기 경유, 배치 정보 포함)"""
+        if self.batch_executor is None:
+            return self._predict_batch(faces), {'batch_size': len(faces), 'queue_wait_ms': 0.0}
+        return self.batch_executor.predict(faces)
+    
+    def get_inference_stats(self) -> Dict:
+        """추론 실행기 통계 반환"""
+        return {
+            'backend': self.emotion_backend.get_info(),
+            'batching': self.batch_executor.get_stats() if self.batch_executor else None,
+            'replicas': self.replica_pool.get_stats() if self.replica_pool else None,
+            'tracking': self.face_tracker.get_stats(),
+            'cache': self.result_cache.get_stats() if self.result_cache else None
+        }
     
-    def analyze_emotion(self, face_image_base64: str) -> Dict:
-        """얼굴 감정 분석 수행"""
+    def analyze_emotion(self,
+                        face_image: MediaData,
+                        multi_face: bool = False,
+                        session_id: Optional[str] = None) -> Dict:
+        """
+        얼굴 감정 분석 수행
+        
+        face_image는 base64 문자열 또는 바이너리 전송으로 받은 원본 바이트.
+        multi_face=True이면 검출된 모든 얼굴을 한 번의 배치 추론으로 분석하고
+        얼굴별 결과를 'faces'에 담는다 (최상위 필드는 가장 큰 얼굴 기준).
+        session_id가 주어지면 프레임 간 얼굴 추적으로 전체 프레임 검출을 건너뛴다.
+        """
         try:
-            # Base64 디코딩
-            img_bytes = base64.b64decode(face_image_base64)
-            img_array = np.frombuffer(img_bytes, np.uint8)
-            img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+            img_bytes = media_bytes(face_image)
+            
+            # 결과 캐시 조회
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = self.result_cache.make_key(img_bytes, variant='multi' if multi_face else 'single')
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    cached['cached'] = True
+                    return cached
+            
+            # 이미지 디코딩 (BGR 프레임 없이 바로 흑백으로)
+            img, decode_scale = decode_image_gray(img_bytes, max_side=self.decode_max_side)
             
             if img is None:
                 return {
@@ -60,35 +175,38 @@ class FaceEmotionService:
                 }
             
             # 얼굴 전처리
-            face = self.preprocess_face(img)
-            if face is None:
+            faces, boxes = self.preprocess_faces(
+                img, max_faces=None if multi_face else 1, session_id=session_id
+            )
+            if faces is None:
                 return {
                     'success': False,
                     'error': 'No face detected'
                 }
             
-            # 감정 예측
-            preds = self.emotion_model.predict(face)[0]
-            emotion_idx = int(np.argmax(preds))
-            emotion_label = self.expression_labels[emotion_idx]
-            confidence = float(preds[emotion_idx])
+            # 감정 예측 (모든 얼굴을 한 번의 forward pass로)
+            batch_preds, inference_info = self.predict_faces(faces)
             
-            # 확률 분포
-            probabilities = {
-                self.expression_labels[i]: float(preds[i]) 
-                for i in range(len(preds))
-            }
+            face_results = build_face_results(batch_preds, boxes, decode_scale)
             
-            # VAD Score 계산
-            vad_score = self.emotion_to_vad[emotion_label].copy()
+            primary_idx = max(range(len(boxes)), key=lambda i: boxes[i][2] * boxes[i][3])
+            primary = face_results[primary_idx]
             
-            return {
+            result = {
                 'success': True,
-                'emotion': emotion_label,
-                'confidence': confidence,
-                'probabilities': probabilities,
-                'vad_score': vad_score
+                'emotion': primary['emotion'],
+                'confidence': primary['confidence'],
+                'probabilities': primary['probabilities'],
+                'vad_score': primary['vad_score'],
+                'inference': inference_info
             }
+            if multi_face:
+                result['face_count'] = len(face_results)
+                result['faces'] = face_results
+            
+            if cache_key is not None:
+                self.result_cache.put(cache_key, result)
+            return result
             
         except Exception as e:
             return {
@@ -0,0 +1,64 @@
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.micro_batch import MicroBatchExecutor
+
+
+class FaceBatchExecutor(MicroBatchExecutor):
+    error_label = 'Face batch inference'
+    thread_name = 'face-batch-executor'
+
+    def __init__(self,
+                 predict_fn: Callable[[np.ndarray], np.ndarray],
+                 max_batch_size: int = 16,
+                 max_wait_ms: float = 5.0,
+                 stats_window: int = 1000,
+                 dispatch_fn: Optional[Callable[[np.ndarray], Future]] = None):
+        """
+        얼굴 ROI 마이크로 배칭 추론 실행기
+
+        여러 요청 스레드에서 들어온 (N, 64, 64, 1) ROI를 최대 max_wait_ms 동안 모아
+        한 번의 배치 forward pass로 처리한 뒤 각 호출자에게 결과를 돌려준다.
+        dispatch_fn(복제본 풀의 submit 등)이 주어지면 배치를 비동기로 넘기고 바로
+        다음 배치를 모으므로 여러 배치가 서로 다른 복제본에서 동시에 실행된다.
+        """
+        self.predict_fn = predict_fn
+        self.roi_dispatch_fn = dispatch_fn
+        super().__init__(self._predict_batch, max_batch_size, max_wait_ms, stats_window,
+                         dispatch_fn=self._dispatch_batch if dispatch_fn is not None else None)
+
+    def submit(self, rois: np.ndarray) -> Future:
+        """ROI 배치를 대기열에 넣고 Future 반환 (결과: (예측값, 배치 정보))"""
+        if rois.ndim == 3:
+            rois = np.expand_dims(rois, axis=0)
+        return self.submit_payload(rois, size=len(rois))
+
+    def predict(self, rois: np.ndarray, timeout: Optional[float] = None) -> Tuple[np.ndarray, Dict]:
+        """ROI 예측 (배치 처리가 끝날 때까지 대기)"""
+        return self.submit(rois).result(timeout=timeout)
+
+    @staticmethod
+    def _split(preds: np.ndarray, roi_batches: List[np.ndarray]) -> List[np.ndarray]:
+        """배치 예측값을 요청별 ROI 수대로 나눔"""
+        return np.split(np.asarray(preds), np.cumsum([len(rois) for rois in roi_batches])[:-1])
+
+    def _predict_batch(self, roi_batches: List[np.ndarray]) -> List[np.ndarray]:
+        return self._split(self.predict_fn(np.concatenate(roi_batches, axis=0)), roi_batches)
+
+    def _dispatch_batch(self, roi_batches: List[np.ndarray]) -> Future:
+        split_future = Future()
+
+        def on_done(future: Future):
+            error = future.exception()
+            if error is not None:
+                split_future.set_exception(error)
+            else:
+                split_future.set_result(self._split(future.result(), roi_batches))
+
+        self.roi_dispatch_fn(np.concatenate(roi_batches, axis=0)).add_done_callback(on_done)
+        return split_future
+
+    def _set_result(self, request, result: np.ndarray, info: Dict):
+        request.future.set_result((result, info))
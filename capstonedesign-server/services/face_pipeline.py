@@ -0,0 +1,212 @@
+import numpy as np
+import cv2
+from typing import Dict, List, Optional, Tuple
+
+# 얼굴 감정 라벨 (모델 출력 순서)
+EXPRESSION_LABELS = ['Angry', 'Disgust', 'Fear', 'Happy', 'Sad', 'Surprise', 'Neutral']
+
+# 감정을 VAD Score로 매핑 (Valence, Arousal, Dominance)
+EMOTION_TO_VAD = {
+    'Angry': {'valence': 0.2, 'arousal': 0.9, 'dominance': 0.8},
+    'Disgust': {'valence': 0.1, 'arousal': 0.7, 'dominance': 0.6},
+    'Fear': {'valence': 0.1, 'arousal': 0.9, 'dominance': 0.2},
+    'Happy': {'valence': 0.9, 'arousal': 0.7, 'dominance': 0.8},
+    'Sad': {'valence': 0.2, 'arousal': 0.3, 'dominance': 0.2},
+    'Surprise': {'valence': 0.6, 'arousal': 0.8, 'dominance': 0.5},
+    'Neutral': {'valence': 0.5, 'arousal': 0.3, 'dominance': 0.5}
+}
+
+ROI_SIZE = 64
+
+Box = Tuple[int, int, int, int]
+
+# JPEG SOF (Start Of Frame) 마커 - DHT(C4), JPG(C8), DAC(CC) 제외
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# 축소 디코딩 배율별 OpenCV 플래그 (큰 배율 우선)
+_REDUCED_GRAYSCALE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+    (4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+    (2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+)
+
+
+def _jpeg_size(data) -> Optional[Tuple[int, int]]:
+    """JPEG 헤더에서 (width, height)만 읽기 (전체 디코딩 없이)"""
+    if bytes(data[:2]) != b'\xff\xd8':
+        return None
+    i, n = 2, len(data)
+    while i + 9 < n:
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            i += 2
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height = int.from_bytes(data[i + 5:i + 7], 'big')
+            width = int.from_bytes(data[i + 7:i + 9], 'big')
+            return width, height
+        i += 2 + int.from_bytes(data[i + 2:i + 4], 'big')
+    return None
+
+
+def decode_image_gray(img_bytes, max_side: Optional[int] = None) -> Tuple[Optional[np.ndarray], int]:
+    """
+    이미지 바이트를 BGR 프레임을 거치지 않고 바로 흑백으로 디코딩해 (이미지, 축소 배율) 반환
+
+    max_side가 주어지고 JPEG 헤더의 긴 변이 그보다 2배 이상 크면
+    IMREAD_REDUCED_GRAYSCALE_{2,4,8} 모드로 DCT 단계에서 축소 디코딩한다
+    (축소 후에도 긴 변은 max_side 이상 유지). 축소 이미지에서 구한 박스는
+    box_to_dict(box, scale)로 원본 이미지 좌표로 되돌린다.
+    """
+    flag, scale = cv2.IMREAD_GRAYSCALE, 1
+    if max_side:
+        size = _jpeg_size(img_bytes)
+        if size:
+            long_side = max(size)
+            for factor, reduced_flag in _REDUCED_GRAYSCALE_FLAGS:
+                if long_side // factor >= max_side:
+                    flag, scale = reduced_flag, factor
+                    break
+    return cv2.imdecode(np.frombuffer(img_bytes, np.uint8), flag), scale
+
+
+def to_gray(image: np.ndarray) -> np.ndarray:
+    """BGR 또는 흑백 이미지를 흑백으로"""
+    if image.ndim == 2:
+        return image
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def pyramid_level(shape: Tuple[int, ...], max_side: Optional[int]) -> int:
+    """긴 변이 max_side 이하가 될 때까지 필요한 pyrDown 횟수"""
+    if not max_side:
+        return 0
+    long_side = max(shape[:2])
+    level = 0
+    while long_side > max_side:
+        long_side = (long_side + 1) // 2
+        level += 1
+    return level
+
+
+def detect_face_boxes(face_detector, gray: np.ndarray, max_side: Optional[int] = None) -> List[Box]:
+    """
+    dlib 검출 결과를 이미지 경계 안으로 자른 (x, y, w, h) 목록으로 변환
+
+    max_side가 주어지면 입력 크기에 따라 고른 피라미드 레벨(축소 이미지)에서 검출하고
+    박스를 원본 좌표로 되돌린다. 크롭은 원본 해상도에서 수행된다.
+    """
+    height, width = gray.shape[:2]
+    level = pyramid_level(gray.shape, max_side)
+    small = gray
+    for _ in range(level):
+        small = cv2.pyrDown(small)
+    scale = float(2 ** level)
+
+    boxes = []
+    for face in face_detector(small):
+        x1 = max(int(face.left() * scale), 0)
+        y1 = max(int(face.top() * scale), 0)
+        x2 = min(int(face.right() * scale), width)
+        y2 = min(int(face.bottom() * scale), height)
+        if x2 > x1 and y2 > y1:
+            boxes.append((x1, y1, x2 - x1, y2 - y1))
+    return boxes
+
+
+def crop_faces(gray: np.ndarray, boxes: List[Box]) -> np.ndarray:
+    """얼굴 영역들을 잘라 (N, 64, 64, 1) float32 배치 텐서로 변환"""
+    rois = np.empty((len(boxes), ROI_SIZE, ROI_SIZE, 1), dtype=np.float32)
+    for i, (x, y, w, h) in enumerate(boxes):
+        roi = cv2.resize(gray[y:y+h, x:x+w], (ROI_SIZE, ROI_SIZE))
+        rois[i, :, :, 0] = roi
+    rois /= 255.0
+    return rois
+
+
+def build_emotion_result(preds: np.ndarray) -> Dict:
+    """단일 얼굴의 확률 벡터를 감정 라벨 / 신뢰도 / 확률 분포 / VAD로 변환"""
+    emotion_idx = int(np.argmax(preds))
+    emotion_label = EXPRESSION_LABELS[emotion_idx]
+    return {
+        'emotion': emotion_label,
+        'confidence': float(preds[emotion_idx]),
+        'probabilities': {
+            EXPRESSION_LABELS[i]: float(preds[i]) for i in range(len(preds))
+        },
+        'vad_score': EMOTION_TO_VAD[emotion_label].copy()
+    }
+
+
+def box_to_dict(box: Box, scale: float = 1) -> Dict:
+    """(x, y, w, h) 박스를 응답 dict로 (scale: 축소 디코딩 배율, 원본 이미지 좌표로 환산)"""
+    x, y, w, h = box
+    return {'x': int(x * scale), 'y': int(y * scale), 'width': int(w * scale), 'height': int(h * scale)}
+
+
+def preprocess_faces(face_detector,
+                     image: np.ndarray,
+                     max_faces: Optional[int] = None,
+                     detect_max_side: Optional[int] = None,
+                     tracker=None,
+                     session_id: Optional[str] = None) -> Tuple[Optional[np.ndarray], List[Box]]:
+    """
+    검출된 얼굴들을 (N, 64, 64, 1) 배치와 박스 목록으로 전처리 (얼굴이 없으면 (None, []))
+
+    검출은 긴 변이 detect_max_side 이하인 피라미드 레벨에서, 크롭은 입력 해상도에서 수행한다.
+    tracker(FaceTrackerRegistry)와 session_id가 주어지면 이전 프레임의 박스를 이어가고
+    주기적으로만 dlib 재검출을 수행한다.
+    """
+    gray = to_gray(image)
+    detect = lambda g: detect_face_boxes(face_detector, g, max_side=detect_max_side)[:max_faces]
+    if tracker is not None and session_id:
+        boxes, _ = tracker.locate(session_id, gray, detect)
+    else:
+        boxes = detect(gray)
+    if not boxes:
+        return None, []
+    return crop_faces(gray, boxes), boxes
+
+
+def build_face_results(batch_preds: np.ndarray, boxes: List[Box], scale: float = 1) -> List[Dict]:
+    """얼굴별 확률 벡터와 박스를 얼굴별 결과 목록으로 (박스는 원본 이미지 좌표)"""
+    face_results = []
+    for box, preds in zip(boxes, batch_preds):
+        face_result = build_emotion_result(preds)
+        face_result['box'] = box_to_dict(box, scale)
+        face_results.append(face_result)
+    return face_results
+
+
+def build_face_response(batch_preds: np.ndarray,
+                        boxes: List[Box],
+                        inference_info: Dict,
+                        multi_face: bool = False,
+                        scale: float = 1) -> Dict:
+    """
+    /predict 응답 dict 생성
+
+    multi_face이면 {'face_count', 'faces', 'inference'},
+    아니면 첫 얼굴의 {'emotion', 'confidence', 'probabilities', 'inference'}.
+    """
+    if multi_face:
+        face_results = build_face_results(batch_preds, boxes, scale)
+        return {
+            'face_count': len(face_results),
+            'faces': face_results,
+            'inference': inference_info
+        }
+
+    result = build_emotion_result(batch_preds[0])
+    return {
+        'emotion': result['emotion'],
+        'confidence': result['confidence'],
+        'probabilities': result['probabilities'],
+        'inference': inference_info
+    }
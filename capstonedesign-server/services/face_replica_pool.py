@@ -0,0 +1,136 @@
+import os
+import threading
+import queue
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+class _Replica:
+    """전용 워커 스레드에 고정된 모델 복제본 하나"""
+
+    def __init__(self, index: int, backend):
+        self.index = index
+        self.backend = backend
+        self.queue: "queue.Queue" = queue.Queue()
+        self.lock = threading.Lock()
+        self.pending_items = 0
+        self.completed_batches = 0
+        self.completed_items = 0
+        self.busy_seconds = 0.0
+        self.thread = threading.Thread(target=self._run, name=f'face-replica-{index}', daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            faces, future = item
+            started_at = time.monotonic()
+            try:
+                preds = np.asarray(self.backend.predict(faces))
+            except Exception as e:
+                print(f"Face replica {self.index} inference error: {e}")
+                preds, error = None, e
+            else:
+                error = None
+            elapsed = time.monotonic() - started_at
+
+            with self.lock:
+                self.pending_items -= len(faces)
+                self.completed_batches += 1
+                self.completed_items += len(faces)
+                self.busy_seconds += elapsed
+
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(preds)
+
+
+class FaceReplicaPool:
+    def __init__(self,
+                 backend_factory: Callable[[int], object],
+                 num_replicas: int = 2,
+                 threads_per_replica: Optional[int] = None):
+        """
+        얼굴 감정 모델 복제본 풀
+
+        backend_factory(i)로 만든 복제본을 각각 전용 워커 스레드에 고정하고,
+        요청은 대기 중인 ROI 수가 가장 적은 복제본으로 보낸다.
+        백엔드와 같은 predict() / get_info() 인터페이스를 제공한다.
+        """
+        self.num_replicas = max(1, int(num_replicas))
+        self.threads_per_replica = threads_per_replica
+        self._dispatch_lock = threading.Lock()
+        self._replicas: List[_Replica] = [
+            _Replica(i, backend_factory(i)) for i in range(self.num_replicas)
+        ]
+        self._started_at = time.monotonic()
+        self.model = self._replicas[0].backend.model
+        self.name = self._replicas[0].backend.name
+
+    def _least_loaded(self) -> _Replica:
+        # 대기 ROI 수가 같으면 누적 사용 시간이 적은 복제본
+        return min(self._replicas, key=lambda r: (r.pending_items, r.busy_seconds))
+
+    def submit(self, faces: np.ndarray) -> Future:
+        """ROI 배치를 가장 한가한 복제본에 보내고 Future 반환 (결과: 예측값)"""
+        future = Future()
+        with self._dispatch_lock:
+            replica = self._least_loaded()
+            with replica.lock:
+                replica.pending_items += len(faces)
+        replica.queue.put((faces, future))
+        return future
+
+    def predict(self, faces: np.ndarray) -> np.ndarray:
+        return self.submit(faces).result()
+
+    def shutdown(self):
+        """복제본 워커 스레드 종료"""
+        for replica in self._replicas:
+            replica.queue.put(None)
+        for replica in self._replicas:
+            replica.thread.join(timeout=1.0)
+
+    def get_info(self) -> Dict:
+        info = dict(self._replicas[0].backend.get_info())
+        info['replicas'] = self.num_replicas
+        info['threads_per_replica'] = self.threads_per_replica
+        return info
+
+    def get_stats(self) -> Dict:
+        """복제본별 대기 ROI 수, 처리량, 사용률 (가동 시간 대비 추론 시간 비율)"""
+        uptime = max(time.monotonic() - self._started_at, 1e-9)
+        replicas = []
+        for replica in self._replicas:
+            with replica.lock:
+                replicas.append({
+                    'index': replica.index,
+                    'pending_items': replica.pending_items,
+                    'completed_batches': replica.completed_batches,
+                    'completed_items': replica.completed_items,
+                    'utilisation': min(replica.busy_seconds / uptime, 1.0)
+                })
+
+        utilisation = [r['utilisation'] for r in replicas]
+        return {
+            'replicas': self.num_replicas,
+            'threads_per_replica': self.threads_per_replica,
+            'pending_items': sum(r['pending_items'] for r in replicas),
+            'completed_items': sum(r['completed_items'] for r in replicas),
+            'utilisation': {
+                'mean': float(np.mean(utilisation)),
+                'max': float(np.max(utilisation))
+            },
+            'per_replica': replicas
+        }
+
+
+def default_threads_per_replica(num_replicas: int) -> int:
+    """복제본들이 CPU를 과점유하지 않도록 코어를 나눠 갖는 intra-op 스레드 수"""
+    return max(1, (os.cpu_count() or 1) // max(1, num_replicas))
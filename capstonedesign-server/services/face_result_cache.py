@@ -0,0 +1,126 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import cv2
+
+CACHE_MODES = ('exact', 'perceptual')
+
+# (원본 바이트 해시, (지각 해시, 옵션) 또는 None)
+CacheKey = Tuple[str, Optional[Tuple[int, str]]]
+
+
+def perceptual_hash(img_bytes) -> Optional[int]:
+    """64비트 dHash (1/8 축소 흑백 디코딩 후 9x8 밝기 기울기)"""
+    small = cv2.imdecode(np.frombuffer(img_bytes, np.uint8), cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    if small is None:
+        return None
+    small = cv2.resize(small, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+class FaceResultCache:
+    def __init__(self,
+                 max_entries: int = 256,
+                 ttl_seconds: float = 30.0,
+                 mode: str = 'exact',
+                 max_hash_distance: int = 2):
+        """
+        얼굴 분석 결과 LRU 캐시
+
+        'exact' 모드는 원본 이미지 바이트의 해시로만 조회하므로 히트 시 디코딩·검출·추론을 모두 건너뛴다.
+        'perceptual' 모드는 추가로 dHash 해밍 거리가 max_hash_distance 이하인 프레임을
+        같은 항목으로 본다 (해시 계산에 1/8 축소 디코딩 한 번이 필요).
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {mode} (choose from {CACHE_MODES})")
+
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl_seconds)
+        self.mode = mode
+        self.max_hash_distance = int(max_hash_distance)
+
+        # exact key -> (저장 시각, 지각 해시, 결과)
+        self._entries: "OrderedDict[str, Tuple[float, Optional[Tuple[int, str]], Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            'hits': 0, 'exact_hits': 0, 'perceptual_hits': 0,
+            'misses': 0, 'evictions': 0, 'expirations': 0
+        }
+
+    def make_key(self, img_bytes, variant: str = '') -> CacheKey:
+        """원본 바이트(+분석 옵션) 해시와 지각 해시로 캐시 키 생성"""
+        digest = hashlib.blake2b(img_bytes, digest_size=16)
+        digest.update(variant.encode('utf-8'))
+        phash = None
+        if self.mode == 'perceptual':
+            phash = perceptual_hash(img_bytes)
+            if phash is not None:
+                # 옵션이 다른 결과끼리 섞이지 않도록 variant를 지각 해시에도 반영
+                phash = (phash, variant)
+        return digest.hexdigest(), phash
+
+    def _find_perceptual(self, phash, now: float) -> Optional[str]:
+        value, variant = phash
+        for key, (stored_at, stored_phash, _) in reversed(self._entries.items()):
+            if stored_phash is None or stored_phash[1] != variant or now - stored_at > self.ttl:
+                continue
+            if bin(stored_phash[0] ^ value).count('1') <= self.max_hash_distance:
+                return key
+        return None
+
+    def get(self, key: CacheKey) -> Optional[Dict]:
+        exact_key, phash = key
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(exact_key)
+            hit_type = 'exact_hits'
+            if entry is not None and now - entry[0] > self.ttl:
+                del self._entries[exact_key]
+                self._counters['expirations'] += 1
+                entry = None
+
+            if entry is None and phash is not None:
+                match = self._find_perceptual(phash, now)
+                if match is not None:
+                    exact_key, entry, hit_type = match, self._entries[match], 'perceptual_hits'
+
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+
+            self._entries.move_to_end(exact_key)
+            self._counters['hits'] += 1
+            self._counters[hit_type] += 1
+            result = entry[2]
+
+        return copy.deepcopy(result)
+
+    def put(self, key: CacheKey, result: Dict):
+        exact_key, phash = key
+        with self._lock:
+            self._entries[exact_key] = (time.monotonic(), phash, copy.deepcopy(result))
+            self._entries.move_to_end(exact_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['max_entries'] = self.max_entries
+        stats['ttl_seconds'] = self.ttl
+        stats['mode'] = self.mode
+        return stats
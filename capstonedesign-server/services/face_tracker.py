@@ -0,0 +1,170 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import cv2
+
+Box = Tuple[int, int, int, int]
+
+# 템플릿 매칭은 축소된 해상도에서 수행 (얼굴 폭 기준 픽셀 수)
+TRACK_TEMPLATE_SIZE = 48
+
+
+def _clip_box(box: Box, width: int, height: int) -> Optional[Box]:
+    x, y, w, h = box
+    x1, y1 = max(x, 0), max(y, 0)
+    x2, y2 = min(x + w, width), min(y + h, height)
+    if x2 <= x1 or y2 <= y1:
+        return None
+    return (x1, y1, x2 - x1, y2 - y1)
+
+
+def _pad_box(box: Box, padding: float, width: int, height: int) -> Box:
+    x, y, w, h = box
+    pad_x, pad_y = int(w * padding), int(h * padding)
+    return _clip_box((x - pad_x, y - pad_y, w + 2 * pad_x, h + 2 * pad_y), width, height) or (0, 0, width, height)
+
+
+class _FaceTrack:
+    """세션별 추적 상태 (마지막 얼굴 박스와 검출 시점 템플릿)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.boxes: List[Box] = []
+        self.templates: List[np.ndarray] = []
+        self.frames_since_detection = 0
+        self.last_seen = time.monotonic()
+
+
+class FaceTrackerRegistry:
+    def __init__(self,
+                 redetect_interval: int = 10,
+                 min_confidence: float = 0.6,
+                 search_padding: float = 0.5,
+                 session_ttl: float = 300.0):
+        """
+        세션(Socket.IO sid 또는 클라이언트 세션 ID)별 얼굴 추적기
+
+        마지막 얼굴 박스 주변에서 정규화 상관 템플릿 매칭으로 박스를 이어가고,
+        redetect_interval 프레임마다 또는 추적 신뢰도가 min_confidence 아래로
+        떨어지면 마지막 박스를 search_padding만큼 넓힌 ROI 안에서만 dlib 재검출을 수행한다.
+        ROI에서 찾지 못한 경우에만 전체 프레임을 검출한다.
+        """
+        self.redetect_interval = max(1, int(redetect_interval))
+        self.min_confidence = float(min_confidence)
+        self.search_padding = float(search_padding)
+        self.session_ttl = float(session_ttl)
+
+        self._tracks: Dict[str, _FaceTrack] = {}
+        self._lock = threading.Lock()
+        self._last_purge = time.monotonic()
+        self._counters = {'full_detections': 0, 'roi_detections': 0, 'tracked_frames': 0}
+
+    def _get_track(self, session_id: str) -> _FaceTrack:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_purge > 30.0:
+                expired = [sid for sid, t in self._tracks.items() if now - t.last_seen > self.session_ttl]
+                for sid in expired:
+                    del self._tracks[sid]
+                self._last_purge = now
+
+            track = self._tracks.get(session_id)
+            if track is None:
+                track = self._tracks[session_id] = _FaceTrack()
+            track.last_seen = now
+            return track
+
+    def _count(self, key: str):
+        with self._lock:
+            self._counters[key] += 1
+
+    def reset(self, session_id: str):
+        """세션 추적 상태 삭제 (연결 해제 시)"""
+        with self._lock:
+            self._tracks.pop(session_id, None)
+
+    @staticmethod
+    def _make_template(gray: np.ndarray, box: Box) -> np.ndarray:
+        x, y, w, h = box
+        scale = TRACK_TEMPLATE_SIZE / float(max(w, 1))
+        size = (TRACK_TEMPLATE_SIZE, max(1, int(round(h * scale))))
+        return cv2.resize(gray[y:y+h, x:x+w], size, interpolation=cv2.INTER_AREA)
+
+    def _store(self, track: _FaceTrack, gray: np.ndarray, boxes: List[Box]):
+        track.boxes = boxes
+        track.templates = [self._make_template(gray, box) for box in boxes]
+        track.frames_since_detection = 0
+
+    def _track_boxes(self, track: _FaceTrack, gray: np.ndarray) -> Tuple[List[Box], float]:
+        """이전 박스 주변 탐색 창에서 템플릿 매칭 (반환: 새 박스, 최소 신뢰도)"""
+        height, width = gray.shape[:2]
+        boxes = []
+        min_score = 1.0
+        for box, template in zip(track.boxes, track.templates):
+            _, _, w, h = box
+            sx, sy, sw, sh = _pad_box(box, self.search_padding, width, height)
+            scale = template.shape[1] / float(max(w, 1))
+            window = cv2.resize(gray[sy:sy+sh, sx:sx+sw],
+                                (max(1, int(round(sw * scale))), max(1, int(round(sh * scale)))),
+                                interpolation=cv2.INTER_AREA)
+            if window.shape[0] < template.shape[0] or window.shape[1] < template.shape[1]:
+                return [], 0.0
+
+            scores = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+            _, max_score, _, max_loc = cv2.minMaxLoc(scores)
+            new_box = _clip_box((sx + int(round(max_loc[0] / scale)),
+                                 sy + int(round(max_loc[1] / scale)), w, h), width, height)
+            if new_box is None:
+                return [], 0.0
+            boxes.append(new_box)
+            min_score = min(min_score, float(max_score))
+        return boxes, min_score
+
+    def _redetect(self, track: _FaceTrack, gray: np.ndarray,
+                  detect_fn: Callable[[np.ndarray], List[Box]]) -> Tuple[List[Box], str]:
+        """마지막 박스 주변 ROI에서 재검출, 실패 시 전체 프레임 검출"""
+        height, width = gray.shape[:2]
+        if track.boxes:
+            padded = [_pad_box(box, self.search_padding, width, height) for box in track.boxes]
+            rx1 = min(b[0] for b in padded)
+            ry1 = min(b[1] for b in padded)
+            rx2 = max(b[0] + b[2] for b in padded)
+            ry2 = max(b[1] + b[3] for b in padded)
+            roi_boxes = detect_fn(np.ascontiguousarray(gray[ry1:ry2, rx1:rx2]))
+            if roi_boxes:
+                self._count('roi_detections')
+                return [(x + rx1, y + ry1, w, h) for x, y, w, h in roi_boxes], 'roi_detect'
+
+        self._count('full_detections')
+        return detect_fn(gray), 'detect'
+
+    def locate(self, session_id: str, gray: np.ndarray,
+               detect_fn: Callable[[np.ndarray], List[Box]]) -> Tuple[List[Box], Dict]:
+        """세션의 현재 프레임에서 얼굴 박스 찾기 (추적 또는 재검출)"""
+        track = self._get_track(session_id)
+        with track.lock:
+            confidence = None
+            if track.boxes and track.frames_since_detection + 1 < self.redetect_interval:
+                boxes, confidence = self._track_boxes(track, gray)
+                if boxes and confidence >= self.min_confidence:
+                    track.boxes = boxes
+                    track.frames_since_detection += 1
+                    self._count('tracked_frames')
+                    return boxes, {'method': 'track', 'confidence': round(confidence, 4)}
+
+            boxes, method = self._redetect(track, gray, detect_fn)
+            self._store(track, gray, boxes)
+            info = {'method': method}
+            if confidence is not None:
+                info['track_confidence'] = round(confidence, 4)
+            return boxes, info
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['sessions'] = len(self._tracks)
+        stats['redetect_interval'] = self.redetect_interval
+        stats['min_confidence'] = self.min_confidence
+        return stats
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+
+class FrameStreamSession:
+    def __init__(self, session_id: str, max_pending: int = 1):
+        """
+        연결별 실시간 프레임 스트림 (최신 프레임 우선 대기열)
+
+        대기열이 가득 찬 상태에서 새 프레임이 들어오면 가장 오래된 프레임을 버리므로,
+        추론이 입력 속도를 따라가지 못해도 지연 시간은 (처리 중 1 + max_pending) 프레임을 넘지 않는다.
+        """
+        self.session_id = session_id
+        self.max_pending = max(1, int(max_pending))
+        self._pending: deque = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.started_at = time.monotonic()
+        self.frames_in = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.frames_failed = 0
+        self._processing_ms = deque(maxlen=100)
+        self._latency_ms = deque(maxlen=100)
+        self._window_start = self.started_at
+        self._window_in = 0
+        self._window_processed = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def put(self, frame: Any) -> bool:
+        """프레임 추가 (오래된 프레임을 버렸으면 True)"""
+        with self._cond:
+            if self._closed:
+                return False
+            self.frames_in += 1
+            self._window_in += 1
+            dropped = False
+            while len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                self.frames_dropped += 1
+                dropped = True
+            self._pending.append((time.monotonic(), frame))
+            self._cond.notify()
+            return dropped
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Tuple[float, Any]]:
+        """가장 오래 대기한 (수신 시각, 프레임) 반환, 시간 초과 또는 종료 시 None"""
+        with self._cond:
+            if not self._pending and not self._closed:
+                self._cond.wait(timeout)
+            if self._closed or not self._pending:
+                return None
+            return self._pending.popleft()
+
+    def record_processed(self, received_at: float, processing_ms: float, success: bool = True):
+        """프레임 처리 완료 기록 (수신부터 결과 전송까지의 지연 포함)"""
+        with self._cond:
+            if success:
+                self.frames_processed += 1
+                self._window_processed += 1
+            else:
+                self.frames_failed += 1
+            self._processing_ms.append(processing_ms)
+            self._latency_ms.append((time.monotonic() - received_at) * 1000.0)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+
+    def snapshot_stats(self, reset_window: bool = True) -> Dict:
+        """입력 / 처리 fps (직전 구간 기준), 누적 드롭 수, 처리 · 종단 지연 시간"""
+        now = time.monotonic()
+        with self._cond:
+            elapsed = max(now - self._window_start, 1e-9)
+            stats = {
+                'session_id': self.session_id,
+                'fps_in': round(self._window_in / elapsed, 2),
+                'fps_processed': round(self._window_processed / elapsed, 2),
+                'frames_in': self.frames_in,
+                'frames_processed': self.frames_processed,
+                'frames_dropped': self.frames_dropped,
+                'frames_failed': self.frames_failed,
+                'pending': len(self._pending),
+                'processing_ms': round(sum(self._processing_ms) / len(self._processing_ms), 3)
+                if self._processing_ms else 0.0,
+                'latency_ms': round(sum(self._latency_ms) / len(self._latency_ms), 3)
+                if self._latency_ms else 0.0,
+                'uptime_seconds': round(now - self.started_at, 3)
+            }
+            if reset_window:
+                self._window_start = now
+                self._window_in = 0
+                self._window_processed = 0
+        return stats
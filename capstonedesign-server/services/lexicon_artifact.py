@@ -0,0 +1,183 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from services.emotion_lexicon import EmotionLexicon, StringTable, TrieIndex
+from services.lexicon_trie import DoubleArrayTrie, lexicon_keys
+
+# 형식이 바뀌면 올림 (버전이 다른 아티팩트는 다시 컴파일)
+ARTIFACT_VERSION = 1
+ARTIFACT_MAGIC = b'EMOLEXB\x00'
+ARTIFACT_SUFFIX = f'.v{ARTIFACT_VERSION}.lexbin'
+
+# 배열 시작 위치 정렬 (바이트)
+ALIGNMENT = 64
+
+# 헤더 길이 필드 (little-endian uint32)
+_HEADER_LENGTH = struct.Struct('<I')
+
+
+def default_artifact_path(tsv_path: str) -> str:
+    """TSV 옆의 버전별 아티팩트 경로 (lexicon/Korean-NRC-EmoLex.txt → lexicon/Korean-NRC-EmoLex.v1.lexbin)"""
+    return os.path.splitext(tsv_path)[0] + ARTIFACT_SUFFIX
+
+
+def tsv_checksum(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_artifact(path: str, header: Dict, arrays: Dict[str, np.ndarray]):
+    """
+    헤더(JSON) + 정렬된 배열 영역으로 이루어진 단일 파일 기록
+
+    [magic 8B][헤더 길이 4B][헤더 JSON][패딩][배열 0][패딩][배열 1]...
+    배열 위치 / dtype / shape는 헤더의 'arrays'에 기록된다. 임시 파일에 쓴 뒤 교체하므로
+    여러 프로세스가 동시에 컴파일해도 읽는 쪽은 항상 완전한 파일을 본다.
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    layout = {}
+    # 헤더 길이가 배열 위치에 영향을 주므로 위치가 고정될 때까지 반복
+    data_start = _aligned(len(ARTIFACT_MAGIC) + _HEADER_LENGTH.size + 1024)
+    while True:
+        offset = data_start
+        for name, array in arrays.items():
+            layout[name] = {'offset': offset, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+            offset = _aligned(offset + array.nbytes)
+        header_bytes = json.dumps(dict(header, arrays=layout), ensure_ascii=False).encode('utf-8')
+        header_end = len(ARTIFACT_MAGIC) + _HEADER_LENGTH.size + len(header_bytes)
+        if header_end <= data_start:
+            break
+        data_start = _aligned(header_end)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(ARTIFACT_MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header_bytes)))
+            f.write(header_bytes)
+            for name, array in arrays.items():
+                f.write(b'\x00' * (layout[name]['offset'] - f.tell()))
+                f.write(array.tobytes())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_artifact(path: str) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """아티팩트를 읽기 전용으로 메모리 매핑해 (헤더, 배열 뷰) 반환 (배열 데이터는 복사하지 않음)"""
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    prefix = len(ARTIFACT_MAGIC) + _HEADER_LENGTH.size
+    if mapped[:len(ARTIFACT_MAGIC)] != ARTIFACT_MAGIC:
+        raise ValueError(f'Not a lexicon artifact: {path}')
+    (header_length,) = _HEADER_LENGTH.unpack(mapped[len(ARTIFACT_MAGIC):prefix])
+    header = json.loads(mapped[prefix:prefix + header_length].decode('utf-8'))
+
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        arrays[name] = np.frombuffer(mapped, dtype=dtype, count=count,
+                                     offset=spec['offset']).reshape(spec['shape'])
+    return header, arrays
+
+
+def compile_lexicon(tsv_path: str, artifact_path: Optional[str] = None) -> Tuple[EmotionLexicon, DoubleArrayTrie]:
+    """
+    NRC EmoLex TSV → 바이너리 아티팩트 컴파일
+
+    문자열 표(UTF-8 바이트 + 오프셋), uint8 감정 행렬, 매칭용 double-array 트라이를 함께 저장한다.
+    artifact_path가 없으면 파일은 쓰지 않고 메모리에 구성한 결과만 반환한다.
+    """
+    lexicon = EmotionLexicon.from_tsv(tsv_path)
+    trie = DoubleArrayTrie.build(*lexicon_keys(lexicon.words))
+    if not artifact_path:
+        return lexicon, trie
+
+    encoded = [word.encode('utf-8') for word in lexicon.words]
+    offsets = np.zeros(len(encoded) + 1, dtype='<i4')
+    offsets[1:] = np.cumsum([len(word) for word in encoded])
+    header = {
+        'version': ARTIFACT_VERSION,
+        'source': os.path.basename(tsv_path),
+        'checksum': tsv_checksum(tsv_path),
+        'created_at': time.time(),
+        'emotions': lexicon.emotions,
+        'words': len(lexicon)
+    }
+    write_artifact(artifact_path, header, {
+        'word_bytes': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+        'word_offsets': offsets,
+        'matrix': lexicon.matrix,
+        'trie_base': trie.base.astype('<i4'),
+        'trie_check': trie.check.astype('<i4'),
+        'trie_values': trie.values.astype('<i4'),
+        'trie_codes': trie.codes.astype('<i4')
+    })
+    return lexicon, trie
+
+
+def load_artifact(artifact_path: str) -> Tuple[Dict, EmotionLexicon, DoubleArrayTrie]:
+    """
+    아티팩트에서 lexicon / 트라이 구성
+
+    문자열 표, 감정 행렬, 트라이 배열, 단어 색인이 모두 매핑된 파일을 그대로 사용하므로 (Python dict / 문자열 복사 없음)
+    같은 아티팩트를 여러 워커 프로세스가 로드해도 데이터는 페이지 캐시에 한 벌만 올라간다.
+    """
+    header, arrays = read_artifact(artifact_path)
+    if header.get('version') != ARTIFACT_VERSION:
+        raise ValueError(f"Lexicon artifact version {header.get('version')} != {ARTIFACT_VERSION}")
+
+    words = StringTable(arrays['word_bytes'], arrays['word_offsets'])
+    trie = DoubleArrayTrie(arrays['trie_base'], arrays['trie_check'], arrays['trie_values'], arrays['trie_codes'])
+    lexicon = EmotionLexicon(words, header['emotions'], arrays['matrix'], index=TrieIndex(trie, words))
+    return header, lexicon, trie
+
+
+def load_compiled_lexicon(tsv_path: str, artifact_path: Optional[str] = None) -> Tuple[EmotionLexicon, DoubleArrayTrie]:
+    """
+    컴파일된 lexicon 로드 (아티팩트가 없거나 버전 / TSV 체크섬이 다르면 다시 컴파일)
+
+    TSV가 없으면 아티팩트만으로 로드하고, 아티팩트를 쓸 수 없으면 메모리에 구성한 결과를 쓴다.
+    """
+    artifact_path = artifact_path or default_artifact_path(tsv_path)
+    checksum = tsv_checksum(tsv_path) if os.path.exists(tsv_path) else None
+
+    if os.path.exists(artifact_path):
+        try:
+            header, lexicon, trie = load_artifact(artifact_path)
+            if checksum is None or header.get('checksum') == checksum:
+                return lexicon, trie
+            print(f"Lexicon artifact is stale, recompiling: {artifact_path}")
+        except Exception as e:
+            print(f"Lexicon artifact load error: {e}")
+
+    if checksum is None:
+        raise FileNotFoundError(tsv_path)
+
+    try:
+        compile_lexicon(tsv_path, artifact_path)
+        _, lexicon, trie = load_artifact(artifact_path)
+        return lexicon, trie
+    except OSError as e:
+        print(f"Lexicon artifact write error: {e}")
+        return compile_lexicon(tsv_path)
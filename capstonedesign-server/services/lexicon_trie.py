@@ -0,0 +1,284 @@
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# 문자 코드 표 크기 (한글 음절 U+AC00-U+D7A3까지 포함하는 BMP 앞부분)
+CODE_TABLE_SIZE = 0xD7A4
+
+# 토큰 중간에서 끝나는 접두 매칭의 최소 글자 수 (1음절 항목은 토큰 전체 또는 조사와 결합할 때만)
+MIN_PARTIAL_MATCH = 2
+
+# 체언 뒤에 붙는 조사 (서술격 조사 활용형 포함)
+PARTICLES = frozenset((
+    '이', '가', '은', '는', '을', '를', '의', '에', '도', '만', '와', '과', '로', '으로',
+    '에서', '에게', '한테', '까지', '부터', '처럼', '보다', '이랑', '랑', '이나', '나',
+    '에는', '에도', '에서는', '으로는', '만큼', '마다', '조차', '밖에', '들', '들이', '들은', '들을', '들의',
+    '이다', '이야', '이고', '이라', '인데', '이었다', '였다', '이에요', '예요', '입니다'
+))
+
+# 용언 어간 뒤에 붙는 어미 ('슬프' + '고', '혐오하' + '였다')
+_ENDING_TAILS = (
+    '다', '고', '게', '지', '는', '면', '며', '던', '기', '지만', '는데', '니까', '면서', '도록',
+    '네', '네요', '구나', '군요', '죠', '지요', '습니다', '었다', '았다', '여', '였다', '였고', '였던',
+    '어', '아', '어서', '아서', '어요', '아요', '어도', '아도'
+)
+ENDINGS = frozenset(_ENDING_TAILS)
+
+# 체언 / 어근 뒤의 '-하다' 활용형 ('행복' + '한', '사랑' + '했다')
+HA_ENDINGS = frozenset((
+    '한', '할', '함', '합니다', '해', '해서', '해요', '해도', '했다', '했어', '했어요', '했고', '했던',
+    '했지만', '했습니다', '하여', '하였다', '하니'
+) + tuple('하' + tail for tail in _ENDING_TAILS if not tail.startswith(('여', '였', '어', '아', '었', '았', '습'))))
+
+# 어절 끝의 문장 부호 (나머지 글자를 볼 때 무시)
+TRAILING_PUNCTUATION = '.,!?~…·:;"\'”’)]」』'
+
+
+class DoubleArrayTrie:
+    def __init__(self, base: np.ndarray, check: np.ndarray, values: np.ndarray, codes: np.ndarray):
+        """
+        Double-array 접두 트라이 (읽기 전용)
+
+        노드 n에서 문자 코드 c로의 전이는 t = base[n] + c이고 check[t] == n일 때만 유효하다.
+        values[n]은 n에서 끝나는 키의 값 (없으면 -1), codes[ord(ch)]는 문자의 조밀한 코드 (없으면 0).
+        배열 네 개가 전부이므로 그대로 파일에 저장하거나 메모리 매핑해 프로세스끼리 공유할 수 있다.
+        """
+        self.base = base
+        self.check = check
+        self.values = values
+        self.codes = codes
+        # 원소 하나씩 읽는 탐색에서는 numpy 스칼라보다 memoryview 인덱싱이 빠름 (복사 없음)
+        self._base = memoryview(np.ascontiguousarray(base, dtype=np.int32)).cast('B').cast('i')
+        self._check = memoryview(np.ascontiguousarray(check, dtype=np.int32)).cast('B').cast('i')
+        self._values = memoryview(np.ascontiguousarray(values, dtype=np.int32)).cast('B').cast('i')
+        self._codes = memoryview(np.ascontiguousarray(codes, dtype=np.int32)).cast('B').cast('i')
+        self._size = len(check)
+        self._code_size = len(codes)
+
+    @classmethod
+    def build(cls, keys: Sequence[str], values: Sequence[int]) -> 'DoubleArrayTrie':
+        """키 / 값 목록으로 트라이 구성 (같은 키가 여러 번 나오면 마지막 값)"""
+        alphabet = sorted({ch for key in keys for ch in key})
+        if any(ord(ch) >= CODE_TABLE_SIZE for ch in alphabet):
+            raise ValueError('Lexicon contains characters outside the code table')
+        codes = np.zeros(CODE_TABLE_SIZE, dtype=np.int32)
+        for code, ch in enumerate(alphabet, start=1):
+            codes[ord(ch)] = code
+
+        # 임시 dict 트라이
+        children: List[Dict[int, int]] = [{}]
+        terminal: List[int] = [-1]
+        for key, value in zip(keys, values):
+            node = 0
+            for ch in key:
+                code = int(codes[ord(ch)])
+                child = children[node].get(code)
+                if child is None:
+                    child = len(children)
+                    children[node][code] = child
+                    children.append({})
+                    terminal.append(-1)
+                node = child
+            terminal[node] = int(value)
+
+        # 너비 우선으로 각 노드의 자식이 모두 빈 칸에 들어가는 base를 찾음
+        # (빈 칸 표시 배열을 자식 코드만큼 밀어 AND 하면 후보 base 창 전체를 한 번에 검사)
+        size = 2 * len(children) + len(alphabet) + 1
+        base = np.zeros(size, dtype=np.int32)
+        check = np.full(size, -1, dtype=np.int32)
+        dat_values = np.full(size, -1, dtype=np.int32)
+        free = np.ones(size, dtype=bool)
+        free[0] = False
+        check[0] = 0
+        position = {0: 0}
+        first_free = 1
+        used = 1
+        queue = [0]
+        for node in queue:
+            slot = position[node]
+            dat_values[slot] = terminal[node]
+            if not children[node]:
+                continue
+            child_codes = sorted(children[node])
+
+            while first_free < size and not free[first_free]:
+                first_free += 1
+            start = max(1, first_free - child_codes[0])
+            window = 256
+            while True:
+                needed = start + window + child_codes[-1] + 1
+                if needed > size:
+                    extra = max(needed - size, size // 2)
+                    base = np.concatenate([base, np.zeros(extra, dtype=np.int32)])
+                    check = np.concatenate([check, np.full(extra, -1, dtype=np.int32)])
+                    dat_values = np.concatenate([dat_values, np.full(extra, -1, dtype=np.int32)])
+                    free = np.concatenate([free, np.ones(extra, dtype=bool)])
+                    size += extra
+                fits = free[start + child_codes[0]:start + child_codes[0] + window].copy()
+                for code in child_codes[1:]:
+                    fits &= free[start + code:start + code + window]
+                candidates = np.flatnonzero(fits)
+                if len(candidates):
+                    b = start + int(candidates[0])
+                    break
+                start += window
+                window *= 2
+
+            base[slot] = b
+            for code in child_codes:
+                check[b + code] = slot
+                free[b + code] = False
+                position[children[node][code]] = b + code
+                queue.append(children[node][code])
+            used = max(used, b + child_codes[-1] + 1)
+
+        return cls(base[:used].copy(), check[:used].copy(), dat_values[:used].copy(), codes)
+
+    def prefixes(self, text: str, start: int = 0) -> Iterable[Tuple[int, int]]:
+        """text[start:]의 모든 접두 키 (짧은 것부터)"""
+        base, check, values, codes = self._base, self._check, self._values, self._codes
+        node = 0
+        for end in range(start, len(text)):
+            point = ord(text[end])
+            code = codes[point] if point < self._code_size else 0
+            if code == 0:
+                return
+            child = base[node] + code
+            if child >= self._size or check[child] != node:
+                return
+            node = child
+            if values[node] >= 0:
+                yield end + 1, values[node]
+
+    def find(self, key: str) -> int:
+        """key 전체를 따라간 노드 번호 (경로가 없으면 -1)"""
+        base, check, codes = self._base, self._check, self._codes
+        node = 0
+        for ch in key:
+            point = ord(ch)
+            code = codes[point] if point < self._code_size else 0
+            if code == 0:
+                return -1
+            child = base[node] + code
+            if child >= self._size or check[child] != node:
+                return -1
+            node = child
+        return node
+
+    def get(self, key: str, default: int = -1) -> int:
+        """key의 값 (없으면 default)"""
+        node = self.find(key)
+        if node < 0 or self._values[node] < 0:
+            return default
+        return self._values[node]
+
+    def __len__(self) -> int:
+        return int((self.values >= 0).sum())
+
+
+def lexicon_keys(words: Sequence[str]) -> Tuple[List[str], List[int]]:
+    """
+    lexicon 단어 → 트라이 키 / 값(단어 번호) 목록
+
+    용언 기본형은 활용형 접두 매칭을 위해 어간도 키로 넣는다
+    ('혐오하다' → '혐오하', '혐오'). 원래 단어와 겹치는 어간은 원래 단어가 우선한다.
+    """
+    keys, values = [], []
+    known = set(words)
+    variants = {}
+    for index, word in enumerate(words):
+        keys.append(word)
+        values.append(index)
+        if len(word) >= 3 and word.endswith('다'):
+            stems = [word[:-1]]
+            if word.endswith('하다') and len(word) >= 4:
+                stems.append(word[:-2])
+            for stem in stems:
+                if stem not in known:
+                    variants.setdefault(stem, index)
+    for stem, index in variants.items():
+        keys.append(stem)
+        values.append(index)
+    return keys, values
+
+
+def accepts_remainder(lookup: Callable[[str], int], key: str, value: int, remainder: str, covered: int) -> bool:
+    """
+    어절 중간에서 끝나는 매칭의 나머지 글자가 조사·어미인지 확인
+
+    lookup: 키 → 단어 번호 (없으면 -1, 예: DoubleArrayTrie.get), covered: 매칭이 마지막 어절에서 덮은 글자 수
+    """
+    remainder = remainder.rstrip(TRAILING_PUNCTUATION)
+    if not remainder or remainder in PARTICLES:
+        return True
+    if covered < MIN_PARTIAL_MATCH:
+        return False
+    if remainder in HA_ENDINGS:
+        return True
+    # 어간 키('슬프', '혐오하')는 기본형('슬프다', '혐오하다')과 같은 단어 번호를 가짐
+    return remainder in ENDINGS and lookup(key + '다') == value
+
+
+def match_tokens(trie: DoubleArrayTrie, text: str) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    어절 단위 최장 접두 매칭 (텍스트를 왼쪽에서 오른쪽으로 한 번 훑음)
+
+    각 어절 시작에서 트라이를 따라가며 가장 긴 항목을 찾는다. 띄어쓰기가 포함된 항목은 다음 어절까지
+    이어서 매칭하고, 매칭에 포함된 어절은 건너뛴다. 어절 중간에서 끝나는 매칭은 어절의 나머지가
+    조사(PARTICLES)이거나, MIN_PARTIAL_MATCH 글자 이상인 항목 뒤의 '-하다' 활용형(HA_ENDINGS)이거나,
+    용언 어간 항목 뒤의 어미(ENDINGS)일 때만 인정한다 ('사랑니'는 '사랑'으로 매칭하지 않음).
+    반환값: (어절 수, [(단어 번호, 매칭된 어절 표면형), ...])
+    """
+    text = ' '.join(text.split())
+    length = len(text)
+    base, check, values, codes = trie._base, trie._check, trie._values, trie._codes
+    size, code_size = trie._size, trie._code_size
+    matches = []
+    tokens = 0
+    position = 0
+    while position < length:
+        tokens += 1
+        token_start = position
+        token_end = text.find(' ', position)
+        if token_end == -1:
+            token_end = length
+
+        # 트라이를 따라가며 인정되는 가장 긴 항목 (prefixes()를 인라인)
+        best_end = -1
+        best_value = -1
+        best_token_end = -1
+        node = 0
+        for end in range(position, length):
+            point = ord(text[end])
+            code = codes[point] if point < code_size else 0
+            if code == 0:
+                break
+            child = base[node] + code
+            if child >= size or check[child] != node:
+                break
+            node = child
+            if point == 32:
+                # 띄어쓰기가 포함된 항목: 다음 어절로 넘어감
+                token_start = end + 1
+                token_end = text.find(' ', token_start)
+                if token_end == -1:
+                    token_end = length
+                continue
+            value = values[node]
+            if value < 0:
+                continue
+            stop = end + 1
+            if stop == token_end or accepts_remainder(trie.get, text[position:stop], value,
+                                                      text[stop:token_end], stop - token_start):
+                best_end = stop
+                best_value = value
+                best_token_end = token_end
+
+        if best_end >= 0:
+            matches.append((best_value, text[position:best_token_end].rstrip(TRAILING_PUNCTUATION)))
+            tokens += text.count(' ', position, best_end)
+            position = best_end
+        # 다음 어절로
+        next_space = text.find(' ', position)
+        position = length if next_space == -1 else next_space + 1
+    return tokens, matches
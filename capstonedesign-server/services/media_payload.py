@@ -0,0 +1,64 @@
+import base64
+from typing import Any, Dict, Optional, Union
+
+MSGPACK_CONTENT_TYPES = ('application/msgpack', 'application/x-msgpack', 'application/vnd.msgpack')
+
+BINARY_TYPES = (bytes, bytearray, memoryview)
+
+MediaData = Union[str, bytes, bytearray, memoryview]
+
+
+class MediaPayloadError(ValueError):
+    """클라이언트가 보낸 요청 본문을 해석할 수 없음 (엔드포인트에서 400으로 응답)"""
+
+
+def media_bytes(data: MediaData) -> Union[bytes, bytearray, memoryview]:
+    """미디어 필드를 바이트로 (바이너리 전송은 그대로, base64 문자열은 디코딩)"""
+    if isinstance(data, BINARY_TYPES):
+        return data
+    return base64.b64decode(data)
+
+
+def is_truthy(value: Any) -> bool:
+    """JSON bool 또는 form/query 문자열 ('true', '1', 'yes')을 bool로"""
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', '1', 'yes', 'on')
+    return bool(value)
+
+
+def parse_media_request(req, raw_field: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    미디어 요청 본문 파싱 (Flask request)
+
+    - multipart/form-data: 파일 파트는 bytes, 나머지 form 필드는 문자열
+    - application/octet-stream: 본문 전체를 raw_field 바이트로, 옵션은 query string
+    - application/msgpack: bin 타입 필드는 bytes 그대로
+    - application/json (기본): 기존 base64 문자열 형식
+    """
+    mimetype = req.mimetype
+
+    if mimetype == 'multipart/form-data':
+        payload = req.form.to_dict()
+        for name, storage in req.files.items():
+            payload[name] = storage.read()
+        return payload
+
+    if mimetype == 'application/octet-stream':
+        if raw_field is None:
+            raise MediaPayloadError('application/octet-stream is not supported on this endpoint')
+        payload = req.args.to_dict()
+        payload[raw_field] = req.get_data(cache=False)
+        return payload
+
+    if mimetype in MSGPACK_CONTENT_TYPES:
+        try:
+            import msgpack
+        except ImportError:
+            raise MediaPayloadError('MessagePack body requires the msgpack package')
+        try:
+            payload = msgpack.unpackb(req.get_data(cache=False), raw=False)
+        except Exception as e:
+            raise MediaPayloadError(f'Malformed MessagePack body ({type(e).__name__}: {e})') from e
+        return payload if isinstance(payload, dict) else None
+
+    return req.get_json(silent=True)
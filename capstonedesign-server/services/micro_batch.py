@@ -0,0 +1,188 @@
+import threading
+import queue
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class _PendingRequest:
+    """배치 대기열에 올라간 단일 요청 (size: 배치 크기에 더해지는 항목 수)"""
+
+    __slots__ = ('payload', 'size', 'future', 'enqueued_at')
+
+    def __init__(self, payload: Any, size: int):
+        self.payload = payload
+        self.size = size
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class MicroBatchExecutor:
+    # 오류 로그 접두어 / 워커 스레드 이름 (하위 클래스에서 지정)
+    error_label = 'Batch inference'
+    thread_name = 'micro-batch-executor'
+
+    def __init__(self,
+                 batch_fn: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 16,
+                 max_wait_ms: float = 5.0,
+                 stats_window: int = 1000,
+                 dispatch_fn: Optional[Callable[[List[Any]], Future]] = None):
+        """
+        공용 마이크로 배칭 실행기
+
+        여러 요청 스레드에서 들어온 요청을 첫 요청 도착 후 최대 max_wait_ms 동안 (항목 수가 max_batch_size가 될 때까지) 모아
+        batch_fn(요청 payload 목록)을 한 번 호출하고, 반환된 요청별 결과를 각 호출자의 Future에 돌려준다.
+        dispatch_fn(payload 목록 → 요청별 결과 목록의 Future)이 주어지면 배치를 비동기로 넘기고
+        바로 다음 배치를 모으므로 여러 배치가 동시에 실행될 수 있다.
+        """
+        self.batch_fn = batch_fn
+        self.dispatch_fn = dispatch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._queue: "queue.Queue[Optional[_PendingRequest]]" = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = deque(maxlen=stats_window)
+        self._queue_waits_ms = deque(maxlen=stats_window)
+        self._batch_ms = deque(maxlen=stats_window)
+        self._total_batches = 0
+        self._total_items = 0
+
+        self._worker = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._worker.start()
+
+    def submit_payload(self, payload: Any, size: int = 1) -> Future:
+        """payload를 대기열에 넣고 Future 반환"""
+        request = _PendingRequest(payload, size)
+        self._queue.put(request)
+        return request.future
+
+    def shutdown(self):
+        """워커 스레드 종료"""
+        self._queue.put(None)
+        self._worker.join(timeout=1.0)
+
+    def _collect(self, first: _PendingRequest) -> Tuple[List[_PendingRequest], bool]:
+        """첫 요청 도착 시점부터 max_wait 동안 배치를 모음"""
+        pending = [first]
+        count = first.size
+        deadline = first.enqueued_at + self.max_wait
+
+        while count < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    # 대기 시간이 지났더라도 이미 쌓여 있는 요청은 함께 처리
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if item is None:
+                return pending, True
+            pending.append(item)
+            count += item.size
+
+        return pending, False
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            pending, stop = self._collect(first)
+            self._run_batch(pending)
+            if stop:
+                return
+
+    def _run_batch(self, pending: List[_PendingRequest]):
+        started_at = time.monotonic()
+        payloads = [p.payload for p in pending]
+        try:
+            if self.dispatch_fn is not None:
+                self.dispatch_fn(payloads).add_done_callback(
+                    lambda f: self._complete_dispatched(pending, started_at, f)
+                )
+                return
+            results = self.batch_fn(payloads)
+        except Exception as e:
+            self._fail(pending, e)
+            return
+
+        self._complete(pending, started_at, results)
+
+    def _complete_dispatched(self, pending: List[_PendingRequest], started_at: float, future: Future):
+        error = future.exception()
+        if error is not None:
+            self._fail(pending, error)
+        else:
+            self._complete(pending, started_at, future.result())
+
+    def _fail(self, pending: List[_PendingRequest], error: BaseException):
+        print(f"{self.error_label} error: {error}")
+        for p in pending:
+            p.future.set_exception(error)
+
+    def _complete(self, pending: List[_PendingRequest], started_at: float, results: List[Any]):
+        batch_size = sum(p.size for p in pending)
+        waits_ms = [(started_at - p.enqueued_at) * 1000.0 for p in pending]
+
+        with self._stats_lock:
+            self._total_batches += 1
+            self._total_items += batch_size
+            self._batch_sizes.append(batch_size)
+            self._queue_waits_ms.extend(waits_ms)
+            self._batch_ms.append((time.monotonic() - started_at) * 1000.0)
+
+        for p, result, wait_ms in zip(pending, results, waits_ms):
+            info = {
+                'batch_size': batch_size,
+                'queue_wait_ms': round(wait_ms, 3)
+            }
+            self._set_result(p, result, info)
+
+    def _set_result(self, request: _PendingRequest, result: Any, info: Dict):
+        """요청별 결과 전달 (배치 정보까지 돌려주려면 하위 클래스에서 재정의)"""
+        request.future.set_result(result)
+
+    def get_stats(self) -> Dict:
+        """배치 크기, 대기열 대기 시간, 배치 실행 시간 통계"""
+        with self._stats_lock:
+            sizes = np.array(self._batch_sizes, dtype=np.float64)
+            waits = np.array(self._queue_waits_ms, dtype=np.float64)
+            batch_ms = np.array(self._batch_ms, dtype=np.float64)
+            total_batches = self._total_batches
+            total_items = self._total_items
+
+        stats = {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+            'pending': self._queue.qsize(),
+            'total_batches': total_batches,
+            'total_items': total_items,
+            'batch_size': {'mean': 0.0, 'max': 0, 'last': 0},
+            'queue_wait_ms': {'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0},
+            'batch_ms': {'mean': 0.0, 'max': 0.0}
+        }
+        if len(sizes):
+            stats['batch_size'] = {
+                'mean': float(sizes.mean()),
+                'max': int(sizes.max()),
+                'last': int(sizes[-1])
+            }
+        if len(waits):
+            stats['queue_wait_ms'] = {
+                'mean': float(waits.mean()),
+                'p50': float(np.percentile(waits, 50)),
+                'p95': float(np.percentile(waits, 95)),
+                'max': float(waits.max())
+            }
+        if len(batch_ms):
+            stats['batch_ms'] = {'mean': float(batch_ms.mean()), 'max': float(batch_ms.max())}
+        return stats
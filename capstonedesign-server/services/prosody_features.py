@@ -0,0 +1,215 @@
+from typing import Dict
+
+import numpy as np
+
+from services.audio_decode import SAMPLE_RATE
+
+# 분석 프레임: 32 ms 창 / 16 ms 간격 (16 kHz 기준, 창 길이 ≥ 최저 F0 주기의 2배)
+FRAME_LENGTH = 512
+HOP_LENGTH = 256
+
+# 음성 F0 탐색 범위 (Hz)
+F0_MIN = 65.0
+F0_MAX = 500.0
+
+# YIN 누적 평균 정규화 차분 함수 임계값
+YIN_THRESHOLD = 0.15
+
+# 음절 핵 검출: 모음 에너지 대역 (Hz), 음절 사이 최소 간격 (초), 앞 골짜기 대비 최소 상승 (dB)
+SYLLABLE_BAND = (300.0, 2500.0)
+MIN_SYLLABLE_GAP = 0.1
+MIN_SYLLABLE_DIP_DB = 3.0
+
+# 무음 판정 RMS
+SILENCE_RMS = 1e-3
+
+# 한 번에 FFT할 프레임 수 (긴 녹음에서도 메모리 사용량을 일정하게 유지)
+BLOCK_FRAMES = 1024
+
+
+def _frame_signal(y: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """중앙 정렬 패딩 후 복사 없이 (프레임 수, frame_length) 뷰 생성"""
+    pad = frame_length // 2
+    y = np.pad(y, (pad, pad))
+    if len(y) < frame_length:
+        y = np.pad(y, (0, frame_length - len(y)))
+    return np.lib.stride_tricks.sliding_window_view(y, frame_length)[::hop_length]
+
+
+def _spectral_block(frames: np.ndarray, sr: int, min_lag: int, max_lag: int):
+    """
+    프레임 블록 하나에 대해 STFT 한 번으로 RMS, YIN F0 래그, 음절 대역 에너지를 계산
+
+    2배 제로 패딩한 FFT의 파워 스펙트럼을 역변환하면 선형 자기상관이 되고,
+    자기상관 0번 래그는 프레임 에너지 (Parseval)이다.
+    """
+    n = frames.shape[1]
+    spectrum = np.fft.rfft(frames, n=2 * n, axis=1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    acf = np.fft.irfft(power, axis=1)[:, :max_lag + 2]
+
+    energy = np.maximum(acf[:, 0], 0.0)
+    rms = np.sqrt(energy / n)
+
+    # 모음 대역 에너지 (음절 핵 검출용)
+    low, high = (int(f * 2 * n / sr) for f in SYLLABLE_BAND)
+    band_energy = power[:, low:high + 1].sum(axis=1)
+
+    # 겹치는 샘플 수 차이를 보정한 자기상관으로 YIN 차분 함수 d(τ) = 2 (r(0) - r(τ))
+    lags = np.arange(acf.shape[1])
+    unbiased = acf * (n / (n - lags))
+    diff = 2.0 * (unbiased[:, :1] - unbiased)
+
+    # 누적 평균 정규화 차분 d'(τ) = d(τ) · τ / Σ d(1..τ)
+    cumulative = np.cumsum(diff[:, 1:], axis=1)
+    cmnd = np.ones_like(diff)
+    cmnd[:, 1:] = diff[:, 1:] * lags[1:] / np.maximum(cumulative, 1e-12)
+
+    # 임계값 아래의 첫 번째 국소 최소값 래그
+    window = cmnd[:, min_lag - 1:max_lag + 2]
+    center = window[:, 1:-1]
+    is_min = (center < window[:, :-2]) & (center <= window[:, 2:]) & (center < YIN_THRESHOLD)
+    voiced = is_min.any(axis=1)
+    lag = np.argmax(is_min, axis=1) + min_lag
+
+    # 포물선 보간으로 분수 래그
+    rows = np.arange(len(cmnd))
+    left, mid, right = cmnd[rows, lag - 1], cmnd[rows, lag], cmnd[rows, lag + 1]
+    denom = left - 2.0 * mid + right
+    safe = np.abs(denom) > 1e-12
+    shift = np.zeros_like(denom)
+    shift[safe] = 0.5 * (left[safe] - right[safe]) / denom[safe]
+    fractional_lag = lag + np.clip(shift, -1.0, 1.0)
+
+    return rms, voiced, fractional_lag, band_energy
+
+
+def _count_syllables(band_energy: np.ndarray, voiced: np.ndarray, hop_seconds: float) -> int:
+    """
+    모음 대역 에너지 포락선의 피크(음절 핵) 수 계산
+
+    최소 간격 안에서 가장 큰 유성 피크 중, 직전 피크와의 사이 골짜기보다
+    MIN_SYLLABLE_DIP_DB 이상 높은 것만 센다.
+    """
+    if len(band_energy) < 3:
+        return 0
+    level_db = 10.0 * np.log10(band_energy + 1e-10)
+    width = max(1, int(round(0.05 / hop_seconds)))
+    envelope = np.convolve(level_db, np.ones(width) / width, mode='same')
+
+    distance = max(1, int(round(MIN_SYLLABLE_GAP / hop_seconds)))
+    padded = np.pad(envelope, distance, mode='constant', constant_values=-np.inf)
+    local_max = np.lib.stride_tricks.sliding_window_view(padded, 2 * distance + 1).max(axis=1)
+    peaks = np.flatnonzero((envelope >= local_max) & voiced)
+    if len(peaks) == 0:
+        return 0
+
+    # 평탄한 최대값이 연속으로 잡힌 경우 병합
+    peaks = peaks[np.concatenate(([True], np.diff(peaks) >= distance))]
+
+    # 직전 피크부터 현재 피크까지의 최소값 (골짜기). 마지막 피크 뒤의 꼬리 구간은 제외해야
+    # 끝부분 무음이 마지막 피크의 골짜기로 잡히지 않음
+    valleys = np.minimum.reduceat(envelope[:peaks[-1] + 1], np.concatenate(([0], peaks[:-1])))
+    prominent = envelope[peaks] - valleys >= MIN_SYLLABLE_DIP_DB
+    return int(prominent.sum())
+
+
+class _RunningStats:
+    """Chan 병렬 결합 방식의 누적 평균 / 분산 (값 배열을 보관하지 않음)"""
+
+    __slots__ = ('count', 'mean', 'm2')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, values: np.ndarray):
+        n = len(values)
+        if n == 0:
+            return
+        values = values.astype(np.float64)
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / self.count)) if self.count else 0.0
+
+
+class ProsodyAccumulator:
+    def __init__(self, sr: int = SAMPLE_RATE):
+        """
+        청크 단위 prosody 특성 누적기
+
+        긴 녹음을 고정 길이 청크로 나눠 add()하면 청크별 프레임 특성을 누적 평균 / 분산과
+        음절 / 유성 프레임 수로만 합치므로, 메모리 사용량이 녹음 길이와 무관하게 청크 하나 분량으로 유지된다.
+        무음 판정 기준(프레임 RMS 중앙값)과 음절 검출은 청크 안에서 계산한다.
+        청크 하나만 넣으면 결과는 compute_prosody()와 같다.
+        """
+        self.sr = sr
+        self.min_lag = max(2, int(np.floor(sr / F0_MAX)))
+        self.max_lag = min(FRAME_LENGTH // 2, int(np.ceil(sr / F0_MIN)))
+        self.hop_seconds = HOP_LENGTH / sr
+
+        self.pitch = _RunningStats()
+        self.energy = _RunningStats()
+        self.samples = 0
+        self.frames = 0
+        self.active_frames = 0
+        self.voiced_frames = 0
+        self.syllables = 0
+
+    def add(self, y: np.ndarray):
+        y = np.asarray(y, dtype=np.float32)
+        if len(y) == 0:
+            return
+        frames = _frame_signal(y, FRAME_LENGTH, HOP_LENGTH)
+
+        blocks = [
+            _spectral_block(frames[start:start + BLOCK_FRAMES], self.sr, self.min_lag, self.max_lag)
+            for start in range(0, len(frames), BLOCK_FRAMES)
+        ]
+        rms, voiced, lag, band_energy = (np.concatenate(part) for part in zip(*blocks))
+
+        active = rms > max(SILENCE_RMS, 0.1 * float(np.median(rms)))
+        voiced &= active
+
+        self.pitch.add(self.sr / lag[voiced])
+        self.energy.add(rms)
+        self.samples += len(y)
+        self.frames += len(rms)
+        self.active_frames += int(active.sum())
+        self.voiced_frames += int(voiced.sum())
+        self.syllables += _count_syllables(band_energy, voiced, self.hop_seconds)
+
+    def result(self) -> Dict:
+        speech_seconds = self.active_frames * self.hop_seconds
+        return {
+            'pitch_mean': self.pitch.mean if self.pitch.count else 0.0,
+            'pitch_std': self.pitch.std,
+            'energy_mean': self.energy.mean,
+            'energy_std': self.energy.std,
+            'speech_rate': self.syllables / speech_seconds if speech_seconds > 0 else 0.0,
+            'duration': float(self.samples / self.sr),
+            'speech_duration': speech_seconds,
+            'voiced_ratio': self.voiced_frames / self.frames if self.frames else 0.0
+        }
+
+
+def compute_prosody(y: np.ndarray, sr: int = SAMPLE_RATE) -> Dict:
+    """
+    16 kHz mono 신호에서 prosody 특성 추출 (완전 벡터화, 단일 STFT)
+
+    - F0: 프레임별 YIN (누적 평균 정규화 차분 + 포물선 보간), 유성 프레임만 통계
+    - 에너지: 프레임 RMS
+    - 발화 속도: 모음 대역 에너지 피크(음절 핵) 수 / 발화 구간 길이 (음절/초)
+    """
+    accumulator = ProsodyAccumulator(sr)
+    accumulator.add(y)
+    return accumulator.result()
@@ -0,0 +1,218 @@
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from services.audio_decode import SAMPLE_RATE
+from services.audio_endpointer import EnergyEndpointer, frame_levels_db
+
+# 클립 전체 프레임 레벨에서 잡음 바닥으로 볼 백분위수
+NOISE_FLOOR_PERCENTILE = 10.0
+
+# 잡음 바닥 상한 (dBFS, 톤처럼 레벨이 일정한 큰 소리를 배경 잡음으로 보지 않도록)
+NOISE_FLOOR_MAX_DB = -40.0
+
+# 업로드 트리밍의 최소 발화 길이 (스트리밍 기본 200 ms면 "네" 같은 한 단어 대답이 잡음으로 버려짐)
+MIN_SPEECH_MS = 60.0
+
+# 발화를 못 찾아도 최대 프레임 레벨이 잡음 바닥보다 이만큼 높으면 무음으로 보지 않고 원본 유지 (dB)
+SPEECH_PEAK_MARGIN_DB = 20.0
+
+
+def _frame_stats(samples: np.ndarray, sr: int, frame_ms: float) -> Tuple[Optional[float], Optional[float]]:
+    """프레임 레벨 기준 (잡음 바닥, 최대 레벨) dB (한 프레임도 안 되면 (None, None))"""
+    frame_length = max(1, int(sr * frame_ms / 1000.0))
+    n_frames = len(samples) // frame_length
+    if n_frames == 0:
+        return None, None
+    levels = frame_levels_db(samples[:n_frames * frame_length].reshape(n_frames, frame_length))
+    noise_floor_db = min(float(np.percentile(levels, NOISE_FLOOR_PERCENTILE)), NOISE_FLOOR_MAX_DB)
+    return noise_floor_db, float(levels.max())
+
+
+def _trim_info(original_seconds: float, speech_seconds: float, spans: List[Tuple[float, float]]) -> Dict:
+    return {
+        'original_seconds': round(original_seconds, 3),
+        'speech_seconds': round(speech_seconds, 3),
+        'trimmed_seconds': round(original_seconds - speech_seconds, 3),
+        'segments': len(spans),
+        'spans': spans
+    }
+
+
+def to_original_time(t: float, spans: List[Tuple[float, float]]) -> float:
+    """무음을 제거해 이어 붙인 배열의 시각 t(초)를 원본 녹음 시각으로 변환 (spans: 이어 붙인 구간의 원본 (시작, 끝))"""
+    offset = 0.0
+    for start, end in spans:
+        if t <= offset + (end - start):
+            return round(start + (t - offset), 3)
+        offset += end - start
+    return round(spans[-1][1], 3) if spans else t
+
+
+def trim_silence(samples: np.ndarray,
+                 sr: int = SAMPLE_RATE,
+                 frame_ms: float = 30.0,
+                 **endpointer_options) -> Tuple[np.ndarray, Dict]:
+    """
+    업로드 음성의 무음 구간 제거 (앞/뒤 무음 삭제, 문장 사이 긴 무음은 짧게 압축)
+
+    스트리밍과 같은 에너지 끝점 검출기로 발화 구간을 찾아 이어 붙인다. 잡음 바닥은 첫 프레임 대신
+    클립 전체 프레임 레벨의 하위 백분위수로 시작하므로, 녹음이 바로 말로 시작해도 앞부분을 놓치지 않는다.
+    구간 앞뒤에는 끝점 검출기의 사전 롤(기본 300 ms)만큼 무음이 남는다.
+    짧은 대답을 놓치지 않도록 최소 발화 길이는 MIN_SPEECH_MS를 기본으로 쓴다.
+    발화가 없으면 빈 배열을 반환하되, 최대 레벨이 잡음 바닥보다 SPEECH_PEAK_MARGIN_DB 이상 높으면
+    무음으로 판단하지 않고 원본을 그대로 반환한다.
+    정보의 'spans'는 이어 붙인 구간의 원본 기준 (시작, 끝) 초이다 (to_original_time()으로 시각 변환).
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    noise_floor_db, peak_db = _frame_stats(samples, sr, frame_ms)
+    endpointer_options.setdefault('min_speech_ms', MIN_SPEECH_MS)
+    # 잡음 바닥은 클립 전체 백분위수로 정했으므로, 길게 이어지는 큰 소리(톤 등)로 바닥을 올리지 않음
+    endpointer_options.setdefault('noise_window_s', None)
+    endpointer = EnergyEndpointer(sample_rate=sr, frame_ms=frame_ms,
+                                  initial_noise_floor_db=noise_floor_db, **endpointer_options)
+
+    utterances = endpointer.feed(samples)
+    last = endpointer.flush()
+    if last is not None:
+        utterances.append(last)
+
+    original_seconds = len(samples) / sr
+    spans = [(u.start, u.end) for u in utterances]
+    if utterances:
+        speech = np.concatenate([u.samples for u in utterances])
+    elif peak_db is not None and peak_db > max(noise_floor_db + SPEECH_PEAK_MARGIN_DB, endpointer.min_level_db):
+        # 끝점 검출기가 놓친 짧고 뚜렷한 소리: 무음으로 단락시키지 않고 STT에 맡김
+        speech = samples
+        spans = [(0.0, original_seconds)]
+    else:
+        speech = np.zeros(0, dtype=np.float32)
+    return speech, _trim_info(original_seconds, len(speech) / sr, spans)
+
+
+class SpeechChunker:
+    def __init__(self,
+                 sr: int = SAMPLE_RATE,
+                 max_chunk_seconds: float = 30.0,
+                 trim: bool = True,
+                 frame_ms: float = 30.0,
+                 initial_noise_floor_db: Optional[float] = None,
+                 **endpointer_options):
+        """
+        긴 녹음을 발화 사이 무음에서 잘라 max_chunk_seconds 이하 청크로 나누는 스트리밍 분할기
+
+        블록을 끝점 검출기에 차례로 넣고, 다음 발화를 더하면 max_chunk_seconds를 넘을 때 두 발화 사이
+        무음 가운데에서 자르므로 단어 중간에서 잘리지 않는다 (쉼 없이 max_chunk_seconds를 넘는 발화만 강제로 자름).
+        trim=True면 청크는 trim_silence()처럼 발화 구간만 이어 붙인 배열이고 (무음뿐인 구간은 빈 배열),
+        False면 자른 경계 사이의 원본 구간이다. 청크 정보는 trim_silence()와 같은 형식이며 길이 합이 원본 길이와 같다.
+        """
+        endpointer_options.setdefault('min_speech_ms', MIN_SPEECH_MS)
+        endpointer_options.setdefault('max_utterance_s', max_chunk_seconds)
+        endpointer_options.setdefault('noise_window_s', None)
+        self.endpointer = EnergyEndpointer(sample_rate=sr, frame_ms=frame_ms,
+                                           initial_noise_floor_db=initial_noise_floor_db, **endpointer_options)
+        self.sr = sr
+        self.max_chunk_seconds = max_chunk_seconds
+        self.max_chunk_samples = int(max_chunk_seconds * sr)
+        self.trim = trim
+        self.pre_roll_samples = self.endpointer.pre_roll_frames * self.endpointer.frame_length
+
+        self._pending = []      # 현재 청크에 모은 발화
+        self._chunk_start = 0   # 현재 청크의 원본 시작 (샘플)
+        self._raw = []          # trim=False: 아직 내보내지 않은 원본 블록
+        self._raw_start = 0     # self._raw 첫 샘플의 원본 위치
+        self._fed = 0
+
+    def _cut(self, end: int) -> Tuple[np.ndarray, Dict]:
+        """현재 청크를 원본 위치 end(샘플)에서 닫고 (청크, 정보) 반환"""
+        pending, start = self._pending, self._chunk_start
+        if self.trim:
+            spans = [(u.start, u.end) for u in pending]
+            chunk = np.concatenate([u.samples for u in pending]) if pending else np.zeros(0, dtype=np.float32)
+        else:
+            data = np.concatenate(self._raw) if self._raw else np.zeros(0, dtype=np.float32)
+            chunk = data[start - self._raw_start:end - self._raw_start]
+            self._raw, self._raw_start = [data[end - self._raw_start:]], end
+            spans = [(start / self.sr, end / self.sr)]
+        info = _trim_info((end - start) / self.sr, len(chunk) / self.sr, spans)
+        info['segments'] = len(pending)
+        self._pending, self._chunk_start = [], end
+        return chunk, info
+
+    def _add(self, utterance) -> List[Tuple[np.ndarray, Dict]]:
+        closed = []
+        chunk_start = self._chunk_start / self.sr
+        if self.trim:
+            if self._pending:
+                seconds = (sum(len(u.samples) for u in self._pending) + len(utterance.samples)) / self.sr
+                if seconds > self.max_chunk_seconds:
+                    # 직전 발화 끝과 이번 발화 시작 사이 무음 가운데에서 자름
+                    closed.append(self._cut(int(round((self._pending[-1].end + utterance.start) / 2 * self.sr))))
+        elif utterance.end - chunk_start > self.max_chunk_seconds:
+            # 원본 구간 청크: 이번 발화 앞 무음에서 자르되 청크가 max_chunk_seconds를 넘지 않는 위치로
+            cut = (self._pending[-1].end + utterance.start) / 2 if self._pending else utterance.start
+            end = int(round(min(cut, chunk_start + self.max_chunk_seconds) * self.sr))
+            if end > self._chunk_start:
+                closed.append(self._cut(end))
+        self._pending.append(utterance)
+        return closed
+
+    def feed(self, samples: np.ndarray) -> List[Tuple[np.ndarray, Dict]]:
+        """16 kHz 블록 입력, 이번 블록에서 닫힌 (청크, 정보) 목록 반환"""
+        samples = np.asarray(samples, dtype=np.float32)
+        if not self.trim:
+            self._raw.append(samples)
+        self._fed += len(samples)
+
+        closed = []
+        for utterance in self.endpointer.feed(samples):
+            closed.extend(self._add(utterance))
+        # 발화 밖에서 청크가 max_chunk_seconds를 넘으면 (긴 무음) 다음 발화의 사전 롤 앞에서 자름
+        if not self.endpointer.in_speech and self._fed - self._chunk_start > self.max_chunk_samples:
+            end = min(self._fed - self.pre_roll_samples, self._chunk_start + self.max_chunk_samples)
+            if self._pending:
+                end = max(end, int(round(self._pending[-1].end * self.sr)))
+            if end > self._chunk_start:
+                closed.append(self._cut(end))
+        return closed
+
+    def flush(self) -> List[Tuple[np.ndarray, Dict]]:
+        """입력 종료: 남은 발화와 구간을 청크로 반환"""
+        closed = []
+        last = self.endpointer.flush()
+        if last is not None:
+            closed.extend(self._add(last))
+        if not self.trim:
+            # 끝의 긴 무음도 max_chunk_seconds 단위로 자름
+            while self._fed - self._chunk_start > self.max_chunk_samples:
+                end = self._chunk_start + self.max_chunk_samples
+                if self._pending:
+                    end = max(end, int(round(self._pending[-1].end * self.sr)))
+                closed.append(self._cut(end))
+        if self._fed > self._chunk_start:
+            closed.append(self._cut(self._fed))
+        return closed
+
+
+def iter_speech_chunks(blocks: Iterable[np.ndarray],
+                       sr: int = SAMPLE_RATE,
+                       max_chunk_seconds: float = 30.0,
+                       trim: bool = True,
+                       frame_ms: float = 30.0,
+                       **endpointer_options) -> Iterator[Tuple[np.ndarray, Dict]]:
+    """
+    16 kHz 블록 iterable을 SpeechChunker로 나눠 (청크, 정보)를 순차 반환
+
+    잡음 바닥은 trim_silence()처럼 첫 블록 프레임 레벨의 하위 백분위수로 시작한다.
+    """
+    blocks = iter(blocks)
+    first = next(blocks, None)
+    if first is None:
+        return
+    noise_floor_db, _ = _frame_stats(np.asarray(first, dtype=np.float32), sr, frame_ms)
+    chunker = SpeechChunker(sr, max_chunk_seconds, trim, frame_ms,
+                            initial_noise_floor_db=noise_floor_db, **endpointer_options)
+    for block in chain((first,), blocks):
+        yield from chunker.feed(block)
+    yield from chunker.flush()
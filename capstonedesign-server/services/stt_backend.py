@@ -0,0 +1,134 @@
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+# Whisper 입력 창 길이 (초, 배치 디코딩 단위)
+WINDOW_SECONDS = 30
+
+# 배치 디코딩에서 무음 창으로 보고 텍스트를 버리는 기준 (openai-whisper transcribe()와 동일)
+NO_SPEECH_THRESHOLD = 0.6
+LOGPROB_THRESHOLD = -1.0
+
+# Whisper segment 스키마 (openai-whisper transcribe() 결과와 동일한 키)
+SEGMENT_FIELDS = ('id', 'seek', 'start', 'end', 'text', 'tokens', 'temperature',
+                  'avg_logprob', 'compression_ratio', 'no_speech_prob')
+
+
+class WhisperReferenceBackend:
+    """openai-whisper PyTorch 참조 구현 (float32, 기준선)"""
+
+    name = 'whisper'
+    # 여러 요청의 30초 창을 한 번의 encoder/decoder 배치로 디코딩 가능
+    supports_batching = True
+
+    def __init__(self, model_name: str = 'base', device: Optional[str] = None):
+        import whisper
+
+        self.model_name = model_name
+        self.model = whisper.load_model(model_name, device=device)
+        # CPU에서는 fp16 미지원 경고 없이 바로 float32로
+        self._fp16 = self.model.device.type != 'cpu'
+
+    def transcribe(self, audio: Union[np.ndarray, str]) -> Dict:
+        result = self.model.transcribe(audio, fp16=self._fp16)
+        return {
+            'text': result['text'],
+            'language': result['language'],
+            'segments': result['segments']
+        }
+
+    def window_features(self, window: np.ndarray):
+        """30초 이하 창 하나의 log-mel 특성 (n_mels, 3000), 요청 스레드에서 계산"""
+        import whisper
+
+        return whisper.log_mel_spectrogram(whisper.pad_or_trim(window), n_mels=self.model.dims.n_mels,
+                                           device=self.model.device)
+
+    def decode_batch(self, features: List) -> List[Dict]:
+        """창 특성 목록을 한 번의 배치 forward pass로 디코딩 (창별 언어 감지, greedy)"""
+        import torch
+        import whisper
+
+        batch = torch.stack(features)
+        options = whisper.DecodingOptions(fp16=self._fp16)
+        results = self.model.decode(batch, options)
+        return [{
+            'text': result.text,
+            'language': result.language,
+            'tokens': result.tokens,
+            'temperature': result.temperature,
+            'avg_logprob': result.avg_logprob,
+            'compression_ratio': result.compression_ratio,
+            'no_speech_prob': result.no_speech_prob
+        } for result in results]
+
+    def get_info(self) -> Dict:
+        return {'backend': self.name, 'model': self.model_name, 'device': str(self.model.device)}
+
+
+class FasterWhisperBackend:
+    """
+    faster-whisper (CTranslate2) 백엔드
+
+    가중치를 int8로 양자화해 CPU에서 실행한다 (compute_type: 'int8', 'int8_float32', 'float32' 등).
+    결과는 openai-whisper와 같은 text / language / segments 형식으로 변환한다.
+    """
+
+    name = 'faster-whisper'
+    supports_batching = False
+
+    def __init__(self,
+                 model_name: str = 'base',
+                 compute_type: str = 'int8',
+                 cpu_threads: int = 0,
+                 beam_size: int = 5):
+        from faster_whisper import WhisperModel
+
+        self.model_name = model_name
+        self.compute_type = compute_type
+        self.beam_size = beam_size
+        self.model = WhisperModel(model_name, device='cpu', compute_type=compute_type,
+                                  cpu_threads=cpu_threads)
+
+    def _segment_dict(self, segment) -> Dict:
+        return {field: getattr(segment, field, None) for field in SEGMENT_FIELDS}
+
+    def transcribe(self, audio: Union[np.ndarray, str]) -> Dict:
+        if isinstance(audio, np.ndarray):
+            audio = audio.astype(np.float32, copy=False)
+        segments, info = self.model.transcribe(audio, beam_size=self.beam_size)
+        # segments는 지연 생성기이므로 여기서 디코딩이 실제로 수행됨
+        segment_dicts: List[Dict] = [self._segment_dict(segment) for segment in segments]
+        return {
+            'text': ''.join(segment['text'] for segment in segment_dicts),
+            'language': info.language,
+            'segments': segment_dicts
+        }
+
+    def get_info(self) -> Dict:
+        return {'backend': self.name, 'model': self.model_name, 'compute_type': self.compute_type}
+
+
+def split_windows(samples: np.ndarray, sr: int = 16000) -> List[np.ndarray]:
+    """16 kHz 배열을 겹치지 않는 30초 창으로 분할"""
+    window = WINDOW_SECONDS * sr
+    return [samples[start:start + window] for start in range(0, max(len(samples), 1), window)]
+
+
+STT_BACKENDS = ('whisper', 'faster-whisper')
+
+
+def load_stt_backend(model_name: str = 'base',
+                     backend: str = 'whisper',
+                     compute_type: str = 'int8',
+                     cpu_threads: int = 0):
+    """설정된 STT 백엔드 로드 (faster-whisper 로드 실패 시 참조 구현으로 대체)"""
+    if backend not in STT_BACKENDS:
+        raise ValueError(f"Unknown STT backend: {backend} (choose from {STT_BACKENDS})")
+
+    if backend == 'faster-whisper':
+        try:
+            return FasterWhisperBackend(model_name, compute_type=compute_type, cpu_threads=cpu_threads)
+        except Exception as e:
+            print(f"faster-whisper initialization error, falling back to reference whisper: {e}")
+    return WhisperReferenceBackend(model_name)
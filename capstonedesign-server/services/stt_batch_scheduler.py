@@ -0,0 +1,77 @@
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Dict, Optional
+
+import numpy as np
+
+from services.audio_decode import SAMPLE_RATE
+from services.micro_batch import MicroBatchExecutor
+from services.stt_backend import LOGPROB_THRESHOLD, NO_SPEECH_THRESHOLD, WINDOW_SECONDS, split_windows
+
+
+class WhisperBatchScheduler(MicroBatchExecutor):
+    error_label = 'STT batch decoding'
+    thread_name = 'stt-batch-scheduler'
+
+    def __init__(self,
+                 backend,
+                 max_batch_size: int = 8,
+                 max_wait_ms: float = 50.0,
+                 stats_window: int = 1000):
+        """
+        Whisper 배치 디코딩 스케줄러
+
+        동시에 들어온 여러 요청의 오디오를 30초 창으로 나눠 최대 max_wait_ms 동안 모은 뒤,
+        backend.decode_batch()로 한 번의 encoder/decoder 배치로 디코딩해 각 호출자에게 돌려준다.
+        창은 이전 창의 텍스트를 조건으로 쓰지 않고 독립적으로 디코딩된다 (온도 폴백 없음).
+        """
+        self.backend = backend
+        super().__init__(backend.decode_batch, max_batch_size, max_wait_ms, stats_window)
+
+    def submit(self, window: np.ndarray) -> Future:
+        """창 하나의 특성을 계산해 대기열에 넣고 Future 반환 (결과: 창 디코딩 dict)"""
+        return self.submit_payload(self.backend.window_features(window))
+
+    def transcribe(self, samples: np.ndarray, timeout: Optional[float] = None) -> Dict:
+        """16 kHz 배열 전사 (창별 결과를 openai-whisper 형식의 text / language / segments로 합침)"""
+        windows = split_windows(samples, SAMPLE_RATE)
+        futures = [self.submit(window) for window in windows]
+        # timeout은 창별이 아니라 전체 전사에 대한 제한
+        deadline = None if timeout is None else time.monotonic() + timeout
+        results = [
+            future.result(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+            for future in futures
+        ]
+
+        segments = []
+        languages = Counter()
+        for index, (window, result) in enumerate(zip(windows, results)):
+            languages[result['language']] += len(window)
+            if result['no_speech_prob'] > NO_SPEECH_THRESHOLD and result['avg_logprob'] < LOGPROB_THRESHOLD:
+                continue
+            start = index * WINDOW_SECONDS
+            segments.append({
+                'id': len(segments),
+                'seek': index * WINDOW_SECONDS * 100,
+                'start': float(start),
+                'end': start + len(window) / SAMPLE_RATE,
+                'text': result['text'],
+                'tokens': result['tokens'],
+                'temperature': result['temperature'],
+                'avg_logprob': result['avg_logprob'],
+                'compression_ratio': result['compression_ratio'],
+                'no_speech_prob': result['no_speech_prob']
+            })
+
+        return {
+            'text': ' '.join(segment['text'].strip() for segment in segments if segment['text'].strip()),
+            'language': languages.most_common(1)[0][0],
+            'segments': segments
+        }
+
+    def get_stats(self) -> Dict:
+        """배치 크기(창 수), 대기열 대기 시간, 배치 디코딩 시간 통계"""
+        stats = super().get_stats()
+        stats['total_windows'] = stats.pop('total_items')
+        return stats
@@ -1,13 +1,28 @@
 import os
-import csv
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from services.emotion_lexicon import EmotionLexicon
+from services.lexicon_artifact import default_artifact_path, load_compiled_lexicon
+from services.lexicon_trie import DoubleArrayTrie, lexicon_keys, match_tokens
 
 class TextEmotionService:
-    def __init__(self, lexicon_path: str = "lexicon/Korean-NRC-EmoLex.txt"):
+    def __init__(self, lexicon_path: str = "lexicon/Korean-NRC-EmoLex.txt", matcher: str = None,
+                 artifact_path: str = None):
         """텍스트 감정 분석 서비스 초기화"""
         self.lexicon_path = lexicon_path
-        self.korean_lexicon = {}
+        # 컴파일된 바이너리 lexicon 경로 (빈 값이면 매번 TSV 파싱)
+        self.artifact_path = (artifact_path if artifact_path is not None
+                              else os.getenv('TEXT_LEXICON_ARTIFACT', default_artifact_path(lexicon_path)))
+        # 'trie': 조사·어미가 붙은 어절도 최장 접두 매칭 / 'exact': 공백 토큰 완전 일치
+        self.matcher = (matcher or os.getenv('TEXT_LEXICON_MATCHER', 'trie')).lower()
+        # analyze_batch()가 한 번에 매칭·채점하는 문서 수
+        self.batch_chunk_size = max(1, int(os.getenv('TEXT_BATCH_CHUNK_SIZE', '256')))
+        self.korean_lexicon = EmotionLexicon.empty([])
         self.lexicon_emotions = []
+        self.lexicon_words = []
+        self.lexicon_trie = None
         self.load_lexicon()
         
         # 감정을 VAD Score로 매핑
@@ -21,39 +36,77 @@ class TextEmotionService:
             'fear': {'valence': 0.1, 'arousal': 0.9, 'dominance': 0.2},
             'sadness': {'valence': 0.2, 'arousal': 0.3, 'dominance': 0.2}
         }
+        
+        # lexicon 감정 열 순서의 (감정 수, 3) VAD 행렬 + VAD 매핑이 있는 감정 표시
+        self.vad_dimensions = ['valence', 'arousal', 'dominance']
+        self._build_vad_matrix()
     
     def load_lexicon(self):
         """NRC Lexicon 로드"""
         try:
-            if os.path.exists(self.lexicon_path):
-                with open(self.lexicon_path, encoding='utf-8') as f:
-                    reader = csv.DictReader(f, delimiter='\t')
-                    self.lexicon_emotions = [col for col in reader.fieldnames 
-                                           if col not in ('English Word', 'Korean Word')]
-                    
-                    for row in reader:
-                        word = row['Korean Word'].strip()
-                        if word:
-                            self.korean_lexicon[word] = {
-                                emotion: int(row[emotion]) 
-                                for emotion in self.lexicon_emotions
-                            }
-                print(f"Loaded {len(self.korean_lexicon)} words from lexicon")
+            if self.artifact_path and (os.path.exists(self.lexicon_path) or os.path.exists(self.artifact_path)):
+                self.korean_lexicon, trie = load_compiled_lexicon(self.lexicon_path, self.artifact_path)
+                self.lexicon_emotions = self.korean_lexicon.emotions
+                self.lexicon_words = self.korean_lexicon.words
+                if self.matcher == 'trie':
+                    self.lexicon_trie = trie
+                print(f"Loaded {len(self.korean_lexicon)} words from lexicon artifact (matcher: {self.matcher})")
+            elif os.path.exists(self.lexicon_path):
+                self.korean_lexicon = EmotionLexicon.from_tsv(self.lexicon_path)
+                self.lexicon_emotions = self.korean_lexicon.emotions
+                self.lexicon_words = self.korean_lexicon.words
+                if self.matcher == 'trie':
+                    self.lexicon_trie = DoubleArrayTrie.build(*lexicon_keys(self.lexicon_words))
+                print(f"Loaded {len(self.korean_lexicon)} words from lexicon (matcher: {self.matcher})")
             else:
                 print(f"Lexicon file not found: {self.lexicon_path}")
                 # 기본 감정 리스트 설정
                 self.lexicon_emotions = ['joy', 'trust', 'anticipation', 'surprise', 
                                        'anger', 'disgust', 'fear', 'sadness']
+                self.korean_lexicon = EmotionLexicon.empty(self.lexicon_emotions)
         except Exception as e:
             print(f"Error loading lexicon: {e}")
             self.lexicon_emotions = ['joy', 'trust', 'anticipation', 'surprise', 
                                    'anger', 'disgust', 'fear', 'sadness']
+            self.korean_lexicon = EmotionLexicon.empty(self.lexicon_emotions)
+            self.lexicon_words = []
+            self.lexicon_trie = None
+
+    def _build_vad_matrix(self):
+        """emotion_to_vad를 lexicon 감정 열 순서의 행렬로 변환 (매핑 없는 감정은 0행)"""
+        self.vad_matrix = np.array([
+            [self.emotion_to_vad.get(emotion, {}).get(dim, 0.0) for dim in self.vad_dimensions]
+            for emotion in self.lexicon_emotions
+        ], dtype=np.float64).reshape(len(self.lexicon_emotions), len(self.vad_dimensions))
+        self.vad_mask = np.array([emotion in self.emotion_to_vad for emotion in self.lexicon_emotions], dtype=bool)
     
     def preprocess_text(self, text: str) -> List[str]:
         """텍스트 전처리"""
         # 간단한 토큰화 (공백 기준)
         words = text.strip().split()
         return words
+
+    def match_lexicon_words(self, text: str) -> Tuple[int, np.ndarray, List[str]]:
+        """텍스트에서 lexicon 단어 매칭 (어절 수, 매칭된 단어의 lexicon 행 번호 배열, 매칭된 어절 목록)"""
+        if self.lexicon_trie is None:
+            words = self.preprocess_text(text)
+            matched_words = [word for word in words if word in self.korean_lexicon]
+            return len(words), self.korean_lexicon.rows(matched_words), matched_words
+
+        total_words, matches = match_tokens(self.lexicon_trie, text)
+        rows = np.array([index for index, _ in matches], dtype=np.intp)
+        return total_words, rows, [surface for _, surface in matches]
+
+    def score_rows(self, rows: np.ndarray) -> np.ndarray:
+        """
+        매칭된 lexicon 행의 감정별 평균 점수 (감정 열 순서 벡터)
+
+        감정마다 (매칭 단어의 점수 합) / (그 감정 값이 0보다 큰 매칭 단어 수), 해당 단어가 없으면 0.
+        """
+        matched = self.korean_lexicon.matrix[rows]
+        sums = matched.sum(axis=0, dtype=np.int64)
+        counts = np.count_nonzero(matched, axis=0)
+        return np.divide(sums, counts, out=np.zeros(len(self.lexicon_emotions)), where=counts > 0)
     
     def analyze_text_emotion(self, text: str) -> Dict:
         """텍스트 감정 분석 수행"""
@@ -64,58 +117,19 @@ class TextEmotionService:
                     'error': 'Empty text provided'
                 }
             
-            # 텍스트 전처리
-            words = self.preprocess_text(text)
+            # 텍스트 전처리 + lexicon 매칭
+            total_words, rows, matched_words = self.match_lexicon_words(text)
             
-            if not words:
+            if not total_words:
                 return {
                     'success': False,
                     'error': 'No valid words found'
                 }
             
-            # 감정 점수 계산
-            scores = {emotion: 0 for emotion in self.lexicon_emotions}
-            count = {emotion: 0 for emotion in self.lexicon_emotions}
-            matched_words = []
-            
-            for word in words:
-                if word in self.korean_lexicon:
-                    matched_words.append(word)
-                    for emotion in self.lexicon_emotions:
-                        scores[emotion] += self.korean_lexicon[word][emotion]
-                        if self.korean_lexicon[word][emotion] > 0:
-                            count[emotion] += 1
-            
-            # 평균 점수 계산
-            avg_scores = {}
-            for emotion in self.lexicon_emotions:
-                if count[emotion] > 0:
-                    avg_scores[emotion] = scores[emotion] / count[emotion]
-                else:
-                    avg_scores[emotion] = 0.0
-            
-            # 주요 감정 찾기
-            if any(avg_scores.values()):
-                dominant_emotion = max(avg_scores, key=avg_scores.get)
-                emotion_intensity = avg_scores[dominant_emotion]
-            else:
-                dominant_emotion = 'neutral'
-                emotion_intensity = 0.0
-            
-            # VAD Score 계산
-            vad_score = self.calculate_vad_score(avg_scores)
-            
-            return {
-                'success': True,
-                'text': text,
-                'dominant_emotion': dominant_emotion,
-                'emotion_intensity': emotion_intensity,
-                'emotion_scores': avg_scores,
-                'matched_words': matched_words,
-                'total_words': len(words),
-                'matched_count': len(matched_words),
-                'vad_score': vad_score
-            }
+            # 감정 점수 계산 (매칭된 행을 모아 한 번에 합산)
+            score_vector = self.score_rows(rows)
+            return self._emotion_result(text, total_words, rows, matched_words, score_vector,
+                                        self.vad_from_vector(score_vector))
             
         except Exception as e:
             return {
@@ -123,33 +137,132 @@ class TextEmotionService:
                 'error': f'Text emotion analysis failed: {str(e)}'
             }
     
+    def analyze_batch(self, texts: Iterable[str], chunk_size: int = None) -> Iterator[Dict]:
+        """
+        여러 문서 감정 분석 (입력 순서대로 analyze_text_emotion()과 같은 형식의 결과를 하나씩 반환)
+
+        chunk_size개씩 매칭한 뒤 청크 전체의 매칭 행을 이어 붙여 감정 점수와 VAD Score를 한 번에 계산한다.
+        입력과 결과 모두 청크 단위로만 메모리에 올라간다.
+        """
+        chunk_size = chunk_size or self.batch_chunk_size
+        chunk = []
+        for text in texts:
+            chunk.append(text)
+            if len(chunk) >= chunk_size:
+                yield from self._analyze_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self._analyze_chunk(chunk)
+
+    def _analyze_chunk(self, texts: List[str]) -> List[Dict]:
+        results = [None] * len(texts)
+        matched = []
+        for i, text in enumerate(texts):
+            try:
+                if not isinstance(text, str):
+                    results[i] = {'success': False, 'error': 'Text must be a string'}
+                    continue
+                if not text.strip():
+                    results[i] = {'success': False, 'error': 'Empty text provided'}
+                    continue
+                total_words, rows, matched_words = self.match_lexicon_words(text)
+                if not total_words:
+                    results[i] = {'success': False, 'error': 'No valid words found'}
+                    continue
+                matched.append((i, total_words, rows, matched_words))
+            except Exception as e:
+                results[i] = {'success': False, 'error': f'Text emotion analysis failed: {str(e)}'}
+
+        if matched:
+            try:
+                scores, vads = self.score_batch([rows for _, _, rows, _ in matched])
+                for (i, total_words, rows, matched_words), score_vector, vad in zip(matched, scores, vads):
+                    vad_score = dict(zip(self.vad_dimensions, vad.tolist()))
+                    results[i] = self._emotion_result(texts[i], total_words, rows, matched_words, score_vector,
+                                                      vad_score)
+            except Exception as e:
+                for i, _, _, _ in matched:
+                    results[i] = {'success': False, 'error': f'Text emotion analysis failed: {str(e)}'}
+        return results
+
+    def score_batch(self, row_groups: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        문서별 매칭 행 목록 → (문서 수, 감정 수) 평균 점수 행렬, (문서 수, 3) VAD 행렬
+
+        모든 문서의 매칭 행을 이어 붙인 행렬의 누적합 차이로 문서별 합계 / 개수를 구한다 (score_rows()와 같은 값).
+        """
+        lengths = np.array([len(rows) for rows in row_groups], dtype=np.intp)
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        all_rows = np.concatenate(row_groups) if len(row_groups) else np.zeros(0, dtype=np.intp)
+
+        matched = self.korean_lexicon.matrix[all_rows.astype(np.intp)]
+        zero = np.zeros((1, len(self.lexicon_emotions)), dtype=np.int64)
+        sum_prefix = np.concatenate([zero, np.cumsum(matched, axis=0, dtype=np.int64)])
+        count_prefix = np.concatenate([zero, np.cumsum(matched > 0, axis=0, dtype=np.int64)])
+        sums = sum_prefix[ends] - sum_prefix[starts]
+        counts = count_prefix[ends] - count_prefix[starts]
+        scores = np.divide(sums, counts, out=np.zeros(sums.shape), where=counts > 0)
+
+        weights = np.where((scores > 0) & self.vad_mask, scores, 0.0)
+        total_weight = weights.sum(axis=1, keepdims=True)
+        vads = np.divide(weights @ self.vad_matrix, total_weight,
+                         out=np.full((len(row_groups), len(self.vad_dimensions)), 0.5), where=total_weight > 0)
+        return scores, vads
+
+    def _emotion_result(self, text: str, total_words: int, rows: np.ndarray, matched_words: List[str],
+                        score_vector: np.ndarray, vad_score: Dict) -> Dict:
+        """
+        analyze_text_emotion() 응답 형식으로 정리
+
+        matched_words는 텍스트에서 매칭된 어절 그대로, matched_lexicon_words는 대응하는 lexicon 단어(기본형).
+        """
+        avg_scores = dict(zip(self.lexicon_emotions, score_vector.tolist()))
+        
+        # 주요 감정 찾기
+        if any(avg_scores.values()):
+            dominant_emotion = max(avg_scores, key=avg_scores.get)
+            emotion_intensity = avg_scores[dominant_emotion]
+        else:
+            dominant_emotion = 'neutral'
+            emotion_intensity = 0.0
+        
+        return {
+            'success': True,
+            'text': text,
+            'dominant_emotion': dominant_emotion,
+            'emotion_intensity': emotion_intensity,
+            'emotion_scores': avg_scores,
+            'matched_words': matched_words,
+            'matched_lexicon_words': [self.lexicon_words[row] for row in rows],
+            'total_words': total_words,
+            'matched_count': len(matched_words),
+            'vad_score': vad_score
+        }
+    
     def calculate_vad_score(self, emotion_scores: Dict) -> Dict:
         """감정 점수를 VAD Score로 변환"""
         try:
-            vad_score = {'valence': 0.5, 'arousal': 0.5, 'dominance': 0.5}
-            
-            # 각 감정의 VAD Score를 가중 평균으로 계산
-            total_weight = 0
-            weighted_vad = {'valence': 0, 'arousal': 0, 'dominance': 0}
-            
-            for emotion, score in emotion_scores.items():
-                if score > 0 and emotion in self.emotion_to_vad:
-                    weight = score
-                    total_weight += weight
-                    
-                    for vad_dim in ['valence', 'arousal', 'dominance']:
-                        weighted_vad[vad_dim] += weight * self.emotion_to_vad[emotion][vad_dim]
-            
-            # 정규화
-            if total_weight > 0:
-                for vad_dim in ['valence', 'arousal', 'dominance']:
-                    vad_score[vad_dim] = weighted_vad[vad_dim] / total_weight
-            
-            return vad_score
+            scores = np.array([emotion_scores.get(emotion, 0.0) for emotion in self.lexicon_emotions],
+                              dtype=np.float64)
+            return self.vad_from_vector(scores)
             
         except Exception as e:
             print(f"VAD score calculation error: {e}")
             return {'valence': 0.5, 'arousal': 0.5, 'dominance': 0.5}
+
+    def vad_from_vector(self, scores: np.ndarray) -> Dict:
+        """
+        감정 열 순서의 점수 벡터 → VAD Score
+
+        양수 점수를 가중치로 한 VAD 매핑 가중 평균을 행렬 곱 한 번으로 계산 (가중치 합이 0이면 중립 0.5).
+        """
+        weights = np.where((scores > 0) & self.vad_mask, scores, 0.0)
+        total_weight = weights.sum()
+        if total_weight <= 0:
+            return {'valence': 0.5, 'arousal': 0.5, 'dominance': 0.5}
+        vad = weights @ self.vad_matrix / total_weight
+        return dict(zip(self.vad_dimensions, vad.tolist()))
     
     def get_mock_result(self) -> Dict:
         """모킹 결과 반환 (테스트용)"""
@@ -0,0 +1,179 @@
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class TranscriptCache:
+    def __init__(self,
+                 max_entries: int = 256,
+                 db_path: Optional[str] = None,
+                 max_disk_mb: float = 256.0,
+                 lock_timeout: float = 5.0):
+        """
+        STT 결과 2단계 캐시 (메모리 LRU + SQLite)
+
+        키는 디코딩된 16 kHz PCM과 STT 엔진/모델 이름의 SHA-256이므로, 컨테이너나 인코딩이
+        달라도 같은 소리면 같은 항목이 된다. 메모리에서 못 찾으면 디스크를 조회해 메모리로 올리고,
+        디스크는 저장된 결과 크기 합이 max_disk_mb를 넘으면 가장 오래 조회되지 않은 항목부터 지운다.
+        SQLite 파일은 여러 워커 프로세스가 공유하므로 크기 합은 프로세스 안에 세지 않고
+        저장 트랜잭션 안에서 매번 다시 계산한다. db_path가 없으면 메모리 캐시만 사용한다.
+        캐시는 선택 사항이므로 디스크 읽기 / 쓰기 오류(예: 다른 워커가 잠근 'database is locked')는
+        경고만 남기고 'disk_errors'로 센다 (조회는 미스, 저장은 메모리에만). lock_timeout은 잠금 대기 시간(초)이다.
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self.db_path = db_path
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            'hits': 0, 'memory_hits': 0, 'disk_hits': 0,
+            'misses': 0, 'evictions': 0, 'disk_evictions': 0, 'disk_errors': 0
+        }
+
+        self._db = None
+        if db_path:
+            directory = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(directory, exist_ok=True)
+            # 요청 스레드 간 공유 (접근은 self._lock으로 직렬화)
+            self._db = sqlite3.connect(db_path, timeout=lock_timeout, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS transcripts ('
+                'key TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL, '
+                'created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS transcripts_accessed ON transcripts (accessed_at)')
+            self._db.commit()
+
+    def make_key(self, samples: np.ndarray, variant: str = '') -> str:
+        """디코딩된 PCM 바이트와 엔진/모델 이름(variant)의 SHA-256"""
+        digest = hashlib.sha256(np.ascontiguousarray(samples, dtype=np.float32).tobytes())
+        digest.update(variant.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _remember(self, key: str, result: Dict):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters['evictions'] += 1
+
+    def _disk_bytes(self) -> int:
+        return self._db.execute('SELECT COALESCE(SUM(size), 0) FROM transcripts').fetchone()[0]
+
+    def _evict_disk(self):
+        """크기 합이 한도를 넘은 만큼 가장 오래 조회되지 않은 항목부터 삭제 (쓰기 트랜잭션 안에서 호출)"""
+        excess = self._disk_bytes() - self.max_disk_bytes
+        if excess <= 0:
+            return
+        victims = []
+        for key, size in self._db.execute('SELECT key, size FROM transcripts ORDER BY accessed_at'):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._db.executemany('DELETE FROM transcripts WHERE key = ?', victims)
+        self._counters['disk_evictions'] += len(victims)
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                self._counters['memory_hits'] += 1
+                return copy.deepcopy(result)
+
+            if self._db is not None:
+                try:
+                    result = self._get_disk(key)
+                except (sqlite3.Error, ValueError) as e:
+                    self._disk_error('read', e)
+                    result = None
+                if result is not None:
+                    self._remember(key, result)
+                    self._counters['hits'] += 1
+                    self._counters['disk_hits'] += 1
+                    return copy.deepcopy(result)
+
+            self._counters['misses'] += 1
+            return None
+
+    def _get_disk(self, key: str) -> Optional[Dict]:
+        row = self._db.execute('SELECT payload FROM transcripts WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        self._db.execute('UPDATE transcripts SET accessed_at = ? WHERE key = ?', (time.time(), key))
+        self._db.commit()
+        return json.loads(row[0])
+
+    def _disk_error(self, operation: str, error: Exception):
+        print(f"Transcript cache disk {operation} error: {error}")
+        self._counters['disk_errors'] += 1
+        try:
+            if self._db.in_transaction:
+                self._db.rollback()
+        except sqlite3.Error:
+            pass
+
+    def put(self, key: str, result: Dict):
+        with self._lock:
+            self._remember(key, copy.deepcopy(result))
+            if self._db is None:
+                return
+            try:
+                self._put_disk(key, result)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                self._disk_error('write', e)
+
+    def _put_disk(self, key: str, result: Dict):
+        payload = json.dumps(result, ensure_ascii=False)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_disk_bytes:
+            return
+        now = time.time()
+        # 다른 워커의 저장과 겹치지 않도록 쓰기 잠금을 먼저 잡고, 그 안에서 크기 합을 다시 계산해 정리
+        if self._db.in_transaction:
+            self._db.commit()
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            self._db.execute(
+                'INSERT OR REPLACE INTO transcripts (key, payload, size, created_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, payload, size, now, now)
+            )
+            self._evict_disk()
+            self._db.commit()
+        except Exception:
+            self._db.rollback()
+            raise
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM transcripts')
+                self._db.commit()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['size'] = len(self._entries)
+            if self._db is not None:
+                stats['disk_entries'] = self._db.execute('SELECT COUNT(*) FROM transcripts').fetchone()[0]
+                stats['disk_bytes'] = self._disk_bytes()
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['max_entries'] = self.max_entries
+        stats['max_disk_bytes'] = self.max_disk_bytes if self._db is not None else None
+        stats['db_path'] = self.db_path
+        return stats
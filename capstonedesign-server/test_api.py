@@ -6,7 +6,11 @@
 import requests
 import json
 import base64
+import io
+import math
+import struct
 import time
+import wave
 
 # API 서버 URL
 BASE_URL = "http://localhost:5001"
@@ -81,6 +85,81 @@ def test_text_emotion():
         
         time.sleep(0.5)  # 요청 간 간격
 
+def test_text_emotion_batch():
+    """텍스트 감정 일괄 분석 테스트 (NDJSON 스트리밍 응답)"""
+    print("\n📚 텍스트 감정 일괄 분석 테스트...")
+    texts = [
+        "오늘은 정말 기분이 좋고 행복했다.",
+        "친구와 싸워서 하루 종일 화가 났어요.",
+        "",
+        "시험 결과가 걱정되어서 잠을 못 잤다."
+    ] * 25
+    
+    try:
+        response = requests.post(
+            f"{BASE_URL}/analyze_text_emotion/batch",
+            json={"texts": texts},
+            headers={"Content-Type": "application/json"},
+            stream=True
+        )
+        
+        if response.status_code == 200:
+            results = [json.loads(line) for line in response.iter_lines() if line]
+            succeeded = sum(1 for r in results if r.get('success'))
+            print(f"✅ 결과 {len(results)}/{len(texts)}개 수신 (성공 {succeeded}개)")
+            if results:
+                print(f"📊 첫 문서: {results[0].get('dominant_emotion', 'N/A')}, {results[0].get('matched_words', [])}")
+        else:
+            print(f"❌ 요청 실패: {response.status_code}")
+            
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
+def make_test_wav(seconds=2.0, sr=16000):
+    """F0가 150→250 Hz로 올라가는 하모닉 톤 WAV (16-bit mono)"""
+    frames = []
+    phase = 0.0
+    n = int(seconds * sr)
+    for i in range(n):
+        f0 = 150.0 + 100.0 * i / n
+        phase += 2 * math.pi * f0 / sr
+        value = 0.3 * sum(math.sin(k * phase) / k for k in range(1, 4))
+        frames.append(struct.pack('<h', int(max(-1.0, min(1.0, value)) * 32767)))
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sr)
+        wav.writeframes(b''.join(frames))
+    return buffer.getvalue()
+
+def test_audio_emotion():
+    """음성 감정 분석 테스트 (합성 톤, base64 JSON)"""
+    print("\n🎵 음성 감정 분석 테스트...")
+    audio_b64 = base64.b64encode(make_test_wav()).decode('ascii')
+    
+    try:
+        response = requests.post(
+            f"{BASE_URL}/analyze_audio_emotion",
+            json={"audio": audio_b64},
+            headers={"Content-Type": "application/json"}
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            if data.get('success'):
+                print("✅ 음성 감정 분석 성공!")
+                print(f"🎼 Prosody: {data.get('prosody_features', {})}")
+                print(f"📊 VAD: {data.get('vad_score', {})}")
+                print(f"⏱️ 단계별 시간(ms): {data.get('timings_ms', {})}")
+            else:
+                print(f"❌ 음성 분석 실패: {data.get('error', 'Unknown error')}")
+        else:
+            print(f"❌ 요청 실패: {response.status_code}")
+            
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
 def test_cbt_strategy():
     """CBT 전략 매핑 테스트"""
     print("\n🧠 CBT 전략 매핑 테스트...")
@@ -200,20 +279,26 @@ def main():
     # 3. 텍스트 감정 분석 테스트
     test_text_emotion()
     
-    # 4. CBT 전략 매핑 테스트
+    # 4. 텍스트 감정 일괄 분석 테스트
+    test_text_emotion_batch()
+    
+    # 5. 음성 감정 분석 테스트
+    test_audio_emotion()
+    
+    # 6. CBT 전략 매핑 테스트
     test_cbt_strategy()
     
-    # 5. GPT 응답 생성 테스트
+    # 7. GPT 응답 생성 테스트
     test_gpt_response()
     
-    # 6. 멀티모달 분석 테스트
+    # 8. 멀티모달 분석 테스트
     test_multimodal_analysis()
     
     print("\n" + "=" * 50)
     print("✅ 모든 테스트 완료!")
     print("\n💡 추가 테스트:")
     print("   - 얼굴 이미지 분석: 실제 base64 이미지 데이터로 테스트")
-    print("   - 음성 분석: 실제 base64 오디오 데이터로 테스트")
+    print("   - 음성 분석: 실제 녹음으로 테스트, 성능은 benchmarks/benchmark_audio_pipeline.py")
     print("   - PDF 리포트: 생성된 base64 PDF 데이터 확인")
 
 if __name__ == "__main__":
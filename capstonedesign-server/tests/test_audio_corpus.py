@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from benchmarks.audio_corpus import CLIP_KINDS, clip_seed, corpus_manifest, generate_clip, iter_corpus
+from benchmarks.benchmark_audio_pipeline import STAGES, benchmark_clip, create_service
+from services.audio_decode import SAMPLE_RATE
+from services.silence_trim import trim_silence
+
+
+@pytest.mark.parametrize('kind', CLIP_KINDS)
+def test_clips_are_deterministic(kind):
+    first = generate_clip(kind, 3.0)
+    assert first.dtype == np.float32
+    assert len(first) == 3 * SAMPLE_RATE
+    assert np.abs(first).max() <= 1.0
+    assert np.array_equal(first, generate_clip(kind, 3.0))
+    # 길이가 다르면 시드도 다름
+    assert not np.array_equal(first[:SAMPLE_RATE], generate_clip(kind, 4.0)[:SAMPLE_RATE])
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError):
+        generate_clip('music', 1.0)
+
+
+def test_manifest_matches_corpus():
+    lengths, kinds = (1.0, 2.0), ('tone', 'silence')
+    manifest = corpus_manifest(lengths, kinds)
+    clips = list(iter_corpus(lengths, kinds))
+    assert [entry['name'] for entry in manifest] == [clip['name'] for clip in clips]
+    assert manifest[0]['seed'] == clip_seed('tone', 1.0)
+
+
+def test_silence_and_mixed_clips_exercise_trimming():
+    silence, _ = trim_silence(generate_clip('silence', 5.0))
+    assert len(silence) == 0
+    mixed, info = trim_silence(generate_clip('mixed', 20.0))
+    assert info['segments'] >= 2
+    assert 0 < info['speech_seconds'] < 20.0
+
+
+def test_benchmark_clip_reports_every_stage(monkeypatch):
+    monkeypatch.setenv('TRANSCRIPT_CACHE', 'false')
+    service = create_service(SimpleNamespace(stt='mock', mock_rtf=0.0, model='base'))
+    clip = next(iter_corpus((2.0,), ('speech',)))
+    report, timings = benchmark_clip(service, clip, repeat=2)
+    assert set(report['stages']) == set(STAGES)
+    assert all(len(values) == 2 for values in timings.values())
+    assert report['seconds'] == 2.0
+    assert report['silence_trim'] is not None
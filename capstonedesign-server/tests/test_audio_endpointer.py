@@ -0,0 +1,82 @@
+import numpy as np
+
+from services.audio_endpointer import DEFAULT_NOISE_FLOOR_DB, EnergyEndpointer, frame_levels_db
+
+SR = 16000
+
+
+def tone(seconds, amplitude=0.2, freq=180.0):
+    t = np.arange(int(seconds * SR)) / SR
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def noise(seconds, amplitude=1e-4, seed=0):
+    return np.random.default_rng(seed).normal(0, amplitude, int(seconds * SR)).astype(np.float32)
+
+
+def run(endpointer, samples, block_seconds=0.1):
+    block = int(block_seconds * SR)
+    utterances = []
+    for start in range(0, len(samples), block):
+        utterances.extend(endpointer.feed(samples[start:start + block]))
+    last = endpointer.flush()
+    if last is not None:
+        utterances.append(last)
+    return utterances
+
+
+def test_frame_levels_db():
+    frames = np.stack([np.zeros(480), np.full(480, 0.1)]).astype(np.float32)
+    levels = frame_levels_db(frames)
+    assert levels[0] < -150
+    assert abs(levels[1] - 20 * np.log10(0.1)) < 1e-6
+
+
+def test_speech_at_start_is_detected():
+    # 첫 프레임부터 말소리: 잡음 바닥이 말소리 레벨이 되지 않아야 함
+    samples = np.concatenate([tone(1.0), noise(1.0)])
+    utterances = run(EnergyEndpointer(sample_rate=SR), samples)
+    assert len(utterances) == 1
+    assert utterances[0].start == 0.0
+    assert utterances[0].end >= 1.0
+
+
+def test_utterance_between_silences():
+    samples = np.concatenate([noise(1.0), tone(0.5), noise(1.5, seed=1)])
+    utterances = run(EnergyEndpointer(sample_rate=SR, pre_roll_ms=0), samples)
+    assert len(utterances) == 1
+    assert abs(utterances[0].start - 1.0) <= 0.03
+    assert abs(utterances[0].end - 1.5) <= 0.06
+
+
+def test_two_utterances_split_by_long_pause():
+    samples = np.concatenate([noise(0.5), tone(0.4), noise(1.0, seed=1), tone(0.4), noise(1.0, seed=2)])
+    utterances = run(EnergyEndpointer(sample_rate=SR, max_silence_ms=600), samples)
+    assert [u.index for u in utterances] == [0, 1]
+
+
+def test_short_blips_are_dropped():
+    samples = np.concatenate([noise(0.5), tone(0.06), noise(1.0, seed=1)])
+    assert run(EnergyEndpointer(sample_rate=SR, min_speech_ms=200), samples) == []
+
+
+def test_noise_floor_does_not_learn_from_speech():
+    endpointer = EnergyEndpointer(sample_rate=SR)
+    run(endpointer, tone(3.0))
+    assert endpointer._noise_floor_db == DEFAULT_NOISE_FLOOR_DB
+
+
+def test_noisy_room_raises_noise_floor():
+    # 기본 바닥(-60 dBFS)보다 시끄러운 배경: noise_window_s 뒤에는 잡음을 말소리로 보지 않음
+    background = noise(8.0, amplitude=0.01)
+    samples = background.copy()
+    samples[int(6.0 * SR):int(6.5 * SR)] += tone(0.5)
+    utterances = run(EnergyEndpointer(sample_rate=SR, noise_window_s=2.0, pre_roll_ms=0), samples)
+    assert any(abs(u.start - 6.0) <= 0.06 for u in utterances)
+    assert all(u.end - u.start < 3.0 for u in utterances)
+
+
+def test_max_utterance_forces_cut():
+    utterances = run(EnergyEndpointer(sample_rate=SR, max_utterance_s=1.0, noise_window_s=None), tone(2.5))
+    assert len(utterances) == 3
+    assert all(u.end - u.start <= 1.0 + 1e-6 for u in utterances)
@@ -0,0 +1,148 @@
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+
+from services.face_pipeline import (
+    EXPRESSION_LABELS, ROI_SIZE, box_to_dict, build_emotion_result, build_face_response, crop_faces,
+    decode_image_gray, detect_face_boxes, preprocess_faces, pyramid_level
+)
+from services.face_tracker import FaceTrackerRegistry
+
+# 원본 이미지 좌표의 밝은 사각형 (x, y, w, h)
+SQUARE = (1200, 800, 400, 400)
+
+
+class Rect(NamedTuple):
+    l: int
+    t: int
+    r: int
+    b: int
+
+    def left(self):
+        return self.l
+
+    def top(self):
+        return self.t
+
+    def right(self):
+        return self.r
+
+    def bottom(self):
+        return self.b
+
+
+def bright_region_detector(gray):
+    """밝은 픽셀의 외접 사각형을 dlib 검출 결과처럼 반환"""
+    ys, xs = np.nonzero(gray > 128)
+    if not len(xs):
+        return []
+    return [Rect(int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1)]
+
+
+def encode_jpeg(width, height):
+    image = np.zeros((height, width), dtype=np.uint8)
+    x, y, w, h = SQUARE
+    image[y:y + h, x:x + w] = 255
+    ok, data = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 95])
+    assert ok
+    return data.tobytes()
+
+
+def assert_close_to_square(box, tolerance):
+    expected = dict(zip(('x', 'y', 'width', 'height'), SQUARE))
+    for key, value in expected.items():
+        assert abs(box[key] - value) <= tolerance, (key, box, expected)
+
+
+def test_reduced_decode_reports_scale():
+    data = encode_jpeg(3200, 2400)
+    image, scale = decode_image_gray(data, max_side=1280)
+    assert scale == 2
+    assert image.shape == (1200, 1600)
+
+    full, full_scale = decode_image_gray(data)
+    assert full_scale == 1
+    assert full.shape == (2400, 3200)
+
+
+def test_boxes_from_reduced_decode_map_to_original_coordinates():
+    image, scale = decode_image_gray(encode_jpeg(3200, 2400), max_side=1280)
+    boxes = detect_face_boxes(bright_region_detector, image, max_side=640)
+    assert len(boxes) == 1
+    # 축소 디코딩 배율 × 검출 피라미드 배율만큼 오차 허용
+    assert_close_to_square(box_to_dict(boxes[0], scale), tolerance=scale * 2 ** pyramid_level(image.shape, 640))
+
+
+def test_small_images_decode_at_full_size():
+    image, scale = decode_image_gray(encode_jpeg(1800, 1400), max_side=1280)
+    assert scale == 1
+    assert image.shape == (1400, 1800)
+    boxes = detect_face_boxes(bright_region_detector, image)
+    assert_close_to_square(box_to_dict(boxes[0], scale), tolerance=0)
+
+
+def test_detect_boxes_are_clipped_to_image():
+    gray = np.zeros((100, 100), dtype=np.uint8)
+    detector = lambda g: [Rect(-10, 90, 20, 130)]
+    assert detect_face_boxes(detector, gray) == [(0, 90, 20, 10)]
+
+
+def test_crop_faces_batch():
+    gray = np.full((200, 200), 255, dtype=np.uint8)
+    rois = crop_faces(gray, [(0, 0, 100, 100), (50, 50, 128, 64)])
+    assert rois.shape == (2, ROI_SIZE, ROI_SIZE, 1)
+    assert rois.dtype == np.float32
+    assert np.allclose(rois, 1.0)
+
+
+def test_build_emotion_result():
+    preds = np.array([0.1, 0.0, 0.0, 0.7, 0.1, 0.0, 0.1])
+    result = build_emotion_result(preds)
+    assert result['emotion'] == 'Happy'
+    assert result['confidence'] == 0.7
+    assert list(result['probabilities']) == EXPRESSION_LABELS
+
+
+def two_face_detector(gray):
+    return [Rect(10, 10, 60, 60), Rect(100, 100, 180, 180)]
+
+
+def test_preprocess_faces_limits_face_count():
+    gray = np.zeros((200, 200), dtype=np.uint8)
+    faces, boxes = preprocess_faces(two_face_detector, gray)
+    assert faces.shape == (2, ROI_SIZE, ROI_SIZE, 1)
+    assert boxes == [(10, 10, 50, 50), (100, 100, 80, 80)]
+
+    faces, boxes = preprocess_faces(two_face_detector, gray, max_faces=1)
+    assert faces.shape == (1, ROI_SIZE, ROI_SIZE, 1)
+    assert boxes == [(10, 10, 50, 50)]
+
+    assert preprocess_faces(lambda g: [], gray) == (None, [])
+
+
+def test_preprocess_faces_uses_session_tracker():
+    gray = np.zeros((200, 200), dtype=np.uint8)
+    tracker = FaceTrackerRegistry(redetect_interval=10)
+    faces, boxes = preprocess_faces(two_face_detector, gray, tracker=tracker, session_id='s1')
+    assert len(boxes) == 2
+    assert tracker.get_stats()['sessions'] == 1
+
+
+def test_build_face_response_shapes():
+    preds = np.array([
+        [0.1, 0.0, 0.0, 0.7, 0.1, 0.0, 0.1],
+        [0.8, 0.0, 0.0, 0.1, 0.1, 0.0, 0.0]
+    ])
+    boxes = [(10, 10, 50, 50), (100, 100, 80, 80)]
+    info = {'batch_size': 2, 'queue_wait_ms': 0.0}
+
+    single = build_face_response(preds, boxes, info)
+    assert set(single) == {'emotion', 'confidence', 'probabilities', 'inference'}
+    assert single['emotion'] == 'Happy'
+
+    multi = build_face_response(preds, boxes, info, multi_face=True, scale=2)
+    assert multi['face_count'] == 2
+    assert [face['emotion'] for face in multi['faces']] == ['Happy', 'Angry']
+    assert multi['faces'][1]['box'] == {'x': 200, 'y': 200, 'width': 160, 'height': 160}
+    assert multi['inference'] == info
@@ -0,0 +1,80 @@
+import cv2
+import numpy as np
+import pytest
+
+from services.face_result_cache import FaceResultCache, perceptual_hash
+
+
+def encode_jpeg(brightness=0, quality=95):
+    gradient = np.tile(np.linspace(0, 200, 320, dtype=np.float32), (240, 1))
+    image = np.clip(gradient + brightness, 0, 255).astype(np.uint8)
+    ok, data = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    assert ok
+    return data.tobytes()
+
+
+def test_exact_hit_returns_a_copy():
+    cache = FaceResultCache()
+    key = cache.make_key(b'frame-1', variant='single')
+    assert cache.get(key) is None
+    cache.put(key, {'emotion': 'Happy', 'faces': [1]})
+
+    hit = cache.get(key)
+    assert hit == {'emotion': 'Happy', 'faces': [1]}
+    hit['faces'].append(2)
+    assert cache.get(key)['faces'] == [1]
+
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['exact_hits'], stats['misses']) == (2, 2, 1)
+
+
+def test_variant_is_part_of_the_key():
+    cache = FaceResultCache()
+    cache.put(cache.make_key(b'frame-1', variant='single'), {'emotion': 'Happy'})
+    assert cache.get(cache.make_key(b'frame-1', variant='multi')) is None
+
+
+def test_lru_eviction():
+    cache = FaceResultCache(max_entries=2)
+    keys = [cache.make_key(f'frame-{i}'.encode()) for i in range(3)]
+    cache.put(keys[0], {'i': 0})
+    cache.put(keys[1], {'i': 1})
+    cache.get(keys[0])
+    cache.put(keys[2], {'i': 2})
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == {'i': 0}
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_expired_entries_miss(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('services.face_result_cache.time.monotonic', lambda: now[0])
+    cache = FaceResultCache(ttl_seconds=30)
+    key = cache.make_key(b'frame-1')
+    cache.put(key, {'emotion': 'Sad'})
+    now[0] += 31
+    assert cache.get(key) is None
+    assert cache.get_stats()['expirations'] == 1
+
+
+def test_perceptual_mode_matches_reencoded_frame():
+    cache = FaceResultCache(mode='perceptual')
+    original, reencoded = encode_jpeg(quality=95), encode_jpeg(quality=80)
+    assert original != reencoded
+    assert perceptual_hash(original) is not None
+
+    cache.put(cache.make_key(original, 'single'), {'emotion': 'Neutral'})
+    assert cache.get(cache.make_key(reencoded, 'single')) == {'emotion': 'Neutral'}
+    assert cache.get(cache.make_key(reencoded, 'multi')) is None
+    assert cache.get_stats()['perceptual_hits'] == 1
+
+
+def test_exact_mode_ignores_similar_frames():
+    cache = FaceResultCache(mode='exact')
+    cache.put(cache.make_key(encode_jpeg(quality=95)), {'emotion': 'Neutral'})
+    assert cache.get(cache.make_key(encode_jpeg(quality=80))) is None
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        FaceResultCache(mode='fuzzy')
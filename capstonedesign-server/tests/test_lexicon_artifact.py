@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pytest
+
+from services.emotion_lexicon import EmotionLexicon
+from services.lexicon_artifact import (
+    ARTIFACT_VERSION, compile_lexicon, default_artifact_path, load_artifact, load_compiled_lexicon
+)
+from services.lexicon_trie import match_tokens
+
+TSV = ('English Word\tKorean Word\tanger\tjoy\tsadness\n'
+       'love\t사랑\t0\t1\t0\n'
+       'rain\t비\t0\t0\t1\n'
+       'sad\t슬프다\t0\t0\t1\n'
+       'hate\t혐오하다\t1\t0\t0\n'
+       'happy\t행복\t0\t1\t0\n'
+       'plenty\t많이 있다\t0\t1\t0\n')
+
+
+@pytest.fixture
+def tsv_path(tmp_path):
+    path = tmp_path / 'Korean-NRC-EmoLex.txt'
+    path.write_text(TSV, encoding='utf-8')
+    return str(path)
+
+
+def test_default_artifact_path_is_versioned():
+    assert default_artifact_path('lexicon/EmoLex.txt') == os.path.join('lexicon', f'EmoLex.v{ARTIFACT_VERSION}.lexbin')
+
+
+def test_mmap_load_equals_in_memory_lexicon(tsv_path, tmp_path):
+    artifact_path = str(tmp_path / 'lexicon.lexbin')
+    memory_lexicon, memory_trie = compile_lexicon(tsv_path)
+    compile_lexicon(tsv_path, artifact_path)
+    header, lexicon, trie = load_artifact(artifact_path)
+
+    assert header['words'] == len(memory_lexicon)
+    assert lexicon.emotions == memory_lexicon.emotions
+    assert list(lexicon.words) == list(memory_lexicon.words)
+    assert np.array_equal(lexicon.matrix, memory_lexicon.matrix)
+    for word in memory_lexicon.words:
+        assert lexicon[word] == memory_lexicon[word]
+    # 어간 키는 트라이에 있지만 단어 색인에는 없음
+    assert '슬프' not in lexicon and '슬프' not in memory_lexicon
+
+    for name in ('base', 'check', 'values', 'codes'):
+        assert np.array_equal(getattr(trie, name), getattr(memory_trie, name))
+    text = '사랑을 비가 슬프고 혐오했다 많이 있다'
+    assert match_tokens(trie, text) == match_tokens(memory_trie, text)
+
+
+def test_artifact_arrays_are_memory_mapped(tsv_path, tmp_path):
+    artifact_path = str(tmp_path / 'lexicon.lexbin')
+    compile_lexicon(tsv_path, artifact_path)
+    _, lexicon, trie = load_artifact(artifact_path)
+    assert not lexicon.matrix.flags.writeable
+    assert not trie.check.flags.writeable
+
+
+def test_stale_artifact_is_recompiled(tsv_path, tmp_path):
+    artifact_path = str(tmp_path / 'lexicon.lexbin')
+    lexicon, _ = load_compiled_lexicon(tsv_path, artifact_path)
+    assert os.path.exists(artifact_path)
+    assert '슬프다' in lexicon
+
+    with open(tsv_path, 'a', encoding='utf-8') as f:
+        f.write('fear\t무섭다\t0\t0\t1\n')
+    lexicon, _ = load_compiled_lexicon(tsv_path, artifact_path)
+    assert '무섭다' in lexicon
+    assert load_artifact(artifact_path)[0]['words'] == len(EmotionLexicon.from_tsv(tsv_path))
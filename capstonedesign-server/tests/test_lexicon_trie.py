@@ -0,0 +1,67 @@
+import pytest
+
+from services.lexicon_trie import DoubleArrayTrie, lexicon_keys, match_tokens
+
+WORDS = ['사랑', '비', '슬프다', '혐오하다', '행복', '많이 있다', '화가']
+
+
+@pytest.fixture(scope='module')
+def trie():
+    return DoubleArrayTrie.build(*lexicon_keys(WORDS))
+
+
+def matched(trie, text):
+    return [(WORDS[index], surface) for index, surface in match_tokens(trie, text)[1]]
+
+
+def test_build_and_lookup(trie):
+    for index, word in enumerate(WORDS):
+        assert trie.get(word) == index
+    # 용언 어간 키는 기본형의 단어 번호
+    assert trie.get('슬프') == WORDS.index('슬프다')
+    assert trie.get('혐오') == WORDS.index('혐오하다')
+    assert trie.get('없는말') == -1
+
+
+def test_particles_and_endings(trie):
+    assert matched(trie, '사랑을 비가 행복했다') == [('사랑', '사랑을'), ('비', '비가'), ('행복', '행복했다')]
+    assert matched(trie, '슬프고 혐오하였다 혐오했다') == [
+        ('슬프다', '슬프고'), ('혐오하다', '혐오하였다'), ('혐오하다', '혐오했다')
+    ]
+
+
+def test_unrelated_suffix_is_not_a_match(trie):
+    assert matched(trie, '사랑니 비행기') == []
+    # 어미는 용언 어간 뒤에서만 인정
+    assert matched(trie, '사랑고') == []
+
+
+def test_trailing_punctuation(trie):
+    assert matched(trie, '정말 행복하다! 비.') == [('행복', '행복하다'), ('비', '비')]
+
+
+def test_multi_word_entry(trie):
+    tokens, matches = match_tokens(trie, '할 일이 많이 있다')
+    assert tokens == 4
+    assert [(WORDS[index], surface) for index, surface in matches] == [('많이 있다', '많이 있다')]
+
+
+def test_longest_match_wins(trie):
+    assert matched(trie, '화가 났다') == [('화가', '화가')]
+
+
+def test_text_service_reports_surface_tokens(tmp_path):
+    from services.text_emotion_service import TextEmotionService
+
+    path = tmp_path / 'lexicon.txt'
+    path.write_text('English Word\tKorean Word\tjoy\tsadness\n'
+                    'love\t사랑\t1\t0\n'
+                    'sad\t슬프다\t0\t1\n', encoding='utf-8')
+    service = TextEmotionService(lexicon_path=str(path), matcher='trie', artifact_path='')
+    result = service.analyze_text_emotion('사랑을 느끼지만 슬프고 사랑니가 아프다')
+    assert result['matched_words'] == ['사랑을', '슬프고']
+    assert result['matched_lexicon_words'] == ['사랑', '슬프다']
+    assert result['total_words'] == 5
+
+    batch = list(service.analyze_batch(['사랑을 느끼지만 슬프고 사랑니가 아프다']))
+    assert batch[0]['matched_words'] == result['matched_words']
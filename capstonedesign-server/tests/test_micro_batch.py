@@ -0,0 +1,126 @@
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+
+import numpy as np
+import pytest
+
+from services.face_inference import FaceBatchExecutor
+from services.micro_batch import MicroBatchExecutor
+from services.stt_batch_scheduler import WhisperBatchScheduler
+
+
+def test_concurrent_requests_share_one_batch():
+    calls = []
+
+    def batch_fn(payloads):
+        calls.append(list(payloads))
+        return [p * 10 for p in payloads]
+
+    executor = MicroBatchExecutor(batch_fn, max_batch_size=8, max_wait_ms=200)
+    try:
+        futures = [executor.submit_payload(i) for i in range(4)]
+        assert [f.result(timeout=2) for f in futures] == [0, 10, 20, 30]
+        assert calls == [[0, 1, 2, 3]]
+        stats = executor.get_stats()
+        assert stats['total_batches'] == 1
+        assert stats['batch_size']['max'] == 4
+    finally:
+        executor.shutdown()
+
+
+def test_batch_size_limit_counts_items():
+    sizes = []
+
+    def batch_fn(payloads):
+        sizes.append(len(payloads))
+        return payloads
+
+    executor = MicroBatchExecutor(batch_fn, max_batch_size=3, max_wait_ms=200)
+    try:
+        futures = [executor.submit_payload(i, size=2) for i in range(3)]
+        for f in futures:
+            f.result(timeout=2)
+        # 항목 2개짜리 요청 2건이 모이면 한도(3)를 넘으므로 바로 실행
+        assert sizes == [2, 1]
+    finally:
+        executor.shutdown()
+
+
+def test_batch_error_fails_every_request():
+    def batch_fn(payloads):
+        raise RuntimeError('boom')
+
+    executor = MicroBatchExecutor(batch_fn, max_wait_ms=50)
+    try:
+        futures = [executor.submit_payload(i) for i in range(2)]
+        for f in futures:
+            with pytest.raises(RuntimeError):
+                f.result(timeout=2)
+    finally:
+        executor.shutdown()
+
+
+def test_face_executor_splits_predictions_per_request():
+    executor = FaceBatchExecutor(lambda rois: rois.reshape(len(rois), -1)[:, :1], max_wait_ms=200)
+    try:
+        first = executor.submit(np.full((2, 4, 4, 1), 1.0, dtype=np.float32))
+        second = executor.submit(np.full((4, 4, 1), 2.0, dtype=np.float32))
+        preds, info = first.result(timeout=2)
+        assert preds.ravel().tolist() == [1.0, 1.0]
+        assert info['batch_size'] == 3
+        preds, info = second.result(timeout=2)
+        assert preds.ravel().tolist() == [2.0]
+    finally:
+        executor.shutdown()
+
+
+def test_face_executor_dispatches_to_replicas():
+    def dispatch(rois):
+        future = Future()
+        threading.Timer(0.01, future.set_result, [rois.sum(axis=(1, 2, 3))]).start()
+        return future
+
+    executor = FaceBatchExecutor(None, max_wait_ms=50, dispatch_fn=dispatch)
+    try:
+        preds, _ = executor.predict(np.ones((3, 2, 2, 1), dtype=np.float32), timeout=2)
+        assert preds.tolist() == [4.0, 4.0, 4.0]
+    finally:
+        executor.shutdown()
+
+
+class SlowBackend:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def window_features(self, window):
+        return window
+
+    def decode_batch(self, windows):
+        time.sleep(self.delay)
+        return [{
+            'text': 'hello', 'language': 'ko', 'tokens': [], 'temperature': 0.0,
+            'avg_logprob': -0.1, 'compression_ratio': 1.0, 'no_speech_prob': 0.0
+        } for _ in windows]
+
+
+def test_whisper_scheduler_merges_windows():
+    scheduler = WhisperBatchScheduler(SlowBackend(0.0), max_wait_ms=10)
+    try:
+        result = scheduler.transcribe(np.zeros(16000 * 45, dtype=np.float32), timeout=2)
+        assert result['text'] == 'hello hello'
+        assert [s['start'] for s in result['segments']] == [0.0, 30.0]
+        assert scheduler.get_stats()['total_windows'] == 2
+    finally:
+        scheduler.shutdown()
+
+
+def test_whisper_scheduler_timeout_covers_whole_transcription():
+    scheduler = WhisperBatchScheduler(SlowBackend(0.5), max_batch_size=1, max_wait_ms=0)
+    try:
+        started_at = time.monotonic()
+        with pytest.raises(TimeoutError):
+            scheduler.transcribe(np.zeros(16000 * 90, dtype=np.float32), timeout=0.2)
+        assert time.monotonic() - started_at < 0.45
+    finally:
+        scheduler.shutdown()
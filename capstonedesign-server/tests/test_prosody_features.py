@@ -0,0 +1,105 @@
+import numpy as np
+
+from services.prosody_features import ProsodyAccumulator, _RunningStats, compute_prosody
+
+SR = 16000
+
+
+def voiced(seconds, f0=150.0, amplitude=0.2):
+    # 배음이 있는 유성음 (모음 대역 300-2500 Hz에 에너지가 있도록)
+    t = np.arange(int(seconds * SR)) / SR
+    y = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 12))
+    return (amplitude * y / np.abs(y).max()).astype(np.float32)
+
+
+def noise(seconds, amplitude=1e-4, seed=0):
+    return np.random.default_rng(seed).normal(0, amplitude, int(seconds * SR)).astype(np.float32)
+
+
+def syllables(result):
+    return int(round(result['speech_rate'] * result['speech_duration']))
+
+
+def test_pitch_of_steady_vowel():
+    result = compute_prosody(voiced(1.0, f0=150.0))
+    assert abs(result['pitch_mean'] - 150.0) < 1.0
+    assert result['pitch_std'] < 1.0
+    assert result['voiced_ratio'] > 0.9
+    assert result['duration'] == 1.0
+
+
+def test_pitch_tracks_f0():
+    assert abs(compute_prosody(voiced(1.0, f0=220.0))['pitch_mean'] - 220.0) < 1.5
+
+
+def test_syllable_count():
+    parts = []
+    for i in range(5):
+        parts.extend([voiced(0.15), noise(0.15, seed=i)])
+    assert syllables(compute_prosody(np.concatenate(parts))) == 5
+
+
+def test_trailing_silence_adds_no_syllable():
+    result = compute_prosody(np.concatenate([noise(0.3), voiced(0.2), noise(1.0, seed=1)]))
+    assert syllables(result) == 1
+    assert result['speech_duration'] < 0.5
+
+
+def test_shallow_dip_before_trailing_silence_is_one_syllable():
+    # 1 dB 미만의 얕은 골짜기: 뒤따르는 무음을 마지막 피크의 골짜기로 보면 음절이 2개로 잡힘
+    t = np.arange(int(0.6 * SR)) / SR
+    envelope = (1 - 0.1 * np.exp(-((t - 0.3) / 0.03) ** 2)).astype(np.float32)
+    result = compute_prosody(np.concatenate([voiced(0.6) * envelope, noise(0.8)]))
+    assert syllables(result) == 1
+
+
+def test_silence_has_no_pitch_or_speech():
+    result = compute_prosody(noise(1.0))
+    assert result['pitch_mean'] == 0.0
+    assert result['speech_rate'] == 0.0
+    assert result['voiced_ratio'] == 0.0
+
+
+def test_shorter_than_one_frame():
+    result = compute_prosody(np.zeros(100, dtype=np.float32))
+    assert result['energy_mean'] == 0.0
+    assert result['speech_duration'] == 0.0
+
+
+def test_single_chunk_accumulator_equals_compute_prosody():
+    y = np.concatenate([voiced(0.5), noise(0.3), voiced(0.4, f0=200.0)])
+    accumulator = ProsodyAccumulator()
+    accumulator.add(y)
+    assert accumulator.result() == compute_prosody(y)
+
+
+def test_chunked_running_stats_match_whole_signal():
+    parts = []
+    for i in range(6):
+        parts.extend([voiced(0.15, f0=120.0 + 20 * i), noise(0.15, seed=i)])
+    y = np.concatenate(parts)
+    whole = compute_prosody(y)
+
+    # 프레임 경계가 맞도록 홉 길이의 배수로 자름
+    accumulator = ProsodyAccumulator()
+    chunk = 256 * 100
+    for start in range(0, len(y), chunk):
+        accumulator.add(y[start:start + chunk])
+    chunked = accumulator.result()
+
+    assert chunked['duration'] == whole['duration']
+    assert abs(chunked['pitch_mean'] - whole['pitch_mean']) < 2.0
+    assert abs(chunked['pitch_std'] - whole['pitch_std']) < 2.0
+    assert abs(chunked['energy_mean'] - whole['energy_mean']) < 0.01
+    assert abs(chunked['energy_std'] - whole['energy_std']) < 0.01
+    assert abs(syllables(chunked) - syllables(whole)) <= 2
+
+
+def test_running_stats_are_exact_for_concatenated_values():
+    values = np.random.default_rng(0).normal(5.0, 2.0, 1000)
+    stats = _RunningStats()
+    for part in np.array_split(values, 7):
+        stats.add(part)
+    assert stats.count == 1000
+    assert abs(stats.mean - values.mean()) < 1e-9
+    assert abs(stats.std - values.std()) < 1e-9
@@ -0,0 +1,117 @@
+import numpy as np
+
+from services.silence_trim import SpeechChunker, iter_speech_chunks, to_original_time, trim_silence
+
+SR = 16000
+
+
+def tone(seconds, amplitude=0.2, freq=180.0):
+    t = np.arange(int(seconds * SR)) / SR
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def noise(seconds, amplitude=1e-4, seed=0):
+    return np.random.default_rng(seed).normal(0, amplitude, int(seconds * SR)).astype(np.float32)
+
+
+def test_leading_and_trailing_silence_removed():
+    samples = np.concatenate([noise(2.0), tone(1.0), noise(2.0, seed=1)])
+    speech, info = trim_silence(samples, SR)
+    assert info['original_seconds'] == 5.0
+    assert 1.0 <= info['speech_seconds'] < 2.0
+    assert info['segments'] == 1
+    assert len(speech) == int(round(info['speech_seconds'] * SR))
+
+
+def test_speech_from_first_sample_is_kept():
+    speech, info = trim_silence(np.concatenate([tone(1.0), noise(1.0)]), SR)
+    assert info['speech_seconds'] >= 1.0
+    assert np.array_equal(speech[:SR // 2], tone(0.5))
+
+
+def test_short_answer_is_kept():
+    # "네" 한 마디 길이 (약 100 ms)
+    speech, info = trim_silence(np.concatenate([noise(1.0), tone(0.1), noise(1.0, seed=1)]), SR)
+    assert info['segments'] == 1
+    assert len(speech) > 0
+
+
+def test_silence_only_returns_empty():
+    speech, info = trim_silence(noise(2.0), SR)
+    assert len(speech) == 0
+    assert info['segments'] == 0
+    assert info['trimmed_seconds'] == 2.0
+
+
+def test_spans_are_original_times():
+    _, info = trim_silence(np.concatenate([noise(2.0), tone(1.0), noise(2.0, seed=1)]), SR)
+    start, end = info['spans'][0]
+    # 사전 롤만큼 앞쪽 무음이 남음
+    assert 1.6 <= start <= 2.0
+    assert 3.0 <= end <= 3.5
+
+
+def test_long_pause_compressed_and_mapped_back():
+    samples = np.concatenate([tone(1.0), noise(4.0), tone(1.0)])
+    speech, info = trim_silence(samples, SR)
+    assert info['segments'] == 2
+    assert info['speech_seconds'] < 4.0
+    (_, first_end), (second_start, _) = info['spans']
+    assert 4.5 <= second_start <= 5.0
+    # 이어 붙인 배열에서 첫 구간 직후는 원본의 두 번째 구간 시작
+    assert to_original_time(first_end, info['spans']) == round(first_end, 3)
+    assert to_original_time(first_end + 0.01, info['spans']) == round(second_start + 0.01, 3)
+
+
+def test_to_original_time():
+    spans = [(1.0, 2.0), (5.0, 6.5)]
+    assert to_original_time(0.5, spans) == 1.5
+    assert to_original_time(1.5, spans) == 5.5
+    assert to_original_time(10.0, spans) == 6.5
+    assert to_original_time(3.0, []) == 3.0
+
+
+def blocks(samples, block_seconds=1.0):
+    block = int(block_seconds * SR)
+    return [samples[start:start + block] for start in range(0, len(samples), block)]
+
+
+def speech_with_pauses(count=6, speech_seconds=4.0, pause_seconds=1.0):
+    parts = []
+    for i in range(count):
+        parts.extend([tone(speech_seconds), noise(pause_seconds, seed=i)])
+    return np.concatenate(parts)
+
+
+def test_chunks_are_cut_in_pauses():
+    samples = speech_with_pauses()
+    chunks = list(iter_speech_chunks(blocks(samples), SR, max_chunk_seconds=10.0, trim=False))
+    assert len(chunks) > 1
+    # 원본 구간 그대로 자르므로 길이 합은 원본 길이
+    assert sum(len(chunk) for chunk, _ in chunks) == len(samples)
+    for chunk, info in chunks:
+        assert len(chunk) <= 10.0 * SR
+        start, end = info['spans'][0]
+        # 경계는 말소리(0~4초, 5~9초, ...) 밖의 쉼 구간
+        for boundary in (start, end):
+            assert boundary % 5.0 >= 4.0 or boundary in (0.0, len(samples) / SR)
+
+
+def test_trimmed_chunks_hold_only_speech():
+    samples = speech_with_pauses()
+    chunks = list(iter_speech_chunks(blocks(samples), SR, max_chunk_seconds=10.0, trim=True))
+    assert round(sum(info['original_seconds'] for _, info in chunks), 3) == len(samples) / SR
+    assert sum(info['segments'] for _, info in chunks) == 6
+    for chunk, info in chunks:
+        assert len(chunk) <= 10.0 * SR
+        assert len(chunk) == int(round(info['speech_seconds'] * SR))
+
+
+def test_speech_without_pause_is_cut_at_limit():
+    chunker = SpeechChunker(SR, max_chunk_seconds=5.0, initial_noise_floor_db=-80.0)
+    chunks = []
+    for block in blocks(tone(12.0)):
+        chunks.extend(chunker.feed(block))
+    chunks.extend(chunker.flush())
+    assert len(chunks) >= 3
+    assert all(len(chunk) <= 5.0 * SR for chunk, _ in chunks)
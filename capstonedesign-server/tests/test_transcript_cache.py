@@ -0,0 +1,90 @@
+import sqlite3
+
+import numpy as np
+
+from services.audio_emotion_service import AudioEmotionService
+from services.transcript_cache import TranscriptCache
+
+RESULT = {'success': True, 'transcript': '안녕하세요', 'language': 'ko', 'segments': []}
+
+
+class FakeBackend:
+    name = 'fake'
+    model_name = 'fake'
+
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio):
+        self.calls += 1
+        return {'text': '안녕하세요', 'language': 'ko', 'segments': []}
+
+
+def lock_database(path):
+    """다른 워커가 쓰기 잠금을 잡고 있는 상태 재현"""
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute('BEGIN IMMEDIATE')
+    return other
+
+
+def test_memory_and_disk_hits(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = TranscriptCache(max_entries=4, db_path=path)
+    key = cache.make_key(np.ones(160, dtype=np.float32), 'whisper:base')
+    assert cache.get(key) is None
+    cache.put(key, RESULT)
+    assert cache.get(key) == RESULT
+
+    # 새 프로세스처럼 메모리가 빈 캐시는 디스크에서 읽음
+    reopened = TranscriptCache(max_entries=4, db_path=path)
+    assert reopened.get(key) == RESULT
+    stats = reopened.get_stats()
+    assert stats['disk_hits'] == 1 and stats['disk_errors'] == 0
+
+
+def test_key_depends_on_samples_and_variant():
+    cache = TranscriptCache()
+    samples = np.zeros(160, dtype=np.float32)
+    assert cache.make_key(samples, 'a') == cache.make_key(samples.copy(), 'a')
+    assert cache.make_key(samples, 'a') != cache.make_key(samples, 'b')
+    assert cache.make_key(samples, 'a') != cache.make_key(samples + 1e-3, 'a')
+
+
+def test_disk_limit_evicts_oldest(tmp_path):
+    cache = TranscriptCache(max_entries=1, db_path=str(tmp_path / 'cache.sqlite3'), max_disk_mb=0.001)
+    for i in range(10):
+        cache.put(f'key{i}', dict(RESULT, transcript='x' * 200))
+    stats = cache.get_stats()
+    assert stats['disk_bytes'] <= cache.max_disk_bytes
+    assert stats['disk_evictions'] > 0
+
+
+def test_locked_database_does_not_raise(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = TranscriptCache(db_path=path, lock_timeout=0.05)
+    other = lock_database(path)
+    try:
+        cache.put('key', RESULT)
+        # 메모리에는 저장됨
+        assert cache.get('key') == RESULT
+    finally:
+        other.rollback()
+        other.close()
+    assert cache.get_stats()['disk_errors'] == 1
+
+
+def test_cache_write_failure_still_returns_transcript(tmp_path, monkeypatch):
+    monkeypatch.setenv('TRANSCRIPT_CACHE', 'false')
+    path = str(tmp_path / 'cache.sqlite3')
+    service = AudioEmotionService()
+    service.transcript_cache = TranscriptCache(db_path=path, lock_timeout=0.05)
+    service._stt_backend = FakeBackend()
+    other = lock_database(path)
+    try:
+        result = service.transcribe_audio(np.zeros(16000, dtype=np.float32))
+    finally:
+        other.rollback()
+        other.close()
+    assert result['success'] is True
+    assert result['transcript'] == '안녕하세요'
+    assert service.transcript_cache.get_stats()['disk_errors'] == 1
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+NRC EmoLex 바이너리 아티팩트 컴파일 도구
+
+lexicon/Korean-NRC-EmoLex.txt를 문자열 표 + uint8 감정 행렬 + double-array 트라이가 담긴
+메모리 매핑 가능한 단일 파일(기본: lexicon/Korean-NRC-EmoLex.v1.lexbin)로 컴파일한다.
+서비스는 시작 시 TSV 체크섬이 다르면 스스로 다시 컴파일하므로, 이 도구는 배포 이미지를 만들 때
+미리 컴파일해 두거나 TSV를 파싱할 때와 로드 시간을 비교하는 용도다.
+
+사용법:
+    python tools/build_lexicon.py
+    python tools/build_lexicon.py --lexicon lexicon/Korean-NRC-EmoLex.txt --output /srv/lexicon.v1.lexbin
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.lexicon_artifact import compile_lexicon, default_artifact_path, load_artifact
+
+DEFAULT_LEXICON = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lexicon', 'Korean-NRC-EmoLex.txt')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile the NRC EmoLex TSV into a binary lexicon artifact')
+    parser.add_argument('--lexicon', default=DEFAULT_LEXICON, help='NRC EmoLex TSV 경로')
+    parser.add_argument('--output', default=None, help='아티팩트 경로 (기본: TSV 옆 .v<버전>.lexbin)')
+    args = parser.parse_args()
+
+    lexicon_path = os.path.normpath(args.lexicon)
+    output = args.output or default_artifact_path(lexicon_path)
+
+    started_at = time.perf_counter()
+    compile_lexicon(lexicon_path)
+    parse_ms = (time.perf_counter() - started_at) * 1000.0
+
+    started_at = time.perf_counter()
+    compile_lexicon(lexicon_path, output)
+    compile_ms = (time.perf_counter() - started_at) * 1000.0
+
+    started_at = time.perf_counter()
+    header, lexicon, trie = load_artifact(output)
+    load_ms = (time.perf_counter() - started_at) * 1000.0
+
+    print("🚀 Lexicon 아티팩트 컴파일")
+    print("=" * 60)
+    print(f"원본:        {lexicon_path}")
+    print(f"아티팩트:    {output} (v{header['version']}, {os.path.getsize(output) / 1024:.0f} KB)")
+    print(f"체크섬:      {header['checksum'][:16]}")
+    print(f"단어 / 감정: {len(lexicon)} / {len(lexicon.emotions)} (트라이 키 {len(trie)}개)")
+    print(f"TSV 파싱 + 트라이 구성: {parse_ms:8.1f} ms")
+    print(f"컴파일 + 저장:          {compile_ms:8.1f} ms")
+    print(f"아티팩트 로드:          {load_ms:8.1f} ms")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
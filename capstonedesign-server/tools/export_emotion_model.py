@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+얼굴 감정 모델 경량 백엔드 변환 도구
+
+models/emotion_model.h5를 TFLite (float16, int8) 및 ONNX로 변환한다.
+int8 변환에는 대표 입력(calibration set)이 필요하다.
+
+사용법:
+    python tools/export_emotion_model.py --formats tflite-fp16,onnx
+    python tools/export_emotion_model.py --formats tflite-int8 --calibration-dir data/calibration_faces
+
+calibration-dir은 얼굴 크롭 이미지 폴더(하위 폴더 포함)이며, --detect-faces를 주면
+전체 프레임 이미지에서 dlib으로 얼굴을 찾아 크롭한다.
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import sys
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.face_pipeline import ROI_SIZE, crop_faces, detect_face_boxes
+
+EXPORT_FORMATS = ('tflite-fp16', 'tflite-int8', 'onnx')
+IMAGE_EXTENSIONS = ('*.png', '*.jpg', '*.jpeg', '*.bmp')
+
+
+def load_calibration_set(calibration_dir: str, limit: int, detect_faces: bool) -> np.ndarray:
+    """calibration 이미지를 (N, 64, 64, 1) float32로 로드"""
+    paths = []
+    for ext in IMAGE_EXTENSIONS:
+        paths.extend(glob.glob(os.path.join(calibration_dir, '**', ext), recursive=True))
+    paths = sorted(paths)[:limit]
+    if not paths:
+        raise ValueError(f"No calibration images found in {calibration_dir}")
+
+    face_detector = None
+    if detect_faces:
+        import dlib
+        face_detector = dlib.get_frontal_face_detector()
+
+    rois = []
+    for path in paths:
+        gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            continue
+        if face_detector is not None:
+            boxes = detect_face_boxes(face_detector, gray)
+        else:
+            boxes = [(0, 0, gray.shape[1], gray.shape[0])]
+        if boxes:
+            rois.append(crop_faces(gray, boxes))
+
+    if not rois:
+        raise ValueError("No usable calibration faces")
+    return np.concatenate(rois, axis=0)
+
+
+def _forward_function(model):
+    import tensorflow as tf
+
+    forward = tf.function(lambda x: model(x, training=False), autograph=False)
+    spec = tf.TensorSpec((None, ROI_SIZE, ROI_SIZE, 1), tf.float32, name='input')
+    return forward, spec
+
+
+def export_tflite(model, output_path: str, quantization: str, calibration: np.ndarray = None):
+    """TFLite 변환 (quantization: 'fp16' 또는 'int8', 입출력은 float32 유지)"""
+    import tempfile
+    import tensorflow as tf
+
+    # Keras 3 변수는 concrete function 변환 시 READ_VARIABLE로 남으므로 SavedModel을 거쳐 고정
+    saved_model_dir = tempfile.mkdtemp(prefix='emotion_model_')
+    model.export(saved_model_dir, format='tf_saved_model', verbose=False)
+    converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    if quantization == 'fp16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization == 'int8':
+        if calibration is None:
+            raise ValueError("int8 export requires --calibration-dir")
+
+        def representative_dataset():
+            for roi in calibration:
+                yield [roi[np.newaxis].astype(np.float32)]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+
+    tflite_model = converter.convert()
+    shutil.rmtree(saved_model_dir, ignore_errors=True)
+    with open(output_path, 'wb') as f:
+        f.write(tflite_model)
+
+
+def export_onnx(model, output_path: str, opset: int = 13):
+    """ONNX 변환 (tf2onnx 필요, 배치 차원은 동적)"""
+    try:
+        import tf2onnx
+    except ImportError:
+        raise ValueError("ONNX export requires the tf2onnx package (pip install tf2onnx)")
+
+    forward, spec = _forward_function(model)
+    tf2onnx.convert.from_function(forward, input_signature=[spec], opset=opset, output_path=output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the face emotion model to TFLite / ONNX')
+    parser.add_argument('--model-path', default='models/emotion_model.h5')
+    parser.add_argument('--output-dir', default=None, help='기본값: 모델 파일과 같은 폴더')
+    parser.add_argument('--formats', default='tflite-fp16,onnx',
+                        help=f"쉼표로 구분 ({', '.join(EXPORT_FORMATS)})")
+    parser.add_argument('--calibration-dir', default=None, help='int8 변환용 대표 이미지 폴더')
+    parser.add_argument('--calibration-limit', type=int, default=500)
+    parser.add_argument('--detect-faces', action='store_true', help='calibration 이미지에서 얼굴을 검출해 크롭')
+    args = parser.parse_args()
+
+    formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    unknown = [f for f in formats if f not in EXPORT_FORMATS]
+    if unknown:
+        parser.error(f"Unknown format(s): {', '.join(unknown)}")
+
+    from keras.models import load_model
+
+    model = load_model(args.model_path, compile=False)
+    output_dir = args.output_dir or os.path.dirname(os.path.abspath(args.model_path))
+    os.makedirs(output_dir, exist_ok=True)
+    base_name = os.path.splitext(os.path.basename(args.model_path))[0]
+
+    calibration = None
+    if 'tflite-int8' in formats:
+        if not args.calibration_dir:
+            parser.error("tflite-int8 requires --calibration-dir")
+        calibration = load_calibration_set(args.calibration_dir, args.calibration_limit, args.detect_faces)
+        print(f"📦 calibration 입력 {len(calibration)}개 로드")
+
+    for fmt in formats:
+        if fmt == 'onnx':
+            output_path = os.path.join(output_dir, f"{base_name}.onnx")
+            export_onnx(model, output_path)
+        else:
+            quantization = fmt.split('-')[1]
+            output_path = os.path.join(output_dir, f"{base_name}_{quantization}.tflite")
+            export_tflite(model, output_path, quantization, calibration)
+        size_kb = os.path.getsize(output_path) / 1024
+        print(f"✅ {fmt}: {output_path} ({size_kb:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()